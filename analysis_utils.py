@@ -3,17 +3,32 @@
 import pandas as pd
 import numpy as np
 import re
+import io
+import os
+import json
+import pickle
+import hashlib
 import logging
 from copy import deepcopy
+from contextlib import contextmanager
+from functools import lru_cache
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, NamedTuple
+import sklearn
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
+from sklearn.exceptions import NotFittedError
 from sklearn.decomposition import PCA
 from sklearn.model_selection import train_test_split
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from scipy import sparse
 from scipy.stats import skew
+from mofa_model_cache import CachedMofaModel
 
 
 VIEW_MAPPING_UNIFIED = {
@@ -43,59 +58,420 @@ def get_view_mapping_unified(binary_flags=False):
 
     return mapping
 
+# How each conceptual feature (as named in VIEW_MAPPING_UNIFIED) is represented:
+# (column in the preprocess() features, encoding, ordinal codes). The ordinal codes
+# map the mapped labels of a column to the values used by the sparse MOFA+
+# strategy; labels without a code (e.g. 'SS_NA') become missing values.
+# Listed in preprocess() column order.
+FEATURE_ENCODINGS = {
+    'Task 2 Response Probability': ('Task 2 Response Probability', 'continuous', {}),
+    'Inter-task SOA': ('Inter-task SOA', 'continuous', {}),
+    'Distractor SOA': ('Distractor SOA', 'continuous', {}),
+    'Task 1 CSI': ('Task 1 CSI', 'continuous', {}),
+    'Task 2 CSI': ('Task 2 CSI', 'continuous', {}),
+    'RSI': ('RSI', 'continuous', {}),
+    'Switch Rate': ('Switch Rate', 'continuous', {}),
+    'Task 1 Difficulty': ('Task 1 Difficulty', 'continuous', {}),
+    'Task 2 Difficulty': ('Task 2 Difficulty', 'continuous', {}),
+    'Inter-task SOA is NA': ('Inter-task SOA is NA', 'binary', {0: 0.0, 1: 1.0}),
+    'Distractor SOA is NA': ('Distractor SOA is NA', 'binary', {0: 0.0, 1: 1.0}),
+    'Task 2 CSI is NA': ('Task 2 CSI is NA', 'binary', {0: 0.0, 1: 1.0}),
+    'Task 2 Difficulty is NA': ('Task 2 Difficulty is NA', 'binary', {0: 0.0, 1: 1.0}),
+    'Response Set Overlap': ('Response Set Overlap Mapped', 'ordinal',
+                             {'RSO_Identical': 1.0, 'RSO_Disjoint': -1.0}),
+    'RSI is Predictable': ('RSI is Predictable', 'binary', {0: 0.0, 1: 1.0}),
+    'Inter-task SOA is Predictable': ('Inter-task SOA is Predictable', 'ordinal', {'Yes': 1.0, 'No': 0.0}),
+    'Task 1 Stimulus-Response Mapping': ('Task 1 Stimulus-Response Mapping Mapped', 'ordinal',
+                                         {'SRM_Compatible': 1.0, 'SRM_Arbitrary': 0.0, 'SRM_Incompatible': -1.0}),
+    'Task 1 Cue Type': ('Task 1 Cue Type Mapped', 'ordinal', {'TCT_Implicit': 0.0, 'TCT_Arbitrary': 1.0}),
+    'Task 2 Stimulus-Response Mapping': ('Task 2 Stimulus-Response Mapping Mapped', 'ordinal',
+                                         {'SRM2_Compatible': 1.0, 'SRM2_Arbitrary': 0.0, 'SRM2_Incompatible': -1.0}),
+    'Task 2 Cue Type': ('Task 2 Cue Type Mapped', 'ordinal', {'TCT2_Implicit': 0.0, 'TCT2_Arbitrary': 1.0}),
+    'Trial Transition Type': ('Trial Transition Type Mapped', 'ordinal',
+                              {'TTT_Pure': 0.0, 'TTT_Repeat': 0.5, 'TTT_Switch': -0.5}),
+    'Intra-Trial Task Relationship': ('Intra-Trial Task Relationship Mapped', 'ordinal',
+                                      {'ITTR_Same': 1.0, 'ITTR_Different': -1.0}),
+    'Stimulus Bivalence & Congruency': ('SBC_Mapped', 'ordinal',
+                                        {'Congruent': 1.0, 'Neutral': 0.0, 'Incongruent': -1.0}),
+    'Stimulus-Stimulus Congruency': ('Stimulus-Stimulus Congruency Mapped', 'ordinal',
+                                     {'SS_Congruent': 1.0, 'SS_Neutral': 0.0, 'SS_Incongruent': -1.0}),
+    'Stimulus-Response Congruency': ('Stimulus-Response Congruency Mapped', 'ordinal',
+                                     {'SR_Congruent': 1.0, 'SR_Neutral': 0.0, 'SR_Incongruent': -1.0}),
+}
+
+class FeatureSpec(NamedTuple):
+    """One entry of a FeatureRegistry."""
+    name: str            # Conceptual name, as in VIEW_MAPPING_UNIFIED
+    column: str          # Column in the preprocess() features (and sparse MOFA+ feature name)
+    view: Any            # View from the registry's view mapping, None if the feature has none
+    encoding: str        # 'continuous', 'binary' or 'ordinal'
+    ordinal_codes: Mapping  # Mapped label -> ordinal code, empty for continuous features
+
+class FeatureRegistry:
+    """
+    FEATURE_ENCODINGS compiled against a view mapping, with hash-based lookups.
+
+    Every feature can be looked up by its conceptual name or its preprocess()
+    column name; transformed names ('num__RSI', 'cat__SBC_Mapped_Neutral') are
+    resolved by source() without scanning the input columns. Build one with
+    compile_feature_registry().
+    """
+    def __init__(self, view_mapping):
+        view_of = {feature: view for view, features in view_mapping.items() for feature in features}
+        self.specs = [
+            FeatureSpec(name, column, view_of.get(name), encoding, MappingProxyType(dict(codes)))
+            for name, (column, encoding, codes) in FEATURE_ENCODINGS.items()
+        ]
+        self._by_name = {}
+        for spec in self.specs:
+            self._by_name[spec.name] = spec
+            self._by_name.setdefault(spec.column, spec)
+
+    def get(self, name, default=None):
+        """The FeatureSpec for a conceptual or column name."""
+        return self._by_name.get(name, default)
+
+    def view(self, name):
+        spec = self._by_name.get(name)
+        return spec.view if spec is not None else None
+
+    def columns(self, encoding):
+        """Column names of all features with the given encoding, in preprocess() order."""
+        return [spec.column for spec in self.specs if spec.encoding == encoding]
+
+    def source(self, transformed_name, input_features):
+        """
+        The input column a ColumnTransformer output name was produced from.
+
+        One-hot outputs are '<input>_<category>', so the longest '_'-delimited
+        prefix that is an input column wins, e.g. 'Inter-task SOA is NA_0' maps to
+        'Inter-task SOA is NA' rather than 'Inter-task SOA'.
+
+        Args:
+            transformed_name (str): e.g. 'cat__Task 1 Cue Type Mapped_TCT_Arbitrary'.
+            input_features (set): The transformer's feature_names_in_.
+
+        Returns:
+            str or None.
+        """
+        name = transformed_name.split('__', 1)[1]
+        if name in input_features:
+            return name
+        end = name.rfind('_')
+        while end > 0:
+            if name[:end] in input_features:
+                return name[:end]
+            end = name.rfind('_', 0, end)
+        return None
+
+def _freeze_view_mapping(view_mapping):
+    return tuple((view, tuple(features)) for view, features in view_mapping.items())
+
+@lru_cache(maxsize=8)
+def _compile_feature_registry(frozen_view_mapping):
+    return FeatureRegistry({view: list(features) for view, features in frozen_view_mapping})
+
+def compile_feature_registry(view_mapping=None):
+    """Returns the (cached) FeatureRegistry for view_mapping, VIEW_MAPPING_UNIFIED by default."""
+    if view_mapping is None:
+        view_mapping = VIEW_MAPPING_UNIFIED
+    return _compile_feature_registry(_freeze_view_mapping(view_mapping))
+
+# Raw (pre-map_categories) labels accepted by the ordinal codebook, as aliases of
+# the mapped labels in FEATURE_ENCODINGS. _prepare_mofa_data_sparse encodes the
+# raw columns; Response Set Overlap goes through map_categories() first because
+# its raw values ('Disjoint - Effector', ...) are matched by substring.
+ORDINAL_LABEL_ALIASES = {
+    'Task 1 Stimulus-Response Mapping': {'Compatible': 'SRM_Compatible', 'Arbitrary': 'SRM_Arbitrary',
+                                         'Incompatible': 'SRM_Incompatible'},
+    'Task 1 Cue Type': {'None/Implicit': 'TCT_Implicit', 'Arbitrary': 'TCT_Arbitrary'},
+    'Task 2 Stimulus-Response Mapping': {'Compatible': 'SRM2_Compatible', 'Arbitrary': 'SRM2_Arbitrary',
+                                         'Incompatible': 'SRM2_Incompatible'},
+    'Task 2 Cue Type': {'None/Implicit': 'TCT2_Implicit', 'Arbitrary': 'TCT2_Arbitrary'},
+    'Trial Transition Type': {'Pure': 'TTT_Pure', 'Repeat': 'TTT_Repeat', 'Switch': 'TTT_Switch'},
+    'Stimulus-Stimulus Congruency': {'Congruent': 'SS_Congruent', 'Neutral': 'SS_Neutral',
+                                     'Incongruent': 'SS_Incongruent'},
+    'Stimulus-Response Congruency': {'Congruent': 'SR_Congruent', 'Neutral': 'SR_Neutral',
+                                     'Incongruent': 'SR_Incongruent'},
+}
+
+class OrdinalCodebook:
+    """
+    Label <-> code tables for every ordinal and binary feature in FEATURE_ENCODINGS.
+
+    Columns are addressed by conceptual name ('Task 1 Cue Type') or preprocess()
+    column name ('Task 1 Cue Type Mapped'). encode() accepts the mapped labels and
+    their ORDINAL_LABEL_ALIASES; anything else (N/A, NaN, unknown labels) becomes
+    NaN. decode() snaps codes to the nearest level and returns the mapped label.
+    """
+    def __init__(self):
+        self._codes = {}
+        for name, (column, encoding, codes) in FEATURE_ENCODINGS.items():
+            if encoding == 'continuous':
+                continue
+            table = dict(codes)
+            for raw, mapped in ORDINAL_LABEL_ALIASES.get(name, {}).items():
+                table[raw] = codes[mapped]
+            self._codes[name] = table
+            self._codes.setdefault(column, table)
+        self._encodings = {key: FEATURE_ENCODINGS[key][1] for key in FEATURE_ENCODINGS}
+        self._encodings.update({column: encoding for column, encoding, _ in FEATURE_ENCODINGS.values()})
+
+    def __contains__(self, column):
+        return column in self._codes
+
+    def codes(self, column):
+        """Label -> code for one column, aliases included."""
+        return self._codes[column]
+
+    def levels(self, column):
+        """Sorted distinct codes of a column."""
+        return np.unique(list(self._codes[column].values()))
+
+    def ordinal_columns(self, columns):
+        """The columns of `columns` with an 'ordinal' encoding, in order."""
+        return [col for col in columns if col in self._codes and self._encodings[col] == 'ordinal']
+
+    def encode(self, df, columns):
+        """
+        Returns df[columns] as float codes in one vectorized pass.
+
+        All columns are stacked and factorized together, a (column x unique
+        label) code table is filled from the per-column dictionaries, and the
+        codes are gathered with a single take.
+        """
+        if not columns:
+            return pd.DataFrame(index=df.index)
+        values = df[columns].to_numpy(dtype=object)
+        labels, uniques = pd.factorize(values.ravel())
+        table = np.full((len(columns), len(uniques) + 1), np.nan)
+        for i, col in enumerate(columns):
+            codes = self._codes[col]
+            for j, label in enumerate(uniques):
+                code = codes.get(label)
+                if code is not None:
+                    table[i, j] = code
+        # factorize's NaN sentinel (-1) picks up the all-NaN last column.
+        flat = np.tile(np.arange(len(columns)) * table.shape[1], len(df)) + labels
+        flat[labels < 0] += table.shape[1]
+        encoded = table.take(flat).reshape(values.shape)
+        return pd.DataFrame(encoded, index=df.index, columns=columns)
+
+    def snap(self, df, columns):
+        """Returns df[columns] with each value moved to the nearest code; NaN stays NaN."""
+        snapped = {}
+        for col in columns:
+            levels = self.levels(col)
+            values = df[col].to_numpy(dtype=float)
+            nearest = np.abs(values[:, None] - levels[None, :]).argmin(axis=1)
+            snapped[col] = np.where(np.isnan(values), np.nan, levels[nearest])
+        return pd.DataFrame(snapped, index=df.index, columns=columns)
+
+    def decode(self, df, columns):
+        """Returns df[columns] as labels (the first label of each snapped code)."""
+        snapped = self.snap(df, columns)
+        decoded = {}
+        for col in columns:
+            label_of = {}
+            for label, code in self._codes[col].items():
+                label_of.setdefault(code, label)
+            decoded[col] = snapped[col].map(label_of)
+        return pd.DataFrame(decoded, index=df.index, columns=columns)
+
+ORDINAL_CODEBOOK = OrdinalCodebook()
+
+# Conceptual columns _prepare_mofa_data_sparse ordinal-encodes, in encoding order.
+LEGACY_ORDINAL_COLUMNS = [
+    'Stimulus-Stimulus Congruency', 'Stimulus-Response Congruency', 'Response Set Overlap',
+    'Task 1 Stimulus-Response Mapping', 'Task 2 Stimulus-Response Mapping',
+    'Trial Transition Type', 'Task 1 Cue Type', 'Task 2 Cue Type',
+]
+
 # =============================================================================
 # 1. Helper Functions for Data Cleaning
 # =============================================================================
 
-def validate_and_log_warnings(df, logger):
+# Validation heuristics run by validate_and_log_warnings, in logging order:
+# (rule name, warning text). The ITTR message is formatted per row with the
+# offending values.
+VALIDATION_RULES = [
+    ('t2_difficulty_single_task', "Task 2 Difficulty is present for a single-task condition"),
+    ('t2_csi_single_task', "Task 2 CSI is present for a single-task condition"),
+    ('t2_srm_single_task', "Task 2 Stimulus-Response Mapping is present for a single-task condition"),
+    ('t2_cue_type_single_task', "Task 2 Cue Type is present for a single-task condition"),
+    ('pure_with_switch_rate', "Trial Transition is 'Pure' but Switch Rate is not 0%"),
+    ('switch_repeat_without_switch_rate', "Trial Transition is 'Switch' or 'Repeat' but Switch Rate is 0%"),
+    ('inter_task_soa_without_dual_task', "Inter-task SOA has a value but T2RP is not 1"),
+    ('distractor_soa_without_conflict', "Distractor SOA has a value but neither S-S nor S-R congruency is defined"),
+    ('ittr_mismatch', "Intra-Trial Task Relationship does not match Task 1 and Task 2 Types"),
+]
+
+
+class ValidationReport:
+    """
+    Result of validate_and_log_warnings().
+
+    Attributes:
+        masks (dict): Rule name -> boolean numpy array over the validated rows.
+        index (pd.Index): The index of the validated frame.
+        experiments (np.ndarray): The name used for each row in the warnings.
+    """
+    def __init__(self, masks, index, experiments):
+        self.masks = masks
+        self.index = index
+        self.experiments = experiments
+
+    @property
+    def counts(self):
+        """Rule name -> number of violating rows, for every rule."""
+        return {rule: int(mask.sum()) for rule, mask in self.masks.items()}
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def __bool__(self):
+        """True if any rule was violated."""
+        return self.total > 0
+
+    def row_indices(self, rule):
+        """Index labels of the rows violating the given rule."""
+        return self.index[self.masks[rule]]
+
+    def offending_experiments(self, rule):
+        """Experiment names of the rows violating the given rule, deduplicated in row order."""
+        return list(pd.unique(self.experiments[self.masks[rule]]))
+
+    def summary(self):
+        """DataFrame with one row per violated rule: Rule, Description, Count, Experiments."""
+        descriptions = dict(VALIDATION_RULES)
+        records = [
+            {
+                'Rule': rule,
+                'Description': descriptions[rule],
+                'Count': count,
+                'Experiments': self.offending_experiments(rule),
+            }
+            for rule, count in self.counts.items() if count
+        ]
+        return pd.DataFrame(records, columns=['Rule', 'Description', 'Count', 'Experiments'])
+
+
+def _has_value(series):
+    return (series.notna() & (series != 'N/A')).to_numpy(dtype=bool)
+
+
+def validate_and_log_warnings(df, logger, summary_only=False):
     """
     Validates the DataFrame for common logical inconsistencies and logs warnings.
+
+    Each heuristic in VALIDATION_RULES is evaluated as a boolean mask over the
+    whole frame. By default one warning is logged per violation, in row order;
+    with summary_only=True a single line with the per-rule counts is logged
+    instead, which keeps validation cheap on very large inputs.
+
+    Returns:
+        ValidationReport: Per-rule masks, counts, row indices and Experiment names.
     """
-    for index, row in df.iterrows():
-        # Use a more descriptive name for logging, if available
-        exp_name = row.get('Experiment', f"index {index}")
-
-        # Heuristic 1: If T2RP is 0, T2-related columns should be N/A.
-        if row['Task 2 Response Probability'] == 0 and row['Switch Rate'] == 0:
-            if pd.notna(row.get('Task 2 Difficulty')) and row.get('Task 2 Difficulty') != 'N/A':
-                logger.warning(f"Warning: Task 2 Difficulty is present for a single-task condition in experiment {exp_name}.")
-            if pd.notna(row.get('Task 2 CSI')) and row.get('Task 2 CSI') != 'N/A':
-                logger.warning(f"Warning: Task 2 CSI is present for a single-task condition in experiment {exp_name}.")
-            if pd.notna(row.get('Task 2 Stimulus-Response Mapping')) and row.get('Task 2 Stimulus-Response Mapping') != 'N/A':
-                logger.warning(f"Warning: Task 2 Stimulus-Response Mapping is present for a single-task condition in experiment {exp_name}.")
-            if pd.notna(row.get('Task 2 Cue Type')) and row.get('Task 2 Cue Type') != 'N/A':
-                logger.warning(f"Warning: Task 2 Cue Type is present for a single-task condition in experiment {exp_name}.")
-
-        # Heuristic 2 & 3: Check for logical consistency between Trial Transition Type and Switch Rate.
-        if row.get('Trial Transition Type') == 'Pure' and row.get('Switch Rate', 0) != 0:
-            logger.warning(f"Warning: Trial Transition is 'Pure' but Switch Rate is not 0% in experiment {exp_name}.")
-        if row.get('Trial Transition Type') in ['Switch', 'Repeat'] and row.get('Switch Rate', 0) == 0:
-            logger.warning(f"Warning: Trial Transition is 'Switch' or 'Repeat' but Switch Rate is 0% in experiment {exp_name}.")
-
-        # Heuristic 4: If Inter-task SOA has a value, T2RP should be 1.
-        if pd.notna(row.get('Inter-task SOA')) and row.get('Inter-task SOA') != 'N/A' and row.get('Task 2 Response Probability') != 1:
-            logger.warning(f"Warning: Inter-task SOA has a value but T2RP is not 1 in experiment {exp_name}.")
-
-        # Heuristic 5: If Distractor SOA has a value, there must be some form of S-S or S-R conflict defined.
-        if pd.notna(row.get('Distractor SOA')) and row.get('Distractor SOA') != 'N/A':
-            ss_is_na = pd.isna(row.get('Stimulus-Stimulus Congruency')) or row.get('Stimulus-Stimulus Congruency') == 'N/A'
-            sr_is_na = pd.isna(row.get('Stimulus-Response Congruency')) or row.get('Stimulus-Response Congruency') == 'N/A'
-            if ss_is_na and sr_is_na:
-                logger.warning(f"Warning: Distractor SOA has a value but neither S-S nor S-R congruency is defined in experiment {exp_name}.")
-
-        # Heuristic 6: Check Intra-Trial Task Relationship consistency with Task 1 and Task 2 Types
-        ittr_value = row.get('Intra-Trial Task Relationship')
-        task1_type = row.get('Task 1 Type')
-        task2_type = row.get('Task 2 Type')
-        
-        if pd.notna(ittr_value) and ittr_value != 'N/A':
-            # Check if single-task condition should be N/A
-            # For dual-task conditions, validate the relationship
-            if pd.notna(task1_type) and pd.notna(task2_type) and task1_type != 'N/A' and task2_type != 'N/A':
-                expected_relationship = 'Same' if task1_type == task2_type else 'Different'
-                if ittr_value != expected_relationship:
-                    logger.warning(f"Warning: Intra-Trial Task Relationship is '{ittr_value}' but Task 1 Type ('{task1_type}') and Task 2 Type ('{task2_type}') suggest it should be '{expected_relationship}' in experiment {exp_name}.")
+    n_rows = len(df)
+    missing = pd.Series(None, index=df.index, dtype=object)
+
+    def column(name):
+        return df[name] if name in df.columns else missing
+
+    t2rp = df['Task 2 Response Probability']
+    switch_rate = df['Switch Rate'] if 'Switch Rate' in df.columns else pd.Series(0, index=df.index)
+    transition = column('Trial Transition Type')
+
+    # Heuristic 1: If T2RP is 0, T2-related columns should be N/A.
+    single_task = ((t2rp == 0) & (switch_rate == 0)).to_numpy(dtype=bool)
+    masks = {
+        't2_difficulty_single_task': single_task & _has_value(column('Task 2 Difficulty')),
+        't2_csi_single_task': single_task & _has_value(column('Task 2 CSI')),
+        't2_srm_single_task': single_task & _has_value(column('Task 2 Stimulus-Response Mapping')),
+        't2_cue_type_single_task': single_task & _has_value(column('Task 2 Cue Type')),
+    }
+
+    # Heuristic 2 & 3: Check for logical consistency between Trial Transition Type and Switch Rate.
+    masks['pure_with_switch_rate'] = ((transition == 'Pure') & (switch_rate != 0)).to_numpy(dtype=bool)
+    masks['switch_repeat_without_switch_rate'] = (
+        transition.isin(['Switch', 'Repeat']) & (switch_rate == 0)).to_numpy(dtype=bool)
+
+    # Heuristic 4: If Inter-task SOA has a value, T2RP should be 1.
+    masks['inter_task_soa_without_dual_task'] = (
+        _has_value(column('Inter-task SOA')) & (t2rp != 1).to_numpy(dtype=bool))
+
+    # Heuristic 5: If Distractor SOA has a value, there must be some form of S-S or S-R conflict defined.
+    masks['distractor_soa_without_conflict'] = (
+        _has_value(column('Distractor SOA'))
+        & ~_has_value(column('Stimulus-Stimulus Congruency'))
+        & ~_has_value(column('Stimulus-Response Congruency')))
+
+    # Heuristic 6: Check Intra-Trial Task Relationship consistency with Task 1 and Task 2 Types
+    ittr = column('Intra-Trial Task Relationship')
+    task1_type = column('Task 1 Type')
+    task2_type = column('Task 2 Type')
+    expected_relationship = pd.Series(
+        np.where(task1_type == task2_type, 'Same', 'Different'), index=df.index)
+    masks['ittr_mismatch'] = (
+        _has_value(ittr) & _has_value(task1_type) & _has_value(task2_type)
+        & (ittr != expected_relationship).to_numpy(dtype=bool))
+
+    if 'Experiment' in df.columns:
+        experiments = df['Experiment'].to_numpy(dtype=object)
+    else:
+        experiments = np.array([f"index {index}" for index in df.index], dtype=object)
+    report = ValidationReport(masks, df.index, experiments)
+
+    if summary_only:
+        if report:
+            details = ', '.join(f"{rule}: {count}" for rule, count in report.counts.items() if count)
+            logger.warning(f"Warning: {report.total} validation warning(s) in {n_rows} rows ({details}).")
+        return report
+
+    # Log the individual warnings row by row, in VALIDATION_RULES order within a row.
+    rule_names = [rule for rule, _ in VALIDATION_RULES]
+    descriptions = dict(VALIDATION_RULES)
+    positions, rule_ids = [], []
+    for rule_id, rule in enumerate(rule_names):
+        hits = np.flatnonzero(masks[rule])
+        positions.append(hits)
+        rule_ids.append(np.full(len(hits), rule_id))
+    positions = np.concatenate(positions)
+    rule_ids = np.concatenate(rule_ids)
+    order = np.lexsort((rule_ids, positions))
+    for position, rule_id in zip(positions[order], rule_ids[order]):
+        rule = rule_names[rule_id]
+        exp_name = experiments[position]
+        if rule == 'ittr_mismatch':
+            ittr_value = ittr.iat[position]
+            t1, t2 = task1_type.iat[position], task2_type.iat[position]
+            logger.warning(f"Warning: Intra-Trial Task Relationship is '{ittr_value}' but Task 1 Type ('{t1}') and Task 2 Type ('{t2}') suggest it should be '{expected_relationship.iat[position]}' in experiment {exp_name}.")
+        else:
+            logger.warning(f"Warning: {descriptions[rule]} in experiment {exp_name}.")
+    return report
+
 
+@contextmanager
+def copy_on_write():
+    """
+    Context manager that runs the preprocessing chain under pandas copy-on-write.
+
+    preprocess(), apply_conceptual_constraints(), reverse_map_categories(),
+    prepare_mofa_data() and _prepare_mofa_data_sparse() never modify their input
+    frame. Normally each starts from a full df.copy(); under copy-on-write they
+    take a shallow working copy instead, and pandas duplicates a column only when
+    it is written. Selections and renames of intermediate frames become lazy too.
+    The outputs are identical in both modes.
+    """
+    with pd.option_context('mode.copy_on_write', True):
+        yield
+
+def _working_copy(df):
+    """A copy of df owned by the caller: shallow under copy-on-write, deep otherwise."""
+    if pd.get_option('mode.copy_on_write') is True:
+        return df.copy(deep=False)
+    return df.copy()
 
 def clean_rsi(value):
     """Converts various RSI string formats to a single float, or NaN."""
@@ -148,6 +524,51 @@ def normalize_tristate_flag(value):
 
     return 'N/A'
 
+
+class UniqueCleaningStats(NamedTuple):
+    """How much work clean_via_uniques() saved on one column."""
+    n_rows: int
+    n_unique: int
+    hit_ratio: float  # Fraction of rows served from an already-cleaned value
+
+
+def clean_via_uniques(series, cleaner, return_stats=False):
+    """
+    Equivalent of series.apply(cleaner) for low-cardinality columns.
+
+    The column is factorized (NaN kept as its own value), cleaner is called once
+    per distinct value and the results are broadcast back to the rows, so the
+    cost grows with the number of distinct values rather than rows. The hit
+    ratio is logged at DEBUG level.
+
+    Returns:
+        pd.Series with the index and name of series, or (pd.Series, UniqueCleaningStats)
+        if return_stats is True.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    cleaned_uniques = [cleaner(value) for value in uniques]
+    if not cleaned_uniques:
+        cleaned = series.apply(cleaner)
+    else:
+        # Let pandas infer the dtype from the cleaned values, as apply() would.
+        cleaned_uniques = pd.Series(cleaned_uniques).to_numpy()
+        cleaned = pd.Series(cleaned_uniques[codes], index=series.index, name=series.name)
+
+    n_rows, n_unique = len(series), len(uniques)
+    stats = UniqueCleaningStats(n_rows, n_unique, 1 - n_unique / n_rows if n_rows else 0.0)
+    logging.getLogger(__name__).debug(
+        f"Cleaned '{series.name}' via {getattr(cleaner, '__name__', 'cleaner')}: "
+        f"{n_unique} distinct values for {n_rows} rows (hit ratio {stats.hit_ratio:.1%})."
+    )
+    if return_stats:
+        return cleaned, stats
+    return cleaned
+
+
+def clean_yes_flag(value):
+    """Returns 1 for 'yes' (any case), 0 otherwise."""
+    return 1 if str(value).lower() == 'yes' else 0
+
 def classify_paradigm(row):
     """
     Classifies each experimental condition into a broader paradigm class based on key dimensions.
@@ -169,6 +590,33 @@ def classify_paradigm(row):
     # 4. Pure single-task baselines are what remains.
     return 'Single-Task' # Simplified remaining logic
 
+# Paradigm labels in classification priority order (see classify_paradigm).
+PARADIGM_CATEGORIES = ['Dual-Task_PRP', 'Task Switching', 'Interference', 'Single-Task']
+
+def classify_paradigm_frame(df):
+    """
+    Vectorized classify_paradigm for a whole (cleaned) frame.
+
+    Applies the same hierarchy with np.select over the Task 2 Response
+    Probability, Switch Rate and congruency columns.
+
+    Returns:
+        pd.Series: Categorical 'Paradigm' labels (categories PARADIGM_CATEGORIES)
+        with the index of df.
+    """
+    def has_conflict(col):
+        if col not in df.columns:
+            return np.zeros(len(df), dtype=bool)
+        return ((df[col] != 'N/A') & df[col].notna()).to_numpy()
+
+    conditions = [
+        (pd.to_numeric(df['Task 2 Response Probability'], errors='coerce') > 0).to_numpy(),
+        (pd.to_numeric(df['Switch Rate'], errors='coerce') > 0).to_numpy(),
+        has_conflict('Stimulus-Stimulus Congruency') | has_conflict('Stimulus-Response Congruency'),
+    ]
+    labels = np.select(conditions, PARADIGM_CATEGORIES[:3], default=PARADIGM_CATEGORIES[3])
+    return pd.Series(pd.Categorical(labels, categories=PARADIGM_CATEGORIES), index=df.index, name='Paradigm')
+
 def map_ss_congruency(val):
     """Maps Stimulus-Stimulus Congruency to standardized codes."""
     val_str = str(val)
@@ -254,9 +702,77 @@ def map_ittr(val): # For Intra-Trial Task Relationship
     if val_str == 'n/a' or pd.isna(val): return 'ITTR_NA'
     return 'ITTR_NA'
 
+# --- Table-driven categorical mapping ---
+# Declarative form of the map_* functions above (which are kept as the reference
+# implementation). 'match' is how each rule key is compared with str(value):
+#   'exact'       -> str(value) == key
+#   'exact_lower' -> str(value).lower() == key
+#   'contains'    -> key in str(value).lower()
+# Rules are tried in order; 'default' applies when none matches (including NaN).
+CATEGORY_MAPPINGS = {
+    'ss_congruency': {'match': 'exact', 'default': 'SS_NA', 'rules': [
+        ('Congruent', 'SS_Congruent'), ('Incongruent', 'SS_Incongruent'), ('Neutral', 'SS_Neutral')]},
+    'sr_congruency': {'match': 'exact', 'default': 'SR_NA', 'rules': [
+        ('Congruent', 'SR_Congruent'), ('Incongruent', 'SR_Incongruent'), ('Neutral', 'SR_Neutral')]},
+    'sbc': {'match': 'exact', 'default': 'N/A', 'rules': [
+        ('Congruent', 'Congruent'), ('Incongruent', 'Incongruent'), ('Neutral', 'Neutral')]},
+    'rso': {'match': 'contains', 'default': 'RSO_NA', 'rules': [
+        ('identical', 'RSO_Identical'), ('disjoint', 'RSO_Disjoint')]},
+    'srm': {'match': 'contains', 'default': 'SRM_NA', 'rules': [
+        ('incompatible', 'SRM_Incompatible'), ('compatible', 'SRM_Compatible'), ('arbitrary', 'SRM_Arbitrary')]},
+    'tct': {'match': 'contains', 'default': 'TCT_Implicit', 'rules': [
+        ('arbitrary', 'TCT_Arbitrary'), ('none/implicit', 'TCT_Implicit')]},
+    'srm2': {'match': 'contains', 'default': 'SRM2_NA', 'rules': [
+        ('incompatible', 'SRM2_Incompatible'), ('compatible', 'SRM2_Compatible'), ('arbitrary', 'SRM2_Arbitrary')]},
+    'tct2': {'match': 'contains', 'default': 'TCT2_NA', 'rules': [
+        ('arbitrary', 'TCT2_Arbitrary'), ('none/implicit', 'TCT2_Implicit')]},
+    'ttt': {'match': 'contains', 'default': 'TTT_NA', 'rules': [
+        ('pure', 'TTT_Pure'), ('switch', 'TTT_Switch'), ('repeat', 'TTT_Repeat')]},
+    'ittr': {'match': 'exact_lower', 'default': 'ITTR_NA', 'rules': [
+        ('same', 'ITTR_Same'), ('different', 'ITTR_Different')]},
+}
+
+# (source column, mapped column, CATEGORY_MAPPINGS key) for Step 6 of preprocess
+PREPROCESS_CATEGORY_COLUMNS = [
+    ('Response Set Overlap', 'Response Set Overlap Mapped', 'rso'),
+    ('Task 1 Stimulus-Response Mapping', 'Task 1 Stimulus-Response Mapping Mapped', 'srm'),
+    ('Task 1 Cue Type', 'Task 1 Cue Type Mapped', 'tct'),
+    ('Task 2 Stimulus-Response Mapping', 'Task 2 Stimulus-Response Mapping Mapped', 'srm2'),
+    ('Task 2 Cue Type', 'Task 2 Cue Type Mapped', 'tct2'),
+    ('Trial Transition Type', 'Trial Transition Type Mapped', 'ttt'),
+    ('Intra-Trial Task Relationship', 'Intra-Trial Task Relationship Mapped', 'ittr'),
+]
+
+def _map_category_value(value, mapping):
+    """Applies one CATEGORY_MAPPINGS entry to a single value."""
+    val_str = str(value)
+    match = mapping['match']
+    if match != 'exact':
+        val_str = val_str.lower()
+    for key, label in mapping['rules']:
+        if (key in val_str) if match == 'contains' else (val_str == key):
+            return label
+    return mapping['default']
+
+def map_categories(series, mapping_name):
+    """
+    Vectorized equivalent of series.apply(map_<mapping_name>).
+
+    The column is factorized and each distinct value is mapped once through the
+    CATEGORY_MAPPINGS table, so the cost grows with the number of distinct
+    values rather than rows.
+
+    Returns:
+        pd.Series: Mapped labels (object dtype) with the index of series.
+    """
+    mapping = CATEGORY_MAPPINGS[mapping_name]
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    mapped_uniques = np.array([_map_category_value(value, mapping) for value in uniques], dtype=object)
+    return pd.Series(mapped_uniques[codes], index=series.index, name=series.name, dtype=object)
+
 def reverse_map_categories(df):
     """Restore human-readable categorical labels after inverse PCA interpolation."""
-    df_out = df.copy()
+    df_out = _working_copy(df)
 
     # Define the reverse mappings (the inverse of your 'map_*' functions)
     sbc_reverse_map = {
@@ -345,13 +861,14 @@ def reverse_map_categories(df):
         )
 
     if 'Inter-task SOA is Predictable' in df_out.columns:
-        df_out['Inter-task SOA is Predictable'] = df_out['Inter-task SOA is Predictable'].apply(normalize_tristate_flag)
+        df_out['Inter-task SOA is Predictable'] = clean_via_uniques(
+            df_out['Inter-task SOA is Predictable'], normalize_tristate_flag)
 
     return df_out
 
 def apply_conceptual_constraints(df):
     """Apply heuristics so single-task rows do not expose Task 2-specific values."""
-    df_out = df.copy()
+    df_out = _working_copy(df)
 
     threshold = 0.5
     min_criteria = 5
@@ -394,7 +911,35 @@ def apply_conceptual_constraints(df):
 # 2. Main Preprocessing Pipeline Function
 # =============================================================================
 
-def preprocess(df_raw, merge_conflict_dimensions=False, target='pca'):
+# Binary 0/1 features that compact_dtypes() stores as int8 rather than categoricals.
+COMPACT_INT8_COLUMNS = ['RSI is Predictable']
+
+def compact_dtypes(df, numerical_cols=(), categorical_cols=(), label='frame'):
+    """
+    Returns a copy of df with memory-efficient dtypes.
+
+    numerical_cols become float32; '* is NA' flags and COMPACT_INT8_COLUMNS
+    become int8; the remaining categorical_cols become pandas Categoricals.
+    Columns missing from df are skipped. The memory usage before and after is
+    logged at INFO level.
+    """
+    logger = logging.getLogger(__name__)
+    before = df.memory_usage(deep=True).sum()
+    conversions = {}
+    for col in numerical_cols:
+        if col in df.columns:
+            conversions[col] = np.float32
+    for col in categorical_cols:
+        if col in df.columns:
+            is_flag = col.endswith(' is NA') or col in COMPACT_INT8_COLUMNS
+            conversions[col] = np.int8 if is_flag else 'category'
+    df_compact = df.astype(conversions)
+    after = df_compact.memory_usage(deep=True).sum()
+    logger.info(f"Compact dtypes for {label}: {before / 1024:.1f} KiB -> {after / 1024:.1f} KiB.")
+    return df_compact
+
+def preprocess(df_raw, merge_conflict_dimensions=False, target='pca', validation_summary_only=False,
+               compact=False):
     """
     Performs all preprocessing for either PCA or MOFA+.
 
@@ -402,12 +947,54 @@ def preprocess(df_raw, merge_conflict_dimensions=False, target='pca'):
         df_raw (pd.DataFrame): The raw data from the CSV.
         merge_conflict_dimensions (bool): If True, merge conflict columns.
         target (str): The target analysis pipeline ('pca' or 'mofa').
+        validation_summary_only (bool): If True, log one summary line for the
+            validation heuristics instead of one warning per violation.
+        compact (bool): If True, df_features and df_processed use compact dtypes
+            (see compact_dtypes()): float32 numerics, int8 flags and Categorical
+            mapped features.
 
     Returns:
         (df_features, numerical_cols, categorical_cols, df_processed, preprocessor)
     """
+    df_features, numerical_cols, categorical_cols, df, _ = _preprocess_frame(
+        df_raw, merge_conflict_dimensions=merge_conflict_dimensions, target=target,
+        validation_summary_only=validation_summary_only
+    )
+    if compact:
+        df_features = compact_dtypes(df_features, numerical_cols, categorical_cols, label='df_features')
+        processed_numerical_cols = numerical_cols + [col + ' Norm' for col in numerical_cols if col + ' Norm' in df.columns]
+        df = compact_dtypes(df, processed_numerical_cols, categorical_cols, label='df_processed')
+    preprocessor = _build_column_transformer(numerical_cols, categorical_cols)
+    return df_features, numerical_cols, categorical_cols, df, preprocessor
+
+def _build_column_transformer(numerical_cols, categorical_cols):
+    return InvertibleColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), numerical_cols),
+            ('cat', OneHotEncoder(handle_unknown='ignore', drop=None), categorical_cols)
+        ],
+        remainder='drop'
+    )
+
+def _preprocess_frame(df_raw, merge_conflict_dimensions=False, target='pca', statistics=None,
+                      validation_summary_only=False):
+    """
+    The preprocessing steps behind preprocess() and DesignSpacePreprocessor.
+
+    The imputation statistics (medians/means) are computed from df_raw when
+    statistics is None, or taken from the given dict otherwise.
+
+    Returns:
+        (df_features, numerical_cols, categorical_cols, df_processed, statistics)
+    """
     logger = logging.getLogger(__name__)
-    df = df_raw.copy()
+    df = _working_copy(df_raw)
+    fitted_statistics = {}
+
+    def statistic(name, compute):
+        value = compute() if statistics is None else statistics[name]
+        fitted_statistics[name] = value
+        return value
 
     # Ensure the Inter-task SOA predictability flag exists so downstream column
     # selection remains stable even if older datasets omit it.
@@ -426,14 +1013,14 @@ def preprocess(df_raw, merge_conflict_dimensions=False, target='pca'):
 
     # Apply special cleaning functions
     if 'RSI' in df.columns:
-        df['RSI'] = df['RSI'].apply(clean_rsi)
+        df['RSI'] = clean_via_uniques(df['RSI'], clean_rsi)
     if 'Switch Rate' in df.columns:
-        df['Switch Rate'] = df['Switch Rate'].apply(clean_switch_rate)
+        df['Switch Rate'] = clean_via_uniques(df['Switch Rate'], clean_switch_rate)
 
     # Impute RSI with the median for PCA, but not for MOFA
     if target == 'pca':
         if 'RSI' in df.columns:
-            rsi_median = df['RSI'].median()
+            rsi_median = statistic('RSI median', df['RSI'].median)
             df['RSI'] = df['RSI'].fillna(rsi_median)
 
     # Normalize Task Difficulty (1-5 scale to 0-1)
@@ -441,10 +1028,11 @@ def preprocess(df_raw, merge_conflict_dimensions=False, target='pca'):
     df['Task 2 Difficulty Norm'] = (df['Task 2 Difficulty'] - 1) / 4
 
     # --- Step 2: Validate data and log warnings ---
-    validate_and_log_warnings(df, logger)
+    validate_and_log_warnings(df, logger, summary_only=validation_summary_only)
 
     # --- Step 3: Add Paradigm Classification for Difficulty Placeholder and Plotting ---
-    df['Paradigm'] = df.apply(classify_paradigm, axis=1)
+    # Stored as plain labels, as downstream code maps and fills this column freely.
+    df['Paradigm'] = classify_paradigm_frame(df).astype(object)
 
     # --- Step 4: Create binary presence features ---
     # Generate Applicability Flags DIRECTLY from NaN status.
@@ -455,19 +1043,22 @@ def preprocess(df_raw, merge_conflict_dimensions=False, target='pca'):
     df['Task 2 Difficulty is NA'] = df['Task 2 Difficulty'].isna().astype(int)
     
     # --- Step 5: Manual Imputation ---
-    df['Inter-task SOA'] = df['Inter-task SOA'].fillna(df['Inter-task SOA'].median())
-    df['Distractor SOA'] = df['Distractor SOA'].fillna(df['Distractor SOA'].median())
+    df['Inter-task SOA'] = df['Inter-task SOA'].fillna(statistic('Inter-task SOA median', df['Inter-task SOA'].median))
+    df['Distractor SOA'] = df['Distractor SOA'].fillna(statistic('Distractor SOA median', df['Distractor SOA'].median))
     df['Task 1 CSI'] = df['Task 1 CSI'].fillna(0)
-    df['Task 2 CSI'] = df['Task 2 CSI'].fillna(df['Task 2 CSI'].median())
-    df['Task 1 Difficulty Norm'] = df['Task 1 Difficulty Norm'].fillna(df['Task 1 Difficulty Norm'].mean())
-    df['Task 2 Difficulty Norm'] = df['Task 2 Difficulty Norm'].fillna(df['Task 2 Difficulty Norm'].mean())
+    df['Task 2 CSI'] = df['Task 2 CSI'].fillna(statistic('Task 2 CSI median', df['Task 2 CSI'].median))
+    df['Task 1 Difficulty Norm'] = df['Task 1 Difficulty Norm'].fillna(
+        statistic('Task 1 Difficulty Norm mean', df['Task 1 Difficulty Norm'].mean))
+    df['Task 2 Difficulty Norm'] = df['Task 2 Difficulty Norm'].fillna(
+        statistic('Task 2 Difficulty Norm mean', df['Task 2 Difficulty Norm'].mean))
 
     # Process new binary 'RSI is Predictable'
-    df['RSI is Predictable'] = df['RSI is Predictable'].apply(lambda x: 1 if str(x).lower() == 'yes' else 0)
+    df['RSI is Predictable'] = clean_via_uniques(df['RSI is Predictable'], clean_yes_flag)
 
     # Normalize the tri-state Inter-task SOA predictability flag
     if 'Inter-task SOA is Predictable' in df.columns:
-        df['Inter-task SOA is Predictable'] = df['Inter-task SOA is Predictable'].apply(normalize_tristate_flag)
+        df['Inter-task SOA is Predictable'] = clean_via_uniques(
+            df['Inter-task SOA is Predictable'], normalize_tristate_flag)
 
     # --- Step 6: Map Categorical Features ---
     if merge_conflict_dimensions:
@@ -493,19 +1084,13 @@ def preprocess(df_raw, merge_conflict_dimensions=False, target='pca'):
             df['Stimulus-Stimulus Congruency'],
             df['Stimulus-Response Congruency']
         )"""
-        df['SBC_Mapped'] = df['Stimulus Bivalence & Congruency'].apply(map_sbc)
+        df['SBC_Mapped'] = map_categories(df['Stimulus Bivalence & Congruency'], 'sbc')
     else:
-        df['Stimulus-Stimulus Congruency Mapped'] = df['Stimulus-Stimulus Congruency'].apply(map_ss_congruency)
-        df['Stimulus-Response Congruency Mapped'] = df['Stimulus-Response Congruency'].apply(map_sr_congruency)
-
-    df['Response Set Overlap Mapped'] = df['Response Set Overlap'].apply(map_rso)
-    df['Task 1 Stimulus-Response Mapping Mapped'] = df['Task 1 Stimulus-Response Mapping'].apply(map_srm)
-    df['Task 1 Cue Type Mapped'] = df['Task 1 Cue Type'].apply(map_tct)
-    # New categorical mappings
-    df['Task 2 Stimulus-Response Mapping Mapped'] = df['Task 2 Stimulus-Response Mapping'].apply(map_srm2)
-    df['Task 2 Cue Type Mapped'] = df['Task 2 Cue Type'].apply(map_tct2)
-    df['Trial Transition Type Mapped'] = df['Trial Transition Type'].apply(map_ttt)
-    df['Intra-Trial Task Relationship Mapped'] = df['Intra-Trial Task Relationship'].apply(map_ittr)
+        df['Stimulus-Stimulus Congruency Mapped'] = map_categories(df['Stimulus-Stimulus Congruency'], 'ss_congruency')
+        df['Stimulus-Response Congruency Mapped'] = map_categories(df['Stimulus-Response Congruency'], 'sr_congruency')
+
+    for source_col, mapped_col, mapping_name in PREPROCESS_CATEGORY_COLUMNS:
+        df[mapped_col] = map_categories(df[source_col], mapping_name)
 
     # --- Step 7: Select final columns for the pipeline ---
     numerical_cols = [
@@ -535,16 +1120,201 @@ def preprocess(df_raw, merge_conflict_dimensions=False, target='pca'):
     # Update the list of numerical columns to match the renamed columns
     numerical_cols = [name.replace(' Norm', '') if 'Norm' in name else name for name in numerical_cols]
 
+    return df_features, numerical_cols, categorical_cols, df, fitted_statistics
 
-    preprocessor = InvertibleColumnTransformer(
-        transformers=[
-            ('num', StandardScaler(), numerical_cols),
-            ('cat', OneHotEncoder(handle_unknown='ignore', drop=None), categorical_cols)
-        ],
-        remainder='drop'
-    )
+class DesignSpacePreprocessor:
+    """
+    Fit/transform version of preprocess().
+
+    fit() captures the imputation statistics (RSI, Inter-task SOA, Distractor SOA
+    and Task 2 CSI medians, difficulty means) and fits the InvertibleColumnTransformer
+    on a raw design space. transform() applies the same cleaning, flag rules,
+    imputation values and fitted scaler/encoder to new conditions without refitting,
+    so e.g. a single new experiment can be projected into an existing PCA space.
+
+    Attributes (after fit):
+        statistics_ (dict): Imputation values, keyed by description.
+        numerical_cols_, categorical_cols_ (list): Feature columns, as from preprocess().
+        column_transformer_ (InvertibleColumnTransformer): The fitted transformer.
+    """
+    def __init__(self, merge_conflict_dimensions=False, target='pca'):
+        self.merge_conflict_dimensions = merge_conflict_dimensions
+        self.target = target
+
+    def fit(self, df_raw):
+        self._fit_frame(df_raw)
+        return self
+
+    def _fit_frame(self, df_raw):
+        """fit(), returning the (df_features, df_processed) of df_raw it was fitted on."""
+        df_features, numerical_cols, categorical_cols, df_processed, statistics = _preprocess_frame(
+            df_raw, merge_conflict_dimensions=self.merge_conflict_dimensions, target=self.target
+        )
+        self.statistics_ = statistics
+        self.numerical_cols_ = numerical_cols
+        self.categorical_cols_ = categorical_cols
+        self.column_transformer_ = _build_column_transformer(numerical_cols, categorical_cols).fit(df_features)
+        return df_features, df_processed
 
-    return df_features, numerical_cols, categorical_cols, df, preprocessor
+    def transform_frame(self, df_raw):
+        """
+        Preprocesses df_raw with the fitted statistics.
+
+        Returns:
+            (df_features, df_processed), as the first and fourth values of preprocess().
+        """
+        if not hasattr(self, 'statistics_'):
+            raise NotFittedError("This DesignSpacePreprocessor instance is not fitted yet. Call 'fit' first.")
+        df_features, _, _, df_processed, _ = _preprocess_frame(
+            df_raw, merge_conflict_dimensions=self.merge_conflict_dimensions, target=self.target,
+            statistics=self.statistics_
+        )
+        return df_features, df_processed
+
+    def transform(self, df_raw):
+        """Returns the scaled/one-hot encoded feature matrix for df_raw."""
+        df_features, _ = self.transform_frame(df_raw)
+        return self.column_transformer_.transform(df_features)
+
+    def fit_transform(self, df_raw):
+        df_features, _ = self._fit_frame(df_raw)
+        return self.column_transformer_.transform(df_features)
+
+# Opt-in on-disk cache for preprocess_csv(); set PREPROCESS_CACHE_DIR (or pass
+# cache_dir) to enable it.
+PREPROCESS_CACHE_ENV = 'PREPROCESS_CACHE_DIR'
+PREPROCESS_CACHE_MAX_BYTES = 512 * 1024 ** 2
+PREPROCESS_CACHE_SUFFIX = '.preprocess.pkl'
+
+@lru_cache(maxsize=1)
+def analysis_utils_fingerprint():
+    """Digest of this module's source and the pandas/scikit-learn versions the cache pickles depend on."""
+    digest = hashlib.sha256()
+    with open(__file__, 'rb') as source_file:
+        digest.update(source_file.read())
+    digest.update(f"pandas {pd.__version__} sklearn {sklearn.__version__}".encode())
+    return digest.hexdigest()
+
+def preprocess_cache_key(csv_bytes, merge_conflict_dimensions=False, target='pca', read_csv_kwargs=None):
+    """Content address of one preprocess_csv() call."""
+    digest = hashlib.sha256(csv_bytes)
+    options = {
+        'merge_conflict_dimensions': bool(merge_conflict_dimensions),
+        'target': target,
+        'read_csv_kwargs': read_csv_kwargs or {},
+        'analysis_utils': analysis_utils_fingerprint(),
+    }
+    digest.update(json.dumps(options, sort_keys=True, default=repr).encode())
+    return digest.hexdigest()
+
+def evict_preprocess_cache(cache_dir, max_bytes=PREPROCESS_CACHE_MAX_BYTES):
+    """
+    Deletes least recently used cache entries until the cache holds at most max_bytes.
+
+    Returns:
+        list[str]: The paths of the deleted entries.
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(PREPROCESS_CACHE_SUFFIX):
+            stat = os.stat(os.path.join(cache_dir, name))
+            entries.append((stat.st_mtime, stat.st_size, os.path.join(cache_dir, name)))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+        evicted.append(path)
+    return evicted
+
+def _preprocess_csv_entry(csv_path, merge_conflict_dimensions, target, read_csv_kwargs, cache_dir, max_cache_bytes):
+    """
+    The cache entry behind preprocess_csv() and load_design_space_preprocessor():
+    {'result': preprocess_csv() tuple, 'design_space_preprocessor': fitted DesignSpacePreprocessor}.
+    """
+    logger = logging.getLogger(__name__)
+    read_csv_kwargs = dict(read_csv_kwargs or {})
+    with open(csv_path, 'rb') as csv_file:
+        csv_bytes = csv_file.read()
+
+    key = preprocess_cache_key(csv_bytes, merge_conflict_dimensions, target, read_csv_kwargs)
+    entry_path = os.path.join(cache_dir, key + PREPROCESS_CACHE_SUFFIX)
+    try:
+        with open(entry_path, 'rb') as entry_file:
+            entry = pickle.load(entry_file)
+        os.utime(entry_path)
+        logger.debug(f"Preprocess cache hit for {csv_path} ({key[:12]}).")
+        return entry
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        logger.warning(f"Ignoring unreadable preprocess cache entry {entry_path}: {e}")
+
+    logger.debug(f"Preprocess cache miss for {csv_path} ({key[:12]}).")
+    df_raw = pd.read_csv(io.BytesIO(csv_bytes), **read_csv_kwargs)
+    design_space_preprocessor = DesignSpacePreprocessor(merge_conflict_dimensions, target)
+    df_features, df_processed = design_space_preprocessor._fit_frame(df_raw)
+    numerical_cols = list(design_space_preprocessor.numerical_cols_)
+    categorical_cols = list(design_space_preprocessor.categorical_cols_)
+    # Unfitted, as returned by preprocess()
+    result = (df_features, numerical_cols, categorical_cols, df_processed,
+              _build_column_transformer(numerical_cols, categorical_cols))
+    entry = {'result': result, 'design_space_preprocessor': design_space_preprocessor}
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = f"{entry_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as entry_file:
+        pickle.dump(entry, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, entry_path)
+    evict_preprocess_cache(cache_dir, max_cache_bytes)
+    return entry
+
+def preprocess_csv(csv_path, merge_conflict_dimensions=False, target='pca', read_csv_kwargs=None,
+                   cache_dir=None, max_cache_bytes=PREPROCESS_CACHE_MAX_BYTES):
+    """
+    Reads csv_path and runs preprocess() on it, optionally through an on-disk cache.
+
+    Cache entries are addressed by a hash of the raw CSV bytes, the arguments and
+    analysis_utils_fingerprint(), so editing the data or this module invalidates
+    them automatically. Entries are pickled, refreshed on every hit and evicted
+    least recently used first once the cache exceeds max_cache_bytes. Each entry
+    also holds a fitted DesignSpacePreprocessor (see load_design_space_preprocessor()).
+
+    Args:
+        csv_path (str): Path of the raw design space CSV.
+        merge_conflict_dimensions (bool), target (str): As for preprocess().
+        read_csv_kwargs (dict): Extra keyword arguments for pd.read_csv.
+        cache_dir (str): Cache directory. Defaults to the PREPROCESS_CACHE_DIR
+            environment variable; caching is disabled if neither is set.
+        max_cache_bytes (int): Size limit of the cache directory.
+
+    Returns:
+        (df_features, numerical_cols, categorical_cols, df_processed, preprocessor), as preprocess().
+    """
+    cache_dir = cache_dir or os.environ.get(PREPROCESS_CACHE_ENV)
+    if not cache_dir:
+        df_raw = pd.read_csv(csv_path, **(read_csv_kwargs or {}))
+        return preprocess(df_raw, merge_conflict_dimensions=merge_conflict_dimensions, target=target)
+    return _preprocess_csv_entry(csv_path, merge_conflict_dimensions, target, read_csv_kwargs,
+                                 cache_dir, max_cache_bytes)['result']
+
+def load_design_space_preprocessor(csv_path, merge_conflict_dimensions=False, target='pca', read_csv_kwargs=None,
+                                   cache_dir=None, max_cache_bytes=PREPROCESS_CACHE_MAX_BYTES):
+    """
+    Returns a DesignSpacePreprocessor fitted on csv_path, through the preprocess_csv() cache.
+
+    A cache hit needs no refit, so new conditions can be transformed right away.
+    Arguments as for preprocess_csv().
+    """
+    cache_dir = cache_dir or os.environ.get(PREPROCESS_CACHE_ENV)
+    if not cache_dir:
+        df_raw = pd.read_csv(csv_path, **(read_csv_kwargs or {}))
+        return DesignSpacePreprocessor(merge_conflict_dimensions, target).fit(df_raw)
+    return _preprocess_csv_entry(csv_path, merge_conflict_dimensions, target, read_csv_kwargs,
+                                 cache_dir, max_cache_bytes)['design_space_preprocessor']
 
 def generate_dynamic_view_mapping(preprocessor, view_mapping_unified):
     """
@@ -558,60 +1328,145 @@ def generate_dynamic_view_mapping(preprocessor, view_mapping_unified):
     Returns:
         dict: A dictionary mapping transformed feature names to their corresponding view.
     """
-    # 1. Create a lookup from original conceptual feature name to its view.
-    conceptual_name_to_view = {
-        feature: view
-        for view, features in view_mapping_unified.items()
-        for feature in features
-    }
-
-    # 2. Get the exact list of columns that were fed into the preprocessor.
-    input_features = preprocessor.feature_names_in_
-    # 3. Get the exact list of columns that came out of the preprocessor.
-    output_features = preprocessor.get_feature_names_out()
+    registry = compile_feature_registry(view_mapping_unified)
+    input_features = set(preprocessor.feature_names_in_)
 
     final_mapping = {}
-    # 4. Iterate through each output feature and work backwards to find its origin.
-    for t_name in output_features:
-        # e.g., t_name = 'cat__Stimulus_Stimulus_Congruency_Mapped_SS_Congruent'
-        # or 'num__Inter-task SOA'
-        original_name_from_transformer = t_name.split('__')[1]
-
-        # Find which of the input columns is the source of this transformed column.
-        # This works because OHE appends to the name, so startswith is a reliable check.
-        source_input_col = None
-        for input_name in input_features:
-            if original_name_from_transformer.startswith(input_name):
-                source_input_col = input_name
-                break
-        
+    # Work backwards from each output feature (e.g. 'cat__SBC_Mapped_Congruent' or
+    # 'num__Inter-task SOA') to its input column and that column's view.
+    for t_name in preprocessor.get_feature_names_out():
+        source_input_col = registry.source(t_name, input_features)
         if source_input_col:
-            # Now, map this source column (e.g., 'Stimulus-Stimulus Congruency Mapped')
-            # back to its conceptual name (e.g., 'Stimulus-Stimulus Congruency').
-            conceptual_name = None
-            if source_input_col.endswith(' Mapped') or source_input_col == 'SBC_Mapped':
-                if source_input_col == 'SBC_Mapped':
-                    conceptual_name = 'Stimulus Bivalence & Congruency'
-                else:
-                    # e.g., 'Stimulus-Stimulus Congruency Mapped' -> 'Stimulus-Stimulus Congruency'
-                    conceptual_name = source_input_col.replace(' Mapped', '')
-            else:
-                # It's a numerical or binary column that didn't get mapped.
-                conceptual_name = source_input_col
-
-            # Finally, find the view for that conceptual name.
-            view = conceptual_name_to_view.get(conceptual_name)
+            view = registry.view(source_input_col)
             if view:
                 final_mapping[t_name] = view
             else:
+                spec = registry.get(source_input_col)
+                conceptual_name = spec.name if spec is not None else source_input_col
                 logging.warning(f"Could not find view for conceptual name: '{conceptual_name}' (from transformed: {t_name})")
         else:
             logging.warning(f"Could not find source input column for transformed feature: {t_name}")
             
     return final_mapping
 
+# Group name of the single MOFA+ group all studies belong to.
+MOFA_GROUP = 'all_studies'
+
+class MofaMatrices(NamedTuple):
+    """
+    MOFA+ input in the matrix layout: entry_point.set_data_matrix(**matrices._asdict(), likelihoods=...).
+    """
+    data: list            # data[m][g]: samples x features array of view m, group g (NaN = missing)
+    views_names: list
+    groups_names: list
+    samples_names: list   # One list of sample names per group
+    features_names: list  # One list of feature names per view
+
+def mofa_matrices(df_wide, sample_names, feature_to_view, compact=False):
+    """
+    Splits a wide feature frame into per-view matrices for a single MOFA+ group.
+
+    Columns without a view, and columns without any observed value (which the
+    long format would drop entirely), are left out. Views are sorted by name,
+    as for the likelihoods of the long format; features keep their column order.
+
+    Args:
+        df_wide (pd.DataFrame): One row per sample, one column per feature.
+        sample_names (sequence): The sample name of each row.
+        feature_to_view (dict): Feature name -> view.
+        compact (bool): If True, the arrays are float32 instead of float64.
+
+    Returns:
+        MofaMatrices
+    """
+    dtype = np.float32 if compact else np.float64
+    columns_by_view = {}
+    for col in df_wide.columns:
+        view = feature_to_view.get(col)
+        if view is not None:
+            columns_by_view.setdefault(view, []).append(col)
+
+    data, views_names, features_names = [], [], []
+    for view in sorted(columns_by_view):
+        values = df_wide[columns_by_view[view]].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=dtype)
+        observed = ~np.isnan(values).all(axis=0)
+        if not observed.any():
+            continue
+        data.append([values[:, observed]])
+        views_names.append(view)
+        features_names.append([col for col, keep in zip(columns_by_view[view], observed) if keep])
+
+    return MofaMatrices(data, views_names, [MOFA_GROUP], [list(sample_names)], features_names)
+
+# Identifier columns of the MOFA+ long format, stored as Categoricals by prepare_mofa_data(compact=True).
+MOFA_LONG_CATEGORICAL_COLUMNS = ['sample', 'feature', 'view', 'group']
+
+def mofa_long_frame(df_wide, sample_names, feature_to_view, compact=False, drop_missing=True):
+    """
+    Melts a wide feature frame into the MOFA+ long format for a single group.
+
+    The melt is done on the NumPy array: sample and feature codes are tiled and
+    repeated over the feature-major flattened values (the row order of pd.melt)
+    and the missing cells are dropped with one mask. Columns without a view are
+    left out; non-numeric values count as missing.
+
+    Args:
+        df_wide (pd.DataFrame): One row per sample, one column per feature.
+        sample_names (sequence): The sample name of each row.
+        feature_to_view (dict): Feature name -> view.
+        compact (bool): If True, 'value' is float32 and 'sample', 'feature', 'view'
+            and 'group' are Categoricals sharing one category set per column
+            (samples in row order, features in column order, views sorted).
+        drop_missing (bool): If True, cells with a missing value are left out.
+
+    Returns:
+        pd.DataFrame: Columns ['sample', 'feature', 'value', 'view', 'group'],
+            indexed like pd.melt followed by dropna.
+    """
+    dtype = np.float32 if compact else np.float64
+    values = df_wide.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=dtype)
+    n_samples = values.shape[0]
+    has_view = np.array([feature_to_view.get(col) is not None for col in df_wide.columns], dtype=bool)
+    features = list(df_wide.columns[has_view])
+
+    # Feature-major flattening gives the row order of pd.melt; keep holds the
+    # positions of the retained cells, which are also the pd.melt index labels.
+    flat_values = values.T.ravel()
+    keep = np.repeat(has_view, n_samples)
+    if drop_missing:
+        keep &= ~np.isnan(flat_values)
+    keep = np.flatnonzero(keep)
+    flat_values = flat_values[keep]
+    sample_codes = keep % n_samples
+    feature_codes = (np.cumsum(has_view) - 1)[keep // n_samples]
+
+    # Only views with a retained cell are categories, as for the likelihoods.
+    views = np.array([feature_to_view[col] for col in features], dtype=object)
+    view_names = sorted(set(views[np.unique(feature_codes)]))
+    view_index = {view: code for code, view in enumerate(view_names)}
+    view_codes = np.array([view_index.get(view, -1) for view in views], dtype=np.int64)[feature_codes]
+
+    row_samples, sample_uniques = pd.factorize(np.asarray(sample_names, dtype=object))
+    identifiers = {
+        'sample': (row_samples[sample_codes], sample_uniques),
+        'feature': (feature_codes, features),
+        'view': (view_codes, view_names),
+        'group': (np.zeros(len(keep), dtype=np.int8), [MOFA_GROUP]),
+    }
+    columns = {}
+    for col in MOFA_LONG_CATEGORICAL_COLUMNS:
+        codes, categories = identifiers[col]
+        if compact:
+            columns[col] = pd.Categorical.from_codes(codes, categories=categories)
+        else:
+            columns[col] = np.asarray(categories, dtype=object).take(codes)
+    columns['value'] = flat_values
+    columns = {col: columns[col] for col in ['sample', 'feature', 'value', 'view', 'group']}
+    return pd.DataFrame(columns, index=keep, copy=False)
+
 def prepare_mofa_data(df_raw: pd.DataFrame, strategy: str = 'sparse', 
-                     merge_conflict_dimensions: bool = False) -> tuple:
+                     merge_conflict_dimensions: bool = False, compact: bool = False,
+                     layout: str = 'long') -> tuple:
     """
     Prepares data for MOFA+ analysis with support for different preprocessing strategies.
     
@@ -627,16 +1482,26 @@ def prepare_mofa_data(df_raw: pd.DataFrame, strategy: str = 'sparse',
         merge_conflict_dimensions (bool): Whether to merge conflict dimensions (S-S and S-R congruency)
                                         into a single 'Stimulus Bivalence & Congruency' dimension.
                                         Default is False.
+        compact (bool): If True, df_long stores 'value' as float32 and 'sample', 'feature',
+                        'view' and 'group' as Categoricals (float32 arrays for layout='matrices').
+                        Default is False.
+        layout (str): 'long' for a long-format DataFrame (mofapy2 set_data_df), or 'matrices'
+                      for a MofaMatrices (mofapy2 set_data_matrix), which skips the melt.
+                      Default is 'long'.
     
     Returns:
         tuple: (df_long, likelihoods, preprocessor_obj, view_map)
             - df_long: Long-format DataFrame for MOFA+ with columns 
-                      ['sample', 'feature', 'value', 'view', 'group']
+                      ['sample', 'feature', 'value', 'view', 'group'],
+                      or a MofaMatrices if layout='matrices'
             - likelihoods: List of likelihoods ('gaussian' for all views)
             - preprocessor_obj: Fitted preprocessor object for inverse transformation
                                (StandardScaler for sparse, InvertibleColumnTransformer for dense)
             - view_map: Dictionary mapping feature names to their conceptual view
     """
+    if layout not in ('long', 'matrices'):
+        raise ValueError(f"Unknown layout: {layout}. Must be either 'long' or 'matrices'.")
+
     # Always use preprocess() for data cleaning and feature engineering
     df_features, numerical_cols, categorical_cols, df_processed, preprocessor = preprocess(
         df_raw, merge_conflict_dimensions=merge_conflict_dimensions, target='mofa'
@@ -654,42 +1519,23 @@ def prepare_mofa_data(df_raw: pd.DataFrame, strategy: str = 'sparse',
             index=df_features.index
         )
         
-        # Add experiment names back
-        df_features_wide['Experiment'] = df_processed['Experiment'].values
-        
-        # Melt to long format
-        df_long = pd.melt(
-            df_features_wide, 
-            id_vars=['Experiment'], 
-            value_vars=[col for col in df_features_wide.columns if col != 'Experiment'],
-            var_name='feature', 
-            value_name='value'
-        )
-        
-        # Rename Experiment to sample
-        df_long.rename(columns={'Experiment': 'sample'}, inplace=True)
-        
         # Generate dynamic view mapping using the fitted preprocessor
         view_map = generate_dynamic_view_mapping(preprocessor, get_view_mapping_unified(binary_flags=True))
+
+        if layout == 'matrices':
+            matrices = mofa_matrices(df_features_wide, df_processed['Experiment'], view_map, compact=compact)
+            return matrices, ['gaussian'] * len(matrices.views_names), preprocessor, view_map
         
-        # Add view mapping to df_long
-        df_long['view'] = df_long['feature'].map(view_map)
-        
-        # Filter out rows where view couldn't be assigned
-        df_long = df_long.dropna(subset=['view'])
-        
-        # Add group column
-        df_long['group'] = 'all_studies'
-        
-        # Create likelihoods list
-        views_ordered = sorted(df_long['view'].unique())
-        likelihoods = ['gaussian'] * len(views_ordered)
+        # Melt to long format; the dense matrix has no missing cells to drop
+        df_long = mofa_long_frame(df_features_wide, df_processed['Experiment'], view_map,
+                                  compact=compact, drop_missing=False)
+        likelihoods = ['gaussian'] * len(df_long['view'].unique())
         
         return df_long, likelihoods, preprocessor, view_map
         
     elif strategy == 'sparse':
         # Sparse strategy: Post-process the cleaned features with ordinal encoding
-        df_sparse = df_features.copy()
+        df_sparse = _working_copy(df_features)
         
         # For sparse strategy, we need to re-introduce NaN values where the original data was 'N/A'
         # The preprocess() function imputes these, but we want them to be missing for sparsity
@@ -701,86 +1547,12 @@ def prepare_mofa_data(df_raw: pd.DataFrame, strategy: str = 'sparse',
                     # Where the indicator is 1, set the value back to NaN
                     df_sparse.loc[df_sparse[na_indicator_col] == 1, col] = np.nan
         
-        # Apply ordinal encoding to categorical features (ignoring the one-hot preprocessor)
-        for col in categorical_cols:
-            if col in df_sparse.columns:
-                if col == 'SBC_Mapped':
-                    # Handle merged conflict dimension (Stimulus Bivalence & Congruency)
-                    # Only map actual values, leave N/A as NaN so they get dropped later
-                    sbc_mapping = {
-                        'Congruent': 1.0, 'Neutral': 0.0, 'Incongruent': -1.0
-                        # Note: 'N/A' is intentionally not mapped - it stays as NaN and gets dropped
-                    }
-                    df_sparse[col] = df_sparse[col].map(sbc_mapping)
-                    
-                elif 'Congruency' in col:
-                    # Map congruency columns to ordinal scale: Congruent=1.0, Neutral=0.0, Incongruent=-1.0
-                    congruency_mapping = {
-                        'SS_Congruent': 1.0, 'SS_Neutral': 0.0, 'SS_Incongruent': -1.0,
-                        'SR_Congruent': 1.0, 'SR_Neutral': 0.0, 'SR_Incongruent': -1.0,
-                        'Congruent': 1.0, 'Neutral': 0.0, 'Incongruent': -1.0
-                        # Note: mapped N/A values stay as NaN and get dropped
-                    }
-                    df_sparse[col] = df_sparse[col].map(congruency_mapping)
-                    
-                elif 'Response Set Overlap' in col:
-                    # Map RSO to ordinal scale: Identical=1.0, Disjoint variants=-1.0
-                    # RSO_NA values stay as NaN and get dropped
-                    rso_mapping = {
-                        'RSO_Identical': 1.0,
-                        'RSO_Disjoint': -1.0
-                    }
-                    df_sparse[col] = df_sparse[col].map(rso_mapping)
-                    
-                elif 'Stimulus-Response Mapping' in col:
-                    # Map SRM to ordinal scale: Compatible=1.0, Arbitrary=0.0, Incompatible=-1.0
-                    # SRM_NA/SRM2_NA values stay as NaN and get dropped
-                    srm_mapping = {
-                        'SRM_Compatible': 1.0, 'SRM_Arbitrary': 0.0, 'SRM_Incompatible': -1.0,
-                        'SRM2_Compatible': 1.0, 'SRM2_Arbitrary': 0.0, 'SRM2_Incompatible': -1.0
-                    }
-                    df_sparse[col] = df_sparse[col].map(srm_mapping)
-                    
-                elif 'Trial Transition Type' in col:
-                    # Map TTT to ordinal scale: Pure=0.0, Repeat=0.5, Switch=-0.5
-                    # TTT_NA values stay as NaN and get dropped
-                    ttt_mapping = {
-                        'TTT_Pure': 0.0, 'TTT_Repeat': 0.5, 'TTT_Switch': -0.5
-                    }
-                    df_sparse[col] = df_sparse[col].map(ttt_mapping)
-                    
-                elif 'Cue Type' in col:
-                    # Map cue type to ordinal scale: None/Implicit=0.0, Arbitrary=1.0
-                    # TCT_NA/TCT2_NA values stay as NaN and get dropped
-                    cue_mapping = {
-                        'TCT_Implicit': 0.0, 'TCT_Arbitrary': 1.0,
-                        'TCT2_Implicit': 0.0, 'TCT2_Arbitrary': 1.0
-                    }
-                    df_sparse[col] = df_sparse[col].map(cue_mapping)
-                    
-                elif 'Intra-Trial Task Relationship' in col:
-                    # Map ITTR to ordinal scale: Same=1.0, Different=-1.0
-                    # ITTR_NA values stay as NaN and get dropped
-                    ittr_mapping = {
-                        'ITTR_Same': 1.0, 'ITTR_Different': -1.0
-                    }
-                    df_sparse[col] = df_sparse[col].map(ittr_mapping)
-
-                elif col == 'Inter-task SOA is Predictable':
-                    # Map predictability to binary scale; N/A stays NaN
-                    predictability_mapping = {
-                        'Yes': 1.0,
-                        'No': 0.0
-                    }
-                    df_sparse[col] = df_sparse[col].map(predictability_mapping)
-
-                elif col == 'RSI is Predictable':
-                    # Already binary (0/1), keep as-is
-                    pass
-                    
-                else:
-                    # For other binary/indicator columns, keep as-is (0/1)
-                    pass
+        # Apply ordinal encoding to categorical features (ignoring the one-hot preprocessor).
+        # N/A labels are not in the codebook, so they become NaN and get dropped;
+        # binary/indicator columns (0/1) are kept as-is.
+        ordinal_cols = ORDINAL_CODEBOOK.ordinal_columns([col for col in categorical_cols if col in df_sparse.columns])
+        if ordinal_cols:
+            df_sparse[ordinal_cols] = ORDINAL_CODEBOOK.encode(df_sparse, ordinal_cols)
         
         # Standardize continuous features
         scaler = StandardScaler()
@@ -796,46 +1568,20 @@ def prepare_mofa_data(df_raw: pd.DataFrame, strategy: str = 'sparse',
             # Edge case: if no continuous columns, create a dummy scaler
             scaler.fit([[0.0]])
         
-        # Melt to long format
-        feature_columns = [col for col in df_sparse.columns]
-        df_sparse['Experiment'] = df_processed['Experiment'].values
-        
-        df_long = pd.melt(df_sparse, id_vars=['Experiment'], value_vars=feature_columns,
-                          var_name='feature', value_name='value')
-        
-        # Rename Experiment to sample
-        df_long.rename(columns={'Experiment': 'sample'}, inplace=True)
-        
-        # Drop missing values (MOFA+ native approach)
-        df_long.dropna(subset=['value'], inplace=True)
-        
-        # Convert values to numeric (handle any remaining object types)
-        df_long['value'] = pd.to_numeric(df_long['value'], errors='coerce')
-        df_long.dropna(subset=['value'], inplace=True)
-        
         # Generate view mapping for cleaned features
-        # Map the processed feature names back to their conceptual names for view assignment
-        feature_to_view = {}
-        for view, features in VIEW_MAPPING_UNIFIED.items():
-            for feature in features:
-                # Handle mapped column names
-                for col in df_sparse.columns:
-                    if (col.replace(' Mapped', '').replace('SBC_Mapped', 'Stimulus Bivalence & Congruency') == feature or
-                        col == feature):
-                        feature_to_view[col] = view
-        
-        # Add view mapping to df_long
-        df_long['view'] = df_long['feature'].map(feature_to_view)
-        
-        # Filter out rows where view couldn't be assigned
-        df_long = df_long.dropna(subset=['view'])
-        
-        # Add group column
-        df_long['group'] = 'all_studies'
+        # Map the processed feature names to the view of their conceptual feature
+        registry = compile_feature_registry()
+        feature_to_view = {
+            col: registry.view(col) for col in df_sparse.columns if registry.view(col) is not None
+        }
+
+        if layout == 'matrices':
+            matrices = mofa_matrices(df_sparse, df_processed['Experiment'], feature_to_view, compact=compact)
+            return matrices, ['gaussian'] * len(matrices.views_names), scaler, feature_to_view
         
-        # Create likelihoods list
-        views_ordered = sorted(df_long['view'].unique())
-        likelihoods = ['gaussian'] * len(views_ordered)
+        # Melt to long format, dropping missing values (MOFA+ native approach)
+        df_long = mofa_long_frame(df_sparse, df_processed['Experiment'], feature_to_view, compact=compact)
+        likelihoods = ['gaussian'] * len(df_long['view'].unique())
         
         return df_long, likelihoods, scaler, feature_to_view
         
@@ -862,7 +1608,7 @@ def _prepare_mofa_data_sparse(df_raw: pd.DataFrame) -> tuple[pd.DataFrame, list,
             - Fitted StandardScaler for inverse transformation of continuous features
     """
     logger = logging.getLogger(__name__)
-    df = df_raw.copy()
+    df = _working_copy(df_raw)
     
     # --- Step 1: Initial Data Cleaning ---
     # Replace string 'N/A' and 'Not Specified' with np.nan
@@ -871,9 +1617,9 @@ def _prepare_mofa_data_sparse(df_raw: pd.DataFrame) -> tuple[pd.DataFrame, list,
     
     # Apply special cleaning functions
     if 'RSI' in df.columns:
-        df['RSI'] = df['RSI'].apply(clean_rsi)
+        df['RSI'] = clean_via_uniques(df['RSI'], clean_rsi)
     if 'Switch Rate' in df.columns:
-        df['Switch Rate'] = df['Switch Rate'].apply(clean_switch_rate)
+        df['Switch Rate'] = clean_via_uniques(df['Switch Rate'], clean_switch_rate)
     
     # Convert numeric columns to proper types
     numeric_cols_to_clean = [
@@ -885,54 +1631,17 @@ def _prepare_mofa_data_sparse(df_raw: pd.DataFrame) -> tuple[pd.DataFrame, list,
             df[col] = pd.to_numeric(df[col], errors='coerce')
     
     # --- Step 2: Numerical and Ordinal Encoding ---
-    # Congruency features: Congruent=1.0, Neutral=0.0, Incongruent=-1.0
-    congruency_mapping = {'Congruent': 1.0, 'Neutral': 0.0, 'Incongruent': -1.0}
-    
-    if 'Stimulus-Stimulus Congruency' in df.columns:
-        df['Stimulus-Stimulus Congruency'] = df['Stimulus-Stimulus Congruency'].map(congruency_mapping)
-    if 'Stimulus-Response Congruency' in df.columns:
-        df['Stimulus-Response Congruency'] = df['Stimulus-Response Congruency'].map(congruency_mapping)
-    
-    # Response Set Overlap: Identical=1.0, Disjoint variants=-1.0
-    def map_response_set_overlap(val):
-        if pd.isna(val):
-            return np.nan
-        val_str = str(val).lower()
-        if 'identical' in val_str:
-            return 1.0
-        elif 'disjoint' in val_str:
-            return -1.0
-        else:
-            return np.nan
-    
+    # Raw labels are encoded through ORDINAL_CODEBOOK's aliases; Response Set
+    # Overlap is matched by substring (Identical / Disjoint variants) first.
     if 'Response Set Overlap' in df.columns:
-        df['Response Set Overlap'] = df['Response Set Overlap'].apply(map_response_set_overlap)
-    
-    # Stimulus-Response Mapping: Compatible=1.0, Arbitrary=0.0, Incompatible=-1.0
-    srm_mapping = {'Compatible': 1.0, 'Arbitrary': 0.0, 'Incompatible': -1.0}
-    
-    if 'Task 1 Stimulus-Response Mapping' in df.columns:
-        df['Task 1 Stimulus-Response Mapping'] = df['Task 1 Stimulus-Response Mapping'].map(srm_mapping)
-    if 'Task 2 Stimulus-Response Mapping' in df.columns:
-        df['Task 2 Stimulus-Response Mapping'] = df['Task 2 Stimulus-Response Mapping'].map(srm_mapping)
-    
-    # Trial Transition Type: Pure=0.0, Repeat=0.5, Switch=-0.5
-    ttt_mapping = {'Pure': 0.0, 'Repeat': 0.5, 'Switch': -0.5}
-    
-    if 'Trial Transition Type' in df.columns:
-        df['Trial Transition Type'] = df['Trial Transition Type'].map(ttt_mapping)
-    
-    # Task Cue Type: None/Implicit=0.0, Arbitrary=1.0
-    cue_mapping = {'None/Implicit': 0.0, 'Arbitrary': 1.0}
-    
-    if 'Task 1 Cue Type' in df.columns:
-        df['Task 1 Cue Type'] = df['Task 1 Cue Type'].map(cue_mapping)
-    if 'Task 2 Cue Type' in df.columns:
-        df['Task 2 Cue Type'] = df['Task 2 Cue Type'].map(cue_mapping)
+        df['Response Set Overlap'] = map_categories(df['Response Set Overlap'], 'rso')
+    ordinal_cols = [col for col in LEGACY_ORDINAL_COLUMNS if col in df.columns]
+    if ordinal_cols:
+        df[ordinal_cols] = ORDINAL_CODEBOOK.encode(df, ordinal_cols)
     
     # RSI is Predictable: Yes=1.0, No=0.0
     if 'RSI is Predictable' in df.columns:
-        df['RSI is Predictable'] = df['RSI is Predictable'].apply(lambda x: 1.0 if str(x).lower() == 'yes' else 0.0)
+        df['RSI is Predictable'] = clean_via_uniques(df['RSI is Predictable'], clean_yes_flag).astype(float)
     
     # --- Step 2.5: Standardize Continuous Numerical Features ---
     # Identify continuous numerical columns (those that were NOT created from categorical mappings)
@@ -959,41 +1668,19 @@ def _prepare_mofa_data_sparse(df_raw: pd.DataFrame) -> tuple[pd.DataFrame, list,
         # Edge case: if no continuous columns, create a dummy scaler
         scaler.fit([[0.0]])
     
-    # --- Step 3: Melt to Long Format ---
-    # Select all columns except 'Experiment' for melting
-    feature_columns = [col for col in df.columns if col != 'Experiment']
-    
-    df_long = pd.melt(df, id_vars=['Experiment'], value_vars=feature_columns,
-                      var_name='feature', value_name='value')
-    
-    # Rename Experiment to sample
-    df_long.rename(columns={'Experiment': 'sample'}, inplace=True)
-    
-    # --- Step 4: Drop Missing Values (MOFA+ native approach) ---
-    df_long.dropna(subset=['value'], inplace=True)
-    
-    # Convert values to numeric (handle any remaining object types)
-    df_long['value'] = pd.to_numeric(df_long['value'], errors='coerce')
-    df_long.dropna(subset=['value'], inplace=True)  # Drop any values that couldn't be converted
-    
-    # --- Step 5: Add View Mapping ---
+    # --- Step 3: Add View Mapping ---
     # Map features to views using VIEW_MAPPING_UNIFIED
     feature_to_view = {}
     for view, features in VIEW_MAPPING_UNIFIED.items():
         for feature in features:
             feature_to_view[feature] = view
     
-    df_long['view'] = df_long['feature'].map(feature_to_view)
-    
-    # Filter out rows where view couldn't be assigned
-    df_long = df_long.dropna(subset=['view'])
-    
-    # --- Step 6: Add Group Column ---
-    df_long['group'] = 'all_studies'
+    # --- Step 4: Melt to Long Format, dropping missing values (MOFA+ native approach) ---
+    feature_columns = [col for col in df.columns if col != 'Experiment']
+    df_long = mofa_long_frame(df[feature_columns], df['Experiment'], feature_to_view)
     
-    # --- Step 7: Create Likelihoods List ---
-    views_ordered = sorted(df_long['view'].unique())
-    likelihoods = ['gaussian'] * len(views_ordered)
+    # --- Step 5: Create Likelihoods List ---
+    likelihoods = ['gaussian'] * len(df_long['view'].unique())
     
     return df_long, likelihoods, scaler
 
@@ -1013,6 +1700,9 @@ class InvertibleColumnTransformer(ColumnTransformer):
         """
         original_cols = []
         col_idx = 0
+        if sparse.issparse(X):
+            # Column slices of a CSC matrix are cheap
+            X = X.tocsc()
         
         # Iterate through the fitted transformers
         for name, trans, original_feature_names, _ in self._iter(
@@ -1033,6 +1723,9 @@ class InvertibleColumnTransformer(ColumnTransformer):
                 transformed_slice = X.iloc[:, col_idx : col_idx + n_transformed_features]
             else:
                 transformed_slice = X[:, col_idx : col_idx + n_transformed_features]
+            if sparse.issparse(transformed_slice) and name != 'cat':
+                # Only the OneHotEncoder inverts sparse input; the scaled numerics are a dense block anyway
+                transformed_slice = transformed_slice.toarray()
 
             # --- START OF DEBUGGING BLOCK ---
             try:
@@ -1065,19 +1758,66 @@ class InvertibleColumnTransformer(ColumnTransformer):
         
         return df_original[original_feature_order].values
 
-def create_pca_pipeline(numerical_cols, categorical_cols):
-    """Creates and returns an sklearn pipeline for preprocessing and PCA."""
+class CenteredTruncatedSVD(TransformerMixin, BaseEstimator):
+    """
+    PCA for sparse input.
+
+    Computes a truncated (ARPACK) SVD of the column-centered data without
+    densifying it: the centering is applied implicitly through a linear operator
+    (PCA(svd_solver='arpack') on a sparse matrix). Exposes the same fitted
+    attributes as PCA (components_, explained_variance_ratio_, mean_,
+    n_components_, ...) so loadings and inverse transforms work unchanged.
+
+    Args:
+        n_components (int): Number of components to keep. ARPACK needs fewer than
+            min(n_samples, n_features); None keeps that maximum.
+        random_state (int): Seed of the ARPACK starting vector.
+    """
+    _fitted_attributes = ('components_', 'explained_variance_', 'explained_variance_ratio_',
+                          'singular_values_', 'mean_', 'n_components_', 'noise_variance_',
+                          'n_samples_', 'n_features_in_')
+
+    def __init__(self, n_components=None, random_state=0):
+        self.n_components = n_components
+        self.random_state = random_state
+
+    def fit(self, X, y=None):
+        n_components = self.n_components
+        if n_components is None:
+            n_components = min(X.shape) - 1
+        self.pca_ = PCA(n_components=n_components, svd_solver='arpack', random_state=self.random_state).fit(X)
+        for attr in self._fitted_attributes:
+            setattr(self, attr, getattr(self.pca_, attr))
+        return self
+
+    def transform(self, X):
+        return self.pca_.transform(X)
+
+    def inverse_transform(self, X):
+        return self.pca_.inverse_transform(X)
+
+def create_pca_pipeline(numerical_cols, categorical_cols, sparse_output=False, n_components=None):
+    """
+    Creates and returns an sklearn pipeline for preprocessing and PCA.
+
+    With sparse_output=True the one-hot encoded features stay a scipy sparse
+    matrix and the 'pca' step is a CenteredTruncatedSVD keeping n_components
+    components, so memory scales with the nonzeros instead of rows x categories.
+    Otherwise a dense PCA(n_components) is used.
+    """
     preprocessor = InvertibleColumnTransformer(
         transformers=[
             ('num', StandardScaler(), numerical_cols),
             ('cat', OneHotEncoder(handle_unknown='ignore', drop=None), categorical_cols)
         ],
-        remainder='drop'
+        remainder='drop',
+        sparse_threshold=1.0 if sparse_output else 0.3
     )
+    decomposition = CenteredTruncatedSVD(n_components) if sparse_output else PCA(n_components)
     
     pipeline = Pipeline(steps=[
         ('preprocessor', preprocessor),
-        ('pca', PCA())
+        ('pca', decomposition)
     ])
     return pipeline
 
@@ -1209,7 +1949,7 @@ def find_centroids(pca_df, paradigm_col='Paradigm'):
     Returns:
         dict: A dictionary where keys are paradigm names and values are centroid vectors.
     """
-    return pca_df.groupby(paradigm_col).mean().to_dict('index')
+    return pca_df.groupby(paradigm_col, observed=True).mean().to_dict('index')
 
 def interpolate_centroids(centroid1, centroid2, alpha=0.5):
     """
@@ -1264,7 +2004,7 @@ def reconstruct_from_mofa_factors(factor_scores, model, preprocessor_obj):
 
     Args:
         factor_scores (pd.DataFrame or pd.Series): A dataframe or series of factor scores for one or more samples.
-        model (mfx.mofa_model): The trained mofax model.
+        model (mfx.mofa_model or CachedMofaModel): The trained mofax model.
         preprocessor_obj: The fitted preprocessor object - can be either StandardScaler 
                          (for sparse strategy) or InvertibleColumnTransformer (for dense strategy).
 
@@ -1276,12 +2016,17 @@ def reconstruct_from_mofa_factors(factor_scores, model, preprocessor_obj):
         factor_scores = factor_scores.to_frame().T
         
     Z = factor_scores.values
-    W = model.get_weights(df=True)  # Get weights as DataFrame
+    if isinstance(model, CachedMofaModel):
+        # Cached weight array and feature index, no re-read or re-wrap per call
+        W, feature_index = model.weight_matrix()
+    else:
+        W_df = model.get_weights(df=True)  # Get weights as DataFrame
+        W, feature_index = W_df.to_numpy(), W_df.index
 
     # Reconstruct the scaled/encoded data space
     reconstructed_data_scaled = pd.DataFrame(
         Z @ W.T, 
-        columns=W.index, 
+        columns=feature_index, 
         index=factor_scores.index
     )
     
@@ -1294,7 +2039,7 @@ def reconstruct_from_mofa_factors(factor_scores, model, preprocessor_obj):
         expected_feature_order = preprocessor_obj.get_feature_names_out()
 
         # Debug: Print feature comparison
-        mofa_features = set(W.index)
+        mofa_features = set(feature_index)
         preprocessor_features = set(expected_feature_order)
 
         missing_in_mofa = preprocessor_features - mofa_features
@@ -1310,7 +2055,7 @@ def reconstruct_from_mofa_factors(factor_scores, model, preprocessor_obj):
             print("Extra MOFA features:", sorted(list(missing_in_preprocessor))[:10])  # Show first 10
 
         # Re-index the weight matrix to match the preprocessor's order
-        W_aligned = W.reindex(expected_feature_order)
+        W_aligned = pd.DataFrame(W, index=feature_index).reindex(expected_feature_order).to_numpy()
         
         # Reconstruct with properly aligned features
         reconstructed_df = pd.DataFrame(
@@ -1333,12 +2078,10 @@ def reconstruct_from_mofa_factors(factor_scores, model, preprocessor_obj):
     elif isinstance(preprocessor_obj, StandardScaler):
         # Sparse case: Manual inverse transformation for StandardScaler
         
+        registry = compile_feature_registry()
+
         # Get the list of continuous features that were standardized
-        continuous_columns = [
-            'Task 2 Response Probability', 'Inter-task SOA', 'Distractor SOA', 
-            'Task 1 CSI', 'Task 2 CSI', 'RSI', 'Switch Rate', 
-            'Task 1 Difficulty', 'Task 2 Difficulty'
-        ]
+        continuous_columns = registry.columns('continuous')
         continuous_columns_present = [col for col in continuous_columns if col in reconstructed_data_scaled.columns]
         
         # Apply inverse standardization to continuous features only
@@ -1347,29 +2090,12 @@ def reconstruct_from_mofa_factors(factor_scores, model, preprocessor_obj):
                 reconstructed_data_scaled[continuous_columns_present]
             )
         
-        # For ordinal features, map reconstructed float values back to nearest categories
-        ordinal_mappings = {
-            'Stimulus-Stimulus Congruency': {-1: -1.0, 0: 0.0, 1: 1.0},
-            'Stimulus-Response Congruency': {-1: -1.0, 0: 0.0, 1: 1.0},
-            'Response Set Overlap': {-1: -1.0, 1: 1.0},
-            'Task 1 Stimulus-Response Mapping': {-1: -1.0, 0: 0.0, 1: 1.0},
-            'Task 2 Stimulus-Response Mapping': {-1: -1.0, 0: 0.0, 1: 1.0},
-            'Trial Transition Type': {-0.5: -0.5, 0: 0.0, 0.5: 0.5},
-            'Task 1 Cue Type': {0: 0.0, 1: 1.0},
-            'Task 2 Cue Type': {0: 0.0, 1: 1.0},
-            'RSI is Predictable': {0: 0.0, 1: 1.0},
-            'Inter-task SOA is Predictable': {0: 0.0, 1: 1.0},
-            'Intra-Trial Task Relationship': {-1: -1.0, 1: 1.0}
-        }
-        
-        for col, mapping in ordinal_mappings.items():
-            if col in reconstructed_data_scaled.columns:
-                # Map each reconstructed value to its nearest ordinal value
-                possible_values = list(mapping.values())
-                def map_to_nearest(value):
-                    return min(possible_values, key=lambda x: abs(x - value))
-                
-                reconstructed_data_scaled[col] = reconstructed_data_scaled[col].apply(map_to_nearest)
+        # For ordinal features, map reconstructed float values back to the nearest code.
+        # Columns are matched by conceptual name (_prepare_mofa_data_sparse) or by
+        # their mapped column name (prepare_mofa_data).
+        coded_columns = [col for col in reconstructed_data_scaled.columns if col in ORDINAL_CODEBOOK]
+        if coded_columns:
+            reconstructed_data_scaled[coded_columns] = ORDINAL_CODEBOOK.snap(reconstructed_data_scaled, coded_columns)
         
         return reconstructed_data_scaled
         
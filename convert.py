@@ -1,13 +1,55 @@
 import pandas as pd
 import json
+import hashlib
 import numpy as np
 import argparse
 import logging
+import os
 import sys
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import NamedTuple
+
+import mapping_notes
+from mapping_notes import decode_notes, thaw
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+# Absolute timing columns emitted for every condition, in output order.
+TIMING_KEYS = [
+    'effective_start_cue1', 'effective_end_cue1', 'effective_start_go1', 'effective_end_go1',
+    'effective_start_stim1_mov', 'effective_end_stim1_mov', 'effective_start_stim2_mov', 'effective_end_stim2_mov',
+    'effective_start_cue2', 'effective_end_cue2', 'effective_start_go2', 'effective_end_go2',
+    'effective_start_stim1_or', 'effective_end_stim1_or', 'effective_start_stim2_or', 'effective_end_stim2_or',
+]
+
+# Final column order for data/resolved_design_space.csv
+FINAL_COLUMN_ORDER = [
+    'Experiment', 'N_Tasks', 'Task_1_Type', 'Task_2_Type',
+    'Stimulus_Valency', 'Stimulus Bivalence & Congruency', 'Simplified_RSO', 'SRM_1', 'SRM_2',
+    'Switch_Rate_Percent', 'Block_ID', 'Description', 'Sequence_Type',
+    'RSI_Distribution_Type', 'RSI_Distribution_Params',
+    'SOA_Distribution_Type', 'SOA_Distribution_Params', 'ITI_ms',
+    'coh_1', 'coh_2', 'Trial_Transition_Type',
+] + TIMING_KEYS
+
+# Compact dtypes for the typed (Feather/Parquet) output. Columns not listed keep
+# the dtype produced by resolve_design_space.
+TYPED_COLUMN_DTYPES = {
+    'N_Tasks': 'int8',
+    'Switch_Rate_Percent': 'int16',
+    'coh_1': 'float32',
+    'coh_2': 'float32',
+    **{key: 'int32' for key in TIMING_KEYS},
+}
+TYPED_CATEGORICAL_COLUMNS = [
+    'Task_1_Type', 'Task_2_Type', 'Stimulus_Valency', 'Stimulus Bivalence & Congruency',
+    'Simplified_RSO', 'SRM_1', 'SRM_2', 'Sequence_Type', 'RSI_Distribution_Type',
+    'SOA_Distribution_Type', 'Trial_Transition_Type',
+]
+
 def setup_logger(level=logging.INFO):
     """
     Configures a basic logger to print to the console.
@@ -36,27 +78,21 @@ def parse_notes(notes_str):
     """
     Safely parses a JSON string from the notes column.
     Returns an empty dictionary if the string is not valid JSON, empty, or NaN.
+
+    Decoding is shared with (and memoized by) mapping_notes.decode_notes; the
+    result is a plain, mutable copy of the cached view.
     """
-    if pd.isna(notes_str) or not isinstance(notes_str, str):
-        return {}
-    try:
-        # The notes might be enclosed in extra quotes, so we strip them
-        return json.loads(notes_str.strip('"'))
-    except (json.JSONDecodeError, TypeError):
-        # If it fails, it's likely a plain text note, which we ignore for overrides.
-        return {}
+    return thaw(decode_notes(notes_str).data)
 
 def get_param(row, notes, param_name, default_value):
     """
     Gets a parameter for the current condition, prioritizing JSON overrides.
+
+    Overrides are not logged here; build_override_audit reports them for a whole
+    design space at once.
     """
     if 'convert_overrides' in notes and param_name in notes['convert_overrides']:
-        override_value = notes['convert_overrides'][param_name]
-        logger.info(
-            f"Experiment '{row.get('Experiment', 'N/A')}': Overriding '{param_name}'. "
-            f"Default: {default_value}, New: {override_value}"
-        )
-        return override_value
+        return notes['convert_overrides'][param_name]
     return default_value
 
 def difficulty_to_coherence(difficulty):
@@ -91,82 +127,163 @@ def simplify_response_set_overlap(rso_string):
     else:
         return 'N/A'
 
-def validate_block_configurations(df):
+# Columns of the conflict table returned by validate_block_configurations(..., return_conflicts=True).
+# Row numbers are 1-indexed CSV line numbers (header = line 1), as in the log messages.
+BLOCK_CONFLICT_COLUMNS = [
+    'Block_ID', 'Primary_Row', 'Primary_Experiment',
+    'Conflicting_Rows', 'Conflicting_Experiments', 'Differing_Keys',
+]
+
+def canonical_viewer_config(viewer_config):
+    """Key-order independent rendering of a viewer_config, used to compare configs."""
+    return json.dumps(thaw(viewer_config), sort_keys=True, default=str)
+
+def _differing_keys(primary_config, config):
+    keys = set(primary_config) | set(config)
+    return sorted(key for key in keys if primary_config.get(key) != config.get(key))
+
+class BlockConfigValidator:
+    """
+    Incremental checker that conditions sharing a Block_ID have a consistent viewer_config.
+
+    Rows can be fed in any number of chunks (e.g. while streaming the source CSV);
+    only the primary (first) condition of each block is remembered, as its row
+    number, experiment name and viewer_config. Memory therefore grows with the
+    number of blocks (plus conflicting rows), not the number of rows.
+
+    Each distinct notes string is decoded and rendered canonically (sorted keys)
+    once per chunk; rows are then compared with their block's primary as arrays.
+    """
+    def __init__(self):
+        self.primaries = {}  # block_id -> (index, experiment, canonical_config, viewer_config)
+        self.conflicts = {}  # block_id -> [(index, experiment, differing_keys), ...]
+        self.validation_passed = True
+        self.warnings_found = False
+
+    def update(self, df):
+        """
+        Checks one chunk of conditions against the primaries seen so far.
+
+        Returns:
+            bool: True if validation still passes (no critical errors).
+        """
+        if df.empty:
+            return self.validation_passed
+
+        if 'Super_Experiment_Mapping_Notes' in df.columns:
+            notes_col = df['Super_Experiment_Mapping_Notes'].to_numpy(dtype=object)
+        else:
+            notes_col = np.full(len(df), '', dtype=object)
+
+        codes, unique_notes = pd.factorize(notes_col, use_na_sentinel=False)
+        parsed = [decode_notes(notes_str) for notes_str in unique_notes]
+        unique_configs = np.array([canonical_viewer_config(notes.viewer_config) for notes in parsed], dtype=object)
+        unique_block_ids = np.empty(len(parsed), dtype=object)
+        unique_block_ids[:] = [notes.block_id for notes in parsed]
+        unique_has_block_id = np.array([bool(notes.block_id) for notes in parsed], dtype=bool)
+
+        # Skip empty block IDs or use experiment name as fallback
+        experiments = df['Experiment'].to_numpy(dtype=object)
+        block_ids = pd.Series(np.where(unique_has_block_id[codes], unique_block_ids[codes], experiments))
+        configs = unique_configs[codes]
+        indices = df.index.to_numpy()
+
+        # Register the first condition of every block not seen in an earlier chunk
+        is_primary = np.zeros(len(df), dtype=bool)
+        for pos in np.flatnonzero(~block_ids.duplicated().to_numpy()):
+            block_id = block_ids.iat[pos]
+            if block_id not in self.primaries:
+                self.primaries[block_id] = (indices[pos], experiments[pos], configs[pos], parsed[codes[pos]].viewer_config)
+                is_primary[pos] = True
+
+        primary_configs = block_ids.map({block_id: primary[2] for block_id, primary in self.primaries.items()}).to_numpy(dtype=object)
+        # Only flag conditions that have a config AND differ from the primary
+        is_conflict = ~is_primary & (configs != '{}') & (configs != primary_configs)
+
+        for pos in np.flatnonzero(is_conflict):
+            block_id = block_ids.iat[pos]
+            primary_index, primary_experiment, _, primary_config = self.primaries[block_id]
+            config = parsed[codes[pos]].viewer_config
+            logger.warning(
+                f"Row {indices[pos] + 2}: Inconsistent viewer_config found for Block_ID '{block_id}'. "
+                f"Primary condition '{primary_experiment}' (row {primary_index + 2}) "
+                f"has config: {thaw(primary_config)}, but condition '{experiments[pos]}' "
+                f"has different config: {thaw(config)}. "
+                f"Using configuration from primary condition."
+            )
+            self.conflicts.setdefault(block_id, []).append(
+                (indices[pos], experiments[pos], _differing_keys(primary_config, config))
+            )
+            self.warnings_found = True
+
+        return self.validation_passed
+
+    def conflict_table(self):
+        """
+        Returns the inconsistent blocks found so far, one row per block, with columns
+        BLOCK_CONFLICT_COLUMNS. Differing_Keys is the sorted union of viewer_config
+        keys whose values differ from the primary in any conflicting condition.
+        """
+        records = []
+        for block_id, conflicts in self.conflicts.items():
+            primary_index, primary_experiment, _, _ = self.primaries[block_id]
+            records.append({
+                'Block_ID': block_id,
+                'Primary_Row': primary_index + 2,
+                'Primary_Experiment': primary_experiment,
+                'Conflicting_Rows': [index + 2 for index, _, _ in conflicts],
+                'Conflicting_Experiments': [experiment for _, experiment, _ in conflicts],
+                'Differing_Keys': sorted({key for _, _, keys in conflicts for key in keys}),
+            })
+        return pd.DataFrame(records, columns=BLOCK_CONFLICT_COLUMNS)
+
+    def finish(self):
+        """
+        Logs the validation summary.
+
+        Returns:
+            bool: True if validation passes (no critical errors), False if processing should halt
+        """
+        if self.warnings_found:
+            logger.info(
+                f"Block validation completed with warnings ({len(self.conflicts)} inconsistent block(s)). "
+                f"Primary condition rule will be enforced in viewer."
+            )
+        else:
+            logger.info("Block validation passed - no configuration inconsistencies found.")
+        return self.validation_passed
+
+def validate_block_configurations(df, return_conflicts=False):
     """
     Validates that conditions within the same Block_ID have consistent viewer_config.
     Logs detailed warnings for any inconsistencies found.
     
     Args:
         df: pandas DataFrame with condition data
+        return_conflicts (bool): Also return the conflict table (see
+            BlockConfigValidator.conflict_table).
         
     Returns:
-        bool: True if validation passes (no critical errors), False if processing should halt
+        bool: True if validation passes (no critical errors), False if processing should halt.
+        With return_conflicts=True, a (bool, pd.DataFrame) tuple.
     """
+    validator = BlockConfigValidator()
     if df.empty:
-        return True
-        
-    # Group by Block_ID, extracting it from the JSON notes
-    blocks = {}
-    
-    for index, row in df.iterrows():
-        notes = parse_notes(row.get('Super_Experiment_Mapping_Notes', ''))
-        block_id = notes.get('block_id', '')
-        
-        # Skip empty block IDs or use experiment name as fallback
-        if not block_id:
-            block_id = row['Experiment']
-            
-        if block_id not in blocks:
-            blocks[block_id] = []
-            
-        blocks[block_id].append({
-            'index': index,
-            'experiment': row['Experiment'],
-            'viewer_config': notes.get('viewer_config', {}),
-            'viewer_config_str': str(notes.get('viewer_config', {}))
-        })
-    
-    # Validate each block with multiple conditions
-    validation_passed = True
-    warnings_found = False
-    
-    for block_id, conditions in blocks.items():
-        if len(conditions) <= 1:
-            continue  # Single-condition blocks don't need validation
-            
-        primary_condition = conditions[0]
-        primary_config_str = primary_condition['viewer_config_str']
-        
-        # Check each subsequent condition for inconsistencies
-        for i, condition in enumerate(conditions[1:], start=1):
-            current_config_str = condition['viewer_config_str']
-            
-            # Only warn if current condition has a config AND it's different from primary
-            if (current_config_str != '{}' and 
-                current_config_str != primary_config_str):
-                
-                logger.warning(
-                    f"Row {condition['index'] + 2}: Inconsistent viewer_config found for Block_ID '{block_id}'. "
-                    f"Primary condition '{primary_condition['experiment']}' (row {primary_condition['index'] + 2}) "
-                    f"has config: {primary_config_str}, but condition '{condition['experiment']}' "
-                    f"has different config: {current_config_str}. "
-                    f"Using configuration from primary condition."
-                )
-                warnings_found = True
-    
-    if warnings_found:
-        logger.info("Block validation completed with warnings. Primary condition rule will be enforced in viewer.")
+        passed = True
     else:
-        logger.info("Block validation passed - no configuration inconsistencies found.")
-        
-    return validation_passed
+        validator.update(df)
+        passed = validator.finish()
+
+    if return_conflicts:
+        return passed, validator.conflict_table()
+    return passed
 
 def process_condition(row):
     """
     Takes a row from the conceptual CSV and returns a dictionary of
     resolved, absolute parameters for the new CSV.
     """
-    notes = parse_notes(row.get('Super_Experiment_Mapping_Notes'))
+    notes = decode_notes(row.get('Super_Experiment_Mapping_Notes')).data
 
     # --- 1. Determine base durations and offsets, allowing for overrides ---
     # Default values can be overridden by the JSON in the notes column.
@@ -204,9 +321,9 @@ def process_condition(row):
     description = notes.get('description', '')
     sequence_type = viewer_config.get('sequence_type', 'Random')
     iti_distribution_type = viewer_config.get('ITI_distribution', 'fixed')
-    iti_distribution_params = str(viewer_config.get('ITI_range', viewer_config.get('ITI_values', [])))
+    iti_distribution_params = str(thaw(viewer_config.get('ITI_range', viewer_config.get('ITI_values', []))))
     soa_distribution_type = viewer_config.get('SOA_distribution', 'fixed')
-    soa_distribution_params = str(viewer_config.get('SOA_range', viewer_config.get('SOA_values', [])))
+    soa_distribution_params = str(thaw(viewer_config.get('SOA_range', viewer_config.get('SOA_values', []))))
     
     # --- 4. Pre-process conceptual info to be passed to the client ---
     task_2_prob = float(row['Task 2 Response Probability'])
@@ -236,13 +353,7 @@ def process_condition(row):
     }
     
     # Initialize all timing parameters to 0
-    timing_keys = [
-        'effective_start_cue1', 'effective_end_cue1', 'effective_start_go1', 'effective_end_go1',
-        'effective_start_stim1_mov', 'effective_end_stim1_mov', 'effective_start_stim2_mov', 'effective_end_stim2_mov',
-        'effective_start_cue2', 'effective_end_cue2', 'effective_start_go2', 'effective_end_go2',
-        'effective_start_stim1_or', 'effective_end_stim1_or', 'effective_start_stim2_or', 'effective_end_stim2_or',
-    ]
-    for key in timing_keys:
+    for key in TIMING_KEYS:
         resolved_params[key] = 0
         
     # --- 4. Calculate Absolute Timings based on N_Tasks ---
@@ -304,15 +415,1011 @@ def process_condition(row):
 
     return resolved_params
 
+# --- Vectorized (whole-frame) engine ---
+# The functions below compute the same values as process_condition, but as array
+# operations over the entire source DataFrame. process_condition remains the
+# per-row reference implementation; tests assert that both paths agree.
+
+# Order in which process_condition resolves (and logs) duration overrides.
+DURATION_PARAMS = [
+    'base_stim_duration', 'base_cue_go_duration',
+    't1_stim_duration', 't2_stim_duration',
+    't1_cue_go_duration', 't2_cue_go_duration',
+]
+
+# Parameter each duration falls back to when it is not overridden (None: the
+# constant DEFAULT_STIM_DURATION). Mirrors the get_param calls in process_condition.
+DEFAULT_STIM_DURATION = 2000
+DURATION_FALLBACKS = {
+    'base_stim_duration': None,
+    'base_cue_go_duration': 'base_stim_duration',
+    't1_stim_duration': 'base_stim_duration',
+    't2_stim_duration': 'base_stim_duration',
+    't1_cue_go_duration': 'base_cue_go_duration',
+    't2_cue_go_duration': 'base_cue_go_duration',
+}
+# Sanity bound for override values (one hour, in ms).
+MAX_DURATION_OVERRIDE_MS = 3_600_000
+
+OVERRIDE_ISSUE_COLUMNS = ['Row', 'Experiment', 'Parameter', 'Value', 'Problem', 'Severity']
+
+class CompiledOverrides(NamedTuple):
+    """Dense per-row duration overrides for a whole design space."""
+    values: dict           # param -> int64 array, 0 where the row does not override param
+    mask: dict             # param -> bool array, True where the row overrides param
+    issues: pd.DataFrame   # OVERRIDE_ISSUE_COLUMNS, one row per problem per condition
+
+def _factorize_notes(source_df):
+    """Returns (codes, unique_notes) for the notes column; missing column -> one None code."""
+    if 'Super_Experiment_Mapping_Notes' in source_df.columns:
+        notes_col = source_df['Super_Experiment_Mapping_Notes']
+    else:
+        notes_col = pd.Series([None] * len(source_df), dtype=object)
+    return pd.factorize(notes_col, use_na_sentinel=False)
+
+def _expand_notes_records(source_df, codes, records, columns):
+    """
+    Broadcasts per-notes records to the rows using those notes.
+
+    records are (code, order, *values) tuples; the result has a 'Row' (1-indexed
+    CSV line) and 'Experiment' column followed by `columns`, sorted by row and,
+    within a row, by order.
+    """
+    if not records:
+        return pd.DataFrame(columns=['Row', 'Experiment'] + columns)
+    records_df = pd.DataFrame(records, columns=['code', 'order'] + columns)
+    rows_df = pd.DataFrame({'position': np.arange(len(source_df)), 'code': codes})
+    expanded = rows_df.merge(records_df, on='code').sort_values(['position', 'order'], kind='stable')
+
+    positions = expanded['position'].to_numpy()
+    expanded.insert(0, 'Row', source_df.index.to_numpy()[positions] + 2)
+    expanded.insert(1, 'Experiment', source_df['Experiment'].to_numpy()[positions])
+    return expanded[['Row', 'Experiment'] + columns].reset_index(drop=True)
+
+def _override_problem(value):
+    """Returns why a duration override value is invalid, or None if it is valid."""
+    if isinstance(value, bool) or not isinstance(value, (int, np.integer)):
+        return "must be an integer number of ms"
+    if not 0 <= value <= MAX_DURATION_OVERRIDE_MS:
+        return f"must be between 0 and {MAX_DURATION_OVERRIDE_MS} ms"
+    return None
+
+def compile_overrides(source_df, strict=True, factorized=None):
+    """
+    Compiles the convert_overrides of every condition into dense per-parameter arrays.
+
+    Each distinct notes string is inspected once. Overrides of the duration
+    parameters are type- and range-checked in bulk; keys that are not duration
+    parameters are reported as warnings (they are ignored during resolution).
+
+    Args:
+        source_df: pandas DataFrame in the conceptual (super experiment) schema.
+        strict (bool): Raise on invalid override values instead of only reporting them.
+        factorized: Optional (codes, unique_notes) from pd.factorize of the notes column.
+
+    Returns:
+        CompiledOverrides: Per-row values and masks, plus the issue table.
+
+    Raises:
+        ValueError: If strict and any duration override value is invalid.
+    """
+    codes, unique_notes = factorized if factorized is not None else _factorize_notes(source_df)
+    unique_values = {param: np.zeros(len(unique_notes), dtype=np.int64) for param in DURATION_PARAMS}
+    unique_mask = {param: np.zeros(len(unique_notes), dtype=bool) for param in DURATION_PARAMS}
+    issues = []
+
+    for code, notes_str in enumerate(unique_notes):
+        overrides = decode_notes(notes_str).convert_overrides
+        for order, (param_name, value) in enumerate(overrides.items()):
+            if param_name not in DURATION_FALLBACKS:
+                issues.append((code, order, param_name, value, "unknown override parameter", 'warning'))
+                continue
+            problem = _override_problem(value)
+            if problem is not None:
+                issues.append((code, order, param_name, value, problem, 'error'))
+                continue
+            unique_values[param_name][code] = value
+            unique_mask[param_name][code] = True
+
+    issue_table = _expand_notes_records(source_df, codes, issues, OVERRIDE_ISSUE_COLUMNS[2:])
+    n_errors = int((issue_table['Severity'] == 'error').sum())
+    if strict and n_errors:
+        first = issue_table[issue_table['Severity'] == 'error'].iloc[0]
+        raise ValueError(
+            f"{n_errors} invalid duration override(s), e.g. row {first['Row']} ('{first['Experiment']}'): "
+            f"'{first['Parameter']}' = {first['Value']!r} {first['Problem']}."
+        )
+
+    return CompiledOverrides(
+        values={param: unique_values[param][codes] for param in DURATION_PARAMS},
+        mask={param: unique_mask[param][codes] for param in DURATION_PARAMS},
+        issues=issue_table,
+    )
+
+def resolve_duration_arrays(compiled):
+    """
+    Resolves every duration parameter for all rows with one np.where per parameter.
+
+    Returns:
+        dict: param -> int64 array, for every name in DURATION_PARAMS.
+    """
+    durations = {}
+    for param in DURATION_PARAMS:
+        fallback = DURATION_FALLBACKS[param]
+        default = DEFAULT_STIM_DURATION if fallback is None else durations[fallback]
+        durations[param] = np.where(compiled.mask[param], compiled.values[param], default)
+    return durations
+
+def validate_overrides(source_df):
+    """
+    Checks all convert_overrides of a design space up front and logs one warning
+    per problem.
+
+    Returns:
+        bool: True if no override value is invalid (unknown keys only warn).
+    """
+    issues = compile_overrides(source_df, strict=False).issues
+    for row, experiment, param_name, value, problem, severity in issues.itertuples(index=False):
+        logger.warning(f"Row {row}: Experiment '{experiment}': override '{param_name}' = {value!r} {problem}.")
+    n_errors = int((issues['Severity'] == 'error').sum())
+    if n_errors:
+        logger.error(f"Override validation failed: {n_errors} invalid override value(s).")
+    return n_errors == 0
+
+def resolve_durations(notes):
+    """
+    Resolves the stimulus and cue/go durations for one parsed notes dictionary.
+
+    Mirrors the get_param calls in process_condition.
+
+    Returns:
+        tuple: (durations, applied) where durations maps every name in
+        DURATION_PARAMS to its value and applied lists (param_name, default, override)
+        tuples for each override that was used, in resolution order.
+    """
+    overrides = notes.get('convert_overrides', {}) if isinstance(notes, Mapping) else {}
+    durations = {}
+    applied = []
+
+    def resolve(param_name, default_value):
+        if param_name in overrides:
+            applied.append((param_name, default_value, overrides[param_name]))
+            return overrides[param_name]
+        return default_value
+
+    durations['base_stim_duration'] = resolve('base_stim_duration', DEFAULT_STIM_DURATION)
+    durations['base_cue_go_duration'] = resolve('base_cue_go_duration', durations['base_stim_duration'])
+    durations['t1_stim_duration'] = resolve('t1_stim_duration', durations['base_stim_duration'])
+    durations['t2_stim_duration'] = resolve('t2_stim_duration', durations['base_stim_duration'])
+    durations['t1_cue_go_duration'] = resolve('t1_cue_go_duration', durations['base_cue_go_duration'])
+    durations['t2_cue_go_duration'] = resolve('t2_cue_go_duration', durations['base_cue_go_duration'])
+    return durations, applied
+
+def extract_metadata(notes):
+    """
+    Extracts the viewer metadata columns from one parsed notes dictionary,
+    using the same defaults as process_condition.
+    """
+    viewer_config = notes.get('viewer_config', {})
+    return {
+        'Block_ID': notes.get('block_id', ''),
+        'Description': notes.get('description', ''),
+        'Sequence_Type': viewer_config.get('sequence_type', 'Random'),
+        'RSI_Distribution_Type': viewer_config.get('ITI_distribution', 'fixed'),
+        'RSI_Distribution_Params': str(thaw(viewer_config.get('ITI_range', viewer_config.get('ITI_values', [])))),
+        'SOA_Distribution_Type': viewer_config.get('SOA_distribution', 'fixed'),
+        'SOA_Distribution_Params': str(thaw(viewer_config.get('SOA_range', viewer_config.get('SOA_values', [])))),
+    }
+
+def interval_to_int_array(values):
+    """
+    Vectorized form of the CSI/SOA parsing in process_condition:
+    NaN and 'N/A' become 0, everything else is truncated to an integer.
+
+    Raises:
+        ValueError: If a value is neither missing, 'N/A', nor numeric.
+    """
+    series = pd.Series(values, copy=False)
+    is_missing = series.isna() | (series == 'N/A')
+    numeric = pd.to_numeric(series.where(~is_missing, 0))
+    return np.trunc(numeric.to_numpy(dtype=float)).astype(np.int64)
+
+def difficulty_to_coherence_array(values):
+    """Vectorized difficulty_to_coherence: out-of-range or missing -> 0.5."""
+    difficulty = pd.to_numeric(pd.Series(values, copy=False), errors='coerce').to_numpy(dtype=float)
+    in_range = (difficulty >= 1) & (difficulty <= 5)
+    return np.where(in_range, (5 - difficulty) / 4.0, 0.5)
+
+def simplify_response_set_overlap_array(values):
+    """Vectorized simplify_response_set_overlap."""
+    rso_lower = pd.Series(values, dtype=object).str.lower()
+    return np.select(
+        [
+            rso_lower.str.contains('identical', regex=False, na=False).to_numpy(dtype=bool),
+            rso_lower.str.contains('disjoint', regex=False, na=False).to_numpy(dtype=bool),
+        ],
+        ['Identical', 'Disjoint'],
+        default='N/A'
+    ).astype(object)
+
+def derive_stimulus_valency_array(ss_congruency, sr_congruency):
+    """Vectorized Stimulus_Valency derivation from the S-S and S-R congruency columns."""
+    ss = pd.Series(ss_congruency, copy=False)
+    sr = pd.Series(sr_congruency, copy=False)
+    conditions = [
+        (ss == 'Congruent').to_numpy(),
+        (ss == 'Incongruent').to_numpy(),
+        (ss == 'Neutral').to_numpy(),
+        ((ss == 'N/A') & sr.isin(['Congruent', 'Incongruent', 'Neutral'])).to_numpy(),
+    ]
+    choices = ['Bivalent-Congruent', 'Bivalent-Incongruent', 'Bivalent-Neutral', 'Bivalent-Neutral']
+    return np.select(conditions, choices, default='Univalent').astype(object)
+
+def collapse_conflict_dimensions(ss_congruency, sr_congruency):
+    """
+    Collapses S-S and S-R congruency into the single 'Stimulus Bivalence & Congruency'
+    dimension. Incongruent takes priority over Congruent, which takes priority over Neutral.
+    """
+    s_s_col = pd.Series(ss_congruency, copy=False)
+    s_r_col = pd.Series(sr_congruency, copy=False)
+
+    conditions = [
+        ((s_s_col == 'Incongruent') | (s_r_col == 'Incongruent')).to_numpy(),
+        ((s_s_col == 'Congruent') | (s_r_col == 'Congruent')).to_numpy(),
+        ((s_s_col == 'Neutral') | (s_r_col == 'Neutral')).to_numpy(),
+    ]
+    choices = ['Incongruent', 'Congruent', 'Neutral']
+    return np.select(conditions, choices, default='N/A')
+
+def timing_inputs(source_df):
+    """
+    Derives the per-row inputs of the timeline calculation from the source columns.
+
+    Returns:
+        tuple: (is_dual, soa, csi1, csi2, has_distractor) arrays. soa is the
+        Inter-task SOA for dual-task rows and the Distractor SOA otherwise;
+        has_distractor marks single-task rows with an S-S or S-R congruency.
+    """
+    is_dual = source_df['Task 2 Response Probability'].to_numpy(dtype=float) == 1.0
+    soa = interval_to_int_array(np.where(
+        is_dual,
+        source_df['Inter-task SOA'].to_numpy(dtype=object),
+        source_df['Distractor SOA'].to_numpy(dtype=object)
+    ))
+    csi1 = interval_to_int_array(source_df['Task 1 CSI'])
+    csi2 = interval_to_int_array(source_df['Task 2 CSI'])
+    has_distractor = ~is_dual & (
+        (source_df['Stimulus-Stimulus Congruency'] != 'N/A') | (source_df['Stimulus-Response Congruency'] != 'N/A')
+    ).to_numpy()
+    return is_dual, soa, csi1, csi2, has_distractor
+
+def resolve_conditions(source_df):
+    """
+    Vectorized equivalent of calling process_condition on every row of source_df.
+
+    Notes JSON is decoded once per distinct notes string and broadcast back to the
+    rows; all remaining columns, including the 16 timing columns, are computed as
+    NumPy array operations over the whole frame.
+
+    Args:
+        source_df: pandas DataFrame in the conceptual (super experiment) schema.
+
+    Returns:
+        pd.DataFrame: One row per condition with the same columns, in the same
+        order, as the dictionaries returned by process_condition.
+    """
+    n_rows = len(source_df)
+    experiments = source_df['Experiment'].to_numpy()
+
+    # --- 1. Notes: resolve each distinct string once ---
+    codes, unique_notes = _factorize_notes(source_df)
+    parsed_notes = [decode_notes(notes_str).data for notes_str in unique_notes]
+    durations = resolve_duration_arrays(compile_overrides(source_df, factorized=(codes, unique_notes)))
+    metadata = pd.DataFrame([extract_metadata(notes) for notes in parsed_notes],
+                            columns=list(extract_metadata({}).keys()))
+
+    # --- 2. Conceptual columns ---
+    ss_congruency = source_df['Stimulus-Stimulus Congruency']
+    sr_congruency = source_df['Stimulus-Response Congruency']
+    is_dual, soa, csi1, csi2, has_distractor = timing_inputs(source_df)
+    n_tasks = np.where(is_dual, 2, 1)
+
+    switch_rate = source_df['Switch Rate']
+    if switch_rate.dtype == object:
+        is_str = switch_rate.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+        switch_rate = switch_rate.where(~is_str, switch_rate.str.replace('%', '', regex=False))
+
+    resolved = {
+        'Experiment': experiments,
+        'N_Tasks': n_tasks,
+        'Task_1_Type': source_df['Task 1 Type'].to_numpy(),
+        'Task_2_Type': source_df['Task 2 Type'].to_numpy(),
+        'Stimulus_Valency': derive_stimulus_valency_array(ss_congruency, sr_congruency),
+        'Simplified_RSO': simplify_response_set_overlap_array(source_df['Response Set Overlap']),
+        'SRM_1': source_df['Task 1 Stimulus-Response Mapping'].to_numpy(),
+        'SRM_2': source_df['Task 2 Stimulus-Response Mapping'].to_numpy(),
+        'Switch_Rate_Percent': switch_rate.to_numpy(),
+    }
+    for col in metadata.columns:
+        resolved[col] = metadata[col].to_numpy(dtype=object)[codes]
+    resolved['ITI_ms'] = source_df['RSI'].to_numpy() if 'RSI' in source_df.columns else [None] * n_rows
+    resolved['coh_1'] = difficulty_to_coherence_array(source_df['Task 1 Difficulty'])
+    resolved['coh_2'] = difficulty_to_coherence_array(source_df['Task 2 Difficulty'])
+    resolved['Trial_Transition_Type'] = source_df['Trial Transition Type'].to_numpy()
+
+    # --- 3. Absolute timings ---
+
+    # Shift the timeline so that cues preceding the stimulus never start before 0
+    t1_stim_start = np.maximum(0, np.maximum(csi1, csi2))
+    cue1_start = t1_stim_start - csi1
+    cue1_end = cue1_start + durations['t1_cue_go_duration']
+
+    # T2 (dual-task) and distractor (bivalent single-task) both start SOA after T1
+    t2_stim_start = t1_stim_start + soa
+    cue2_start = t2_stim_start - csi2
+    zeros = np.zeros(n_rows, dtype=np.int64)
+
+    timings = {
+        'effective_start_cue1': cue1_start,
+        'effective_end_cue1': cue1_end,
+        'effective_start_go1': cue1_start,
+        'effective_end_go1': cue1_end,
+        'effective_start_stim1_mov': t1_stim_start,
+        'effective_end_stim1_mov': t1_stim_start + durations['t1_stim_duration'],
+        'effective_start_stim2_mov': zeros,
+        'effective_end_stim2_mov': zeros,
+        'effective_start_cue2': np.where(is_dual, cue2_start, 0),
+        'effective_end_cue2': np.where(is_dual, cue2_start + durations['t2_cue_go_duration'], 0),
+        'effective_start_go2': np.where(is_dual, cue2_start, 0),
+        'effective_end_go2': np.where(is_dual, cue2_start + durations['t2_cue_go_duration'], 0),
+        'effective_start_stim1_or': np.where(has_distractor, t2_stim_start, 0),
+        'effective_end_stim1_or': np.where(has_distractor, t2_stim_start + durations['t2_stim_duration'], 0),
+        'effective_start_stim2_or': np.where(is_dual, t2_stim_start, 0),
+        'effective_end_stim2_or': np.where(is_dual, t2_stim_start + durations['t2_stim_duration'], 0),
+    }
+    resolved.update(timings)
+
+    return pd.DataFrame(resolved)
+
+def resolve_design_space(source_df, engine='vectorized'):
+    """
+    Resolves a conceptual design space into the final output table, including the
+    collapsed conflict dimension and the fixed output column order.
+
+    Args:
+        source_df: pandas DataFrame in the conceptual (super experiment) schema.
+        engine (str): 'vectorized' (whole-frame, default) or 'rowwise'
+            (process_condition per row, the reference implementation).
+
+    Returns:
+        pd.DataFrame: The resolved conditions with columns FINAL_COLUMN_ORDER.
+    """
+    if engine == 'vectorized':
+        resolved_df = resolve_conditions(source_df)
+    elif engine == 'rowwise':
+        # process_condition uses override values as given; reject the same values
+        # as the vectorized engine, so the engine does not change which inputs are valid.
+        compile_overrides(source_df, strict=True)
+        resolved_df = pd.DataFrame([process_condition(row) for _, row in source_df.iterrows()])
+    else:
+        raise ValueError(f"Unknown engine: {engine}. Must be either 'vectorized' or 'rowwise'.")
+
+    # --- Collapse Conflict Dimensions ---
+    resolved_df['Stimulus Bivalence & Congruency'] = collapse_conflict_dimensions(
+        source_df['Stimulus-Stimulus Congruency'].to_numpy(),
+        source_df['Stimulus-Response Congruency'].to_numpy()
+    )
+
+    # Ensure all columns exist, fill missing with 0 or a suitable default
+    for col in FINAL_COLUMN_ORDER:
+        if col not in resolved_df.columns:
+            resolved_df[col] = 0
+
+    return resolved_df[FINAL_COLUMN_ORDER]
+
+# --- Override audit ---
+# Duration overrides are reported as one table per conversion instead of a log
+# line per row and parameter. Row numbers are 1-indexed CSV line numbers (header
+# = line 1), as in the block validation messages.
+
+OVERRIDE_AUDIT_COLUMNS = ['Row', 'Experiment', 'Parameter', 'Default', 'Override']
+
+def build_override_audit(source_df):
+    """
+    Lists every duration override applied to a design space, in row order and,
+    within a row, in resolution order (the order of the get_param calls).
+
+    Overrides are resolved once per distinct notes string and joined back to the
+    rows, so the cost grows with the number of distinct notes, not rows.
+
+    Args:
+        source_df: pandas DataFrame in the conceptual (super experiment) schema.
+
+    Returns:
+        pd.DataFrame: Columns OVERRIDE_AUDIT_COLUMNS, one row per applied override.
+    """
+    if source_df.empty or 'Super_Experiment_Mapping_Notes' not in source_df.columns:
+        return pd.DataFrame(columns=OVERRIDE_AUDIT_COLUMNS)
+
+    codes, unique_notes = _factorize_notes(source_df)
+    applied = [
+        (code, order, param_name, default_value, override_value)
+        for code, notes_str in enumerate(unique_notes)
+        for order, (param_name, default_value, override_value)
+        in enumerate(resolve_durations(decode_notes(notes_str).data)[1])
+    ]
+    return _expand_notes_records(source_df, codes, applied, OVERRIDE_AUDIT_COLUMNS[2:])
+
+def log_override_audit(audit):
+    """
+    Logs a one-line summary of an override audit. The individual overrides are
+    only logged at DEBUG level (convert.py --verbose).
+    """
+    if audit.empty:
+        logger.info("No parameter overrides applied.")
+        return
+    per_parameter = audit['Parameter'].value_counts(sort=False)
+    logger.info(
+        f"Applied {len(audit)} parameter override(s) to {audit['Row'].nunique()} condition(s): "
+        + ", ".join(f"{param_name} x{count}" for param_name, count in per_parameter.items())
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        for experiment, param_name, default_value, override_value in zip(
+                audit['Experiment'], audit['Parameter'], audit['Default'], audit['Override']):
+            logger.debug(
+                f"Experiment '{experiment}': Overriding '{param_name}'. "
+                f"Default: {default_value}, New: {override_value}"
+            )
+
+def write_override_audit(audit, path):
+    """Writes an override audit as CSV or JSON (records), depending on the file extension."""
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension == '.csv':
+        audit.to_csv(path, index=False)
+    elif extension == '.json':
+        audit.to_json(path, orient='records', indent=2)
+    else:
+        raise ValueError(f"Unsupported audit format '{extension}'. Must be '.csv' or '.json'.")
+
+# --- Timeline invariants ---
+# Post-conversion sanity checks on the absolute timings, evaluated as boolean
+# masks over whole (chunks of) resolved frames. Each invariant is counted once
+# per violating condition.
+
+TIMELINE_INVARIANTS = {
+    'non_negative': "All timestamps are >= 0",
+    'end_after_start': "No event ends before it starts",
+    'go_matches_cue': "Go-signal windows coincide with cue windows",
+    'cue_precedes_stim_by_csi': "Cue onsets precede their stimulus onset by exactly the CSI",
+    'onset_follows_soa': "T2/distractor onset equals T1 onset plus the SOA",
+}
+TIMELINE_EVENTS = ['cue1', 'go1', 'stim1_mov', 'stim2_mov', 'cue2', 'go2', 'stim1_or', 'stim2_or']
+TIMELINE_REPORT_COLUMNS = ['Invariant', 'Description', 'Violations', 'Example_Rows', 'Example_Experiments']
+
+def timeline_violation_masks(resolved_df, source_df):
+    """
+    Evaluates every invariant in TIMELINE_INVARIANTS for all resolved conditions.
+
+    Args:
+        resolved_df: Output of resolve_design_space (any engine).
+        source_df: The source rows resolved_df was computed from, in the same order.
+
+    Returns:
+        dict: invariant name -> bool array, True where a condition violates it.
+    """
+    start = {event: resolved_df[f'effective_start_{event}'].to_numpy() for event in TIMELINE_EVENTS}
+    end = {event: resolved_df[f'effective_end_{event}'].to_numpy() for event in TIMELINE_EVENTS}
+    is_dual, soa, csi1, csi2, has_distractor = timing_inputs(source_df)
+
+    t1_onset = start['stim1_mov']
+    t2_onset = np.where(is_dual, start['stim2_or'], start['stim1_or'])
+    has_t2 = is_dual | has_distractor
+
+    return {
+        'non_negative': (resolved_df[TIMING_KEYS].to_numpy() < 0).any(axis=1),
+        'end_after_start': np.logical_or.reduce([end[event] < start[event] for event in TIMELINE_EVENTS]),
+        'go_matches_cue': (
+            (start['go1'] != start['cue1']) | (end['go1'] != end['cue1'])
+            | (start['go2'] != start['cue2']) | (end['go2'] != end['cue2'])
+        ),
+        'cue_precedes_stim_by_csi': (
+            (t1_onset - start['cue1'] != csi1)
+            | (is_dual & (start['stim2_or'] - start['cue2'] != csi2))
+        ),
+        'onset_follows_soa': has_t2 & (t2_onset - t1_onset != soa),
+    }
+
+class TimelineInvariantChecker:
+    """
+    Accumulates timeline invariant violations over one or more chunks of resolved
+    conditions, keeping counts and the first few offending rows per invariant.
+    """
+    def __init__(self, max_examples=5):
+        self.max_examples = max_examples
+        self.counts = dict.fromkeys(TIMELINE_INVARIANTS, 0)
+        self.examples = {name: [] for name in TIMELINE_INVARIANTS}
+
+    def update(self, resolved_df, source_df):
+        """Checks one chunk; source_df supplies the row numbers (index + 2) and the CSI/SOA inputs."""
+        if source_df.empty:
+            return
+        rows = source_df.index.to_numpy() + 2
+        experiments = source_df['Experiment'].to_numpy()
+        for name, mask in timeline_violation_masks(resolved_df, source_df).items():
+            positions = np.flatnonzero(mask)
+            self.counts[name] += len(positions)
+            needed = self.max_examples - len(self.examples[name])
+            self.examples[name].extend(zip(rows[positions[:needed]], experiments[positions[:needed]]))
+
+    def report(self):
+        """Returns one row per invariant with columns TIMELINE_REPORT_COLUMNS."""
+        return pd.DataFrame([
+            {
+                'Invariant': name,
+                'Description': description,
+                'Violations': self.counts[name],
+                'Example_Rows': [int(row) for row, _ in self.examples[name]],
+                'Example_Experiments': [experiment for _, experiment in self.examples[name]],
+            }
+            for name, description in TIMELINE_INVARIANTS.items()
+        ], columns=TIMELINE_REPORT_COLUMNS)
+
+    def finish(self):
+        """
+        Logs the violated invariants (or a one-line pass message).
+
+        Returns:
+            bool: True if no condition violates any invariant.
+        """
+        violated = {name: count for name, count in self.counts.items() if count}
+        for name, count in violated.items():
+            example_rows = ', '.join(str(row) for row, _ in self.examples[name])
+            logger.warning(
+                f"Timeline check '{name}' failed for {count} condition(s) "
+                f"({TIMELINE_INVARIANTS[name]}). First rows: {example_rows}."
+            )
+        if not violated:
+            logger.info("Timeline check passed - all resolved conditions satisfy the timeline invariants.")
+        return not violated
+
+def check_timeline_invariants(resolved_df, source_df, max_examples=5):
+    """
+    Checks the timeline invariants of a whole resolved design space.
+
+    Returns:
+        tuple: (passed, report) with the bool result and the report DataFrame
+        (see TimelineInvariantChecker.report).
+    """
+    checker = TimelineInvariantChecker(max_examples=max_examples)
+    checker.update(resolved_df, source_df)
+    return checker.finish(), checker.report()
+
+# --- Parallel conversion ---
+# Partitions are contiguous slices of the source frame, resolved in worker processes
+# and concatenated in partition order. Resolution does not log (overrides are
+# reported by build_override_audit in the parent), and block and override
+# validation always run in the parent process before any partition is resolved.
+
+def resolve_design_space_parallel(source_df, jobs, engine='vectorized', executor=None):
+    """
+    Resolves a design space in a process pool, with the same result as
+    resolve_design_space.
+
+    Args:
+        source_df: pandas DataFrame in the conceptual (super experiment) schema.
+        jobs (int): Number of partitions/worker processes. 1 or less resolves in-process.
+        engine (str): Resolution engine passed to resolve_design_space.
+        executor: Optional concurrent.futures executor to reuse across calls
+            (e.g. one per streamed file). A ProcessPoolExecutor with `jobs`
+            workers is created when omitted.
+
+    Returns:
+        pd.DataFrame: The resolved conditions in source row order.
+    """
+    if jobs <= 1 or len(source_df) < 2:
+        return resolve_design_space(source_df, engine=engine)
+
+    bounds = np.linspace(0, len(source_df), min(jobs, len(source_df)) + 1).astype(int)
+    partitions = [source_df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(resolve_design_space, partitions, repeat(engine)))
+    else:
+        results = list(executor.map(resolve_design_space, partitions, repeat(engine)))
+
+    return pd.concat(results, ignore_index=True)
+
+def resolve_design_space_stream(input_path, output_path, chunksize, engine='vectorized', jobs=1,
+                                timeline_checker=None):
+    """
+    Resolves a design space CSV chunk by chunk, appending each resolved chunk to the
+    output file, so peak memory is bounded by the chunk size rather than the input size.
+
+    All source columns are read as strings so that every chunk sees the same dtypes
+    regardless of which values happen to fall into it. Block validation is carried
+    across chunk boundaries by a BlockConfigValidator, and each chunk's duration
+    overrides are checked by validate_overrides. The output is written to a
+    temporary file next to output_path and moved into place once complete.
+
+    Args:
+        input_path (str): Path to the conceptual design space CSV.
+        output_path (str): Path of the resolved CSV to write.
+        chunksize (int): Number of source rows to hold in memory at a time.
+        engine (str): Resolution engine passed to resolve_design_space.
+        jobs (int): Number of worker processes used to resolve each chunk.
+        timeline_checker (TimelineInvariantChecker): Optional checker that is
+            updated with every resolved chunk.
+
+    Returns:
+        tuple: (n_rows, head_df, validation_passed, override_audit) with the number
+        of resolved conditions, the first rows of the output for display, the block
+        validation result and the override audit (see build_override_audit).
+    """
+    validator = BlockConfigValidator()
+    n_rows = 0
+    head_df = None
+    tmp_path = f"{output_path}.tmp"
+
+    audit_chunks = []
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+
+    try:
+        with open(tmp_path, 'w', newline='') as out_file:
+            for chunk in pd.read_csv(input_path, chunksize=chunksize, dtype=str):
+                if not validator.update(chunk) or not validate_overrides(chunk):
+                    return n_rows, head_df, False, pd.DataFrame(columns=OVERRIDE_AUDIT_COLUMNS)
+
+                resolved_chunk = resolve_design_space_parallel(chunk, jobs, engine=engine, executor=executor)
+                if timeline_checker is not None:
+                    timeline_checker.update(resolved_chunk, chunk)
+                chunk_audit = build_override_audit(chunk)
+                if not chunk_audit.empty:
+                    audit_chunks.append(chunk_audit)
+                resolved_chunk.to_csv(out_file, index=False, header=(n_rows == 0))
+
+                if head_df is None:
+                    head_df = resolved_chunk.head()
+                n_rows += len(resolved_chunk)
+                logger.debug(f"Resolved {n_rows} conditions so far.")
+
+            if head_df is None:
+                head_df = pd.DataFrame(columns=FINAL_COLUMN_ORDER)
+                head_df.to_csv(out_file, index=False)
+
+        validation_passed = validator.finish()
+        os.replace(tmp_path, output_path)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    override_audit = pd.concat(audit_chunks, ignore_index=True) if audit_chunks else pd.DataFrame(columns=OVERRIDE_AUDIT_COLUMNS)
+    return n_rows, head_df, validation_passed, override_audit
+
+# --- Incremental re-conversion ---
+# A sidecar manifest records a content hash per source row together with a digest
+# of the resolved output. On re-run only rows whose hash is new are resolved; the
+# CSV records of unchanged rows are copied from the existing output. Source rows
+# are read as strings (as in --stream mode), so each resolved record depends only
+# on its own source row and the spliced file is byte-identical to a full rebuild.
+
+MANIFEST_FORMAT = 1
+_HASH_FIELD_SEP = '\x1f'
+_HASH_NA = '\x00'
+
+def converter_fingerprint():
+    """Digest of the converter sources; any code change invalidates existing manifests."""
+    digest = hashlib.sha256()
+    for path in (__file__, mapping_notes.__file__):
+        with open(path, 'rb') as source_file:
+            digest.update(source_file.read())
+    return digest.hexdigest()
+
+def compute_row_hashes(source_df):
+    """
+    Computes a content hash for every source row (all raw columns, including the notes).
+
+    Returns:
+        list[str]: One hex digest per row, in row order.
+    """
+    if source_df.empty:
+        return []
+    joined = None
+    for col in source_df.columns:
+        values = source_df[col].astype(object).where(source_df[col].notna(), _HASH_NA).astype(str)
+        joined = values if joined is None else joined + _HASH_FIELD_SEP + values
+    return [hashlib.blake2b(row.encode('utf-8'), digest_size=16).hexdigest() for row in joined]
+
+def split_csv_records(text):
+    """
+    Splits CSV text written by DataFrame.to_csv into records, each including its
+    trailing newline. Newlines inside quoted fields do not end a record.
+    """
+    records = []
+    pending = []
+    quote_count = 0
+    for piece in text.split('\n')[:-1] if text.endswith('\n') else text.split('\n'):
+        pending.append(piece)
+        quote_count += piece.count('"')
+        if quote_count % 2 == 0:
+            records.append('\n'.join(pending) + '\n')
+            pending = []
+            quote_count = 0
+    if pending:
+        raise ValueError("Unterminated quoted field in CSV text.")
+    return records
+
+def _has_integer_timings(resolved_df):
+    return all(pd.api.types.is_integer_dtype(resolved_df[col]) for col in TIMING_KEYS)
+
+def _load_manifest(manifest_path):
+    try:
+        with open(manifest_path) as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def _write_text_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', newline='') as out_file:
+        out_file.write(text)
+    os.replace(tmp_path, path)
+
+def resolve_design_space_incremental(input_path, output_path, manifest_path=None, engine='vectorized', jobs=1):
+    """
+    Re-converts only the source rows that were added or changed since the last run.
+
+    The manifest (default: output_path with a '.manifest.json' suffix) stores one
+    content hash and experiment name per source row, the column list, a digest of
+    the resolved output and a fingerprint of the converter code. A full rebuild is
+    done when there is no usable manifest, the source columns or converter changed,
+    the output file was modified, or the manifest does not record integer timing
+    columns (unchanged records are reused as text, which relies on every timing
+    column being formatted as integers).
+
+    Args:
+        input_path (str): Path to the conceptual design space CSV.
+        output_path (str): Path of the resolved CSV to update.
+        manifest_path (str): Path of the sidecar manifest.
+        engine (str): Resolution engine passed to resolve_design_space.
+        jobs (int): Number of worker processes used to resolve new rows.
+
+    Returns:
+        dict: Change report with 'full_rebuild' (bool), 'reason' (str), 'added',
+        'changed' and 'removed' (lists of experiment names), 'unchanged' (int),
+        'n_rows' (int), 'validation_passed' (bool) and 'override_audit' (DataFrame,
+        covering all source rows).
+    """
+    if manifest_path is None:
+        manifest_path = os.path.splitext(output_path)[0] + '.manifest.json'
+
+    source_df = pd.read_csv(input_path, dtype=str)
+    row_hashes = compute_row_hashes(source_df)
+    experiments = source_df['Experiment'].tolist()
+    fingerprint = converter_fingerprint()
+
+    report = {
+        'full_rebuild': False, 'reason': '', 'added': [], 'changed': [], 'removed': [],
+        'unchanged': 0, 'n_rows': len(source_df), 'validation_passed': True,
+        'override_audit': build_override_audit(source_df),
+    }
+
+    if not validate_block_configurations(source_df) or not validate_overrides(source_df):
+        report['validation_passed'] = False
+        return report
+
+    # --- 1. Decide whether the previous output can be reused ---
+    manifest = _load_manifest(manifest_path)
+    old_records = None
+    if manifest is None:
+        report['reason'] = "no usable manifest"
+    elif manifest.get('format') != MANIFEST_FORMAT or manifest.get('converter') != fingerprint:
+        report['reason'] = "converter changed"
+    elif manifest.get('source_columns') != list(source_df.columns):
+        report['reason'] = "source columns changed"
+    elif not manifest.get('integer_timings', False):
+        report['reason'] = "previous output has non-integer timings"
+    else:
+        try:
+            with open(output_path, newline='') as out_file:
+                output_text = out_file.read()
+        except OSError:
+            output_text = None
+        if output_text is None or hashlib.sha256(output_text.encode('utf-8')).hexdigest() != manifest.get('output_sha256'):
+            report['reason'] = "resolved output missing or modified"
+        else:
+            old_header, *old_records = split_csv_records(output_text)
+            if len(old_records) != len(manifest['rows']):
+                report['reason'] = "resolved output does not match manifest"
+                old_records = None
+
+    # --- 2. Match rows by content hash; identical rows share identical output records ---
+    reusable = {}
+    if old_records is not None:
+        header = old_header
+        for (row_hash, _), record in zip(manifest['rows'], old_records):
+            reusable.setdefault(row_hash, []).append(record)
+
+    new_positions = [pos for pos, row_hash in enumerate(row_hashes) if row_hash not in reusable]
+    new_records = []
+    if new_positions or old_records is None:
+        resolved_new = resolve_design_space_parallel(source_df.iloc[new_positions], jobs, engine=engine)
+        if old_records is not None and not _has_integer_timings(resolved_new):
+            report['reason'] = "non-integer timings require a full rebuild"
+            old_records, reusable = None, {}
+            new_positions = list(range(len(source_df)))
+            resolved_new = resolve_design_space_parallel(source_df, jobs, engine=engine)
+        integer_timings = _has_integer_timings(resolved_new)
+        header, *new_records = split_csv_records(resolved_new.to_csv(index=False, lineterminator='\n'))
+    else:
+        integer_timings = True
+
+    # --- 3. Splice reused and newly resolved records in source order ---
+    new_record_at = dict(zip(new_positions, new_records))
+    records = []
+    for pos, row_hash in enumerate(row_hashes):
+        if pos in new_record_at:
+            records.append(new_record_at[pos])
+        else:
+            records.append(reusable[row_hash].pop())
+
+    # --- 4. Report what changed ---
+    if old_records is None:
+        report['full_rebuild'] = True
+    else:
+        # Old rows that were not reused were edited (same experiment name) or deleted
+        leftover = {}
+        for row_hash, experiment in manifest['rows']:
+            if reusable.get(row_hash):
+                leftover[experiment] = leftover.get(experiment, 0) + 1
+                reusable[row_hash].pop()
+        for pos in new_positions:
+            experiment = experiments[pos]
+            if leftover.get(experiment):
+                leftover[experiment] -= 1
+                report['changed'].append(experiment)
+            else:
+                report['added'].append(experiment)
+        report['removed'] = [experiment for experiment, count in leftover.items() for _ in range(count)]
+        report['unchanged'] = len(source_df) - len(new_positions)
+
+    output_text = header + ''.join(records)
+    _write_text_atomic(output_path, output_text)
+
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'converter': fingerprint,
+        'source_columns': list(source_df.columns),
+        'integer_timings': integer_timings,
+        'output_sha256': hashlib.sha256(output_text.encode('utf-8')).hexdigest(),
+        'rows': [[row_hash, experiment] for row_hash, experiment in zip(row_hashes, experiments)],
+    }
+    _write_text_atomic(manifest_path, json.dumps(manifest))
+
+    return report
+
+# --- Typed columnar output ---
+# CSV stays the default. Feather and Parquet keep the compact dtypes above, so
+# consumers skip re-parsing the timing columns; both need the optional pyarrow
+# package (pandas raises an ImportError naming it when it is missing).
+
+RESOLVED_FORMATS = {'.csv': 'csv', '.feather': 'feather', '.parquet': 'parquet'}
+
+def _resolved_format(path):
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension not in RESOLVED_FORMATS:
+        raise ValueError(f"Unsupported output format '{extension}'. Must be one of {list(RESOLVED_FORMATS)}.")
+    return RESOLVED_FORMATS[extension]
+
+def to_typed_frame(resolved_df):
+    """
+    Casts a resolved design space to compact dtypes: int32 timings, float32
+    coherences and categoricals for the low-cardinality label columns.
+
+    Raises:
+        ValueError: If a timing value does not fit into int32.
+    """
+    typed_df = resolved_df.copy()
+    for col, dtype in TYPED_COLUMN_DTYPES.items():
+        # Pass-through columns (e.g. Switch_Rate_Percent) are strings when the source was read as text
+        values = pd.to_numeric(typed_df[col])
+        if dtype.startswith('int'):
+            limits = np.iinfo(dtype)
+            if len(values) and (values.min() < limits.min or values.max() > limits.max):
+                raise ValueError(f"Column '{col}' has values outside the {dtype} range.")
+        typed_df[col] = values.astype(dtype)
+    for col in TYPED_CATEGORICAL_COLUMNS:
+        typed_df[col] = typed_df[col].astype('category')
+    return typed_df
+
+def write_resolved_design_space(resolved_df, output_path):
+    """
+    Writes a resolved design space; the format follows the file extension
+    (.csv, .feather or .parquet). Columnar formats are written with typed dtypes.
+    """
+    output_format = _resolved_format(output_path)
+    if output_format == 'csv':
+        resolved_df.to_csv(output_path, index=False)
+    elif output_format == 'feather':
+        to_typed_frame(resolved_df).reset_index(drop=True).to_feather(output_path)
+    else:
+        to_typed_frame(resolved_df).to_parquet(output_path, index=False)
+
+def load_resolved_design_space(path):
+    """
+    Loads a resolved design space written by convert.py as a typed DataFrame.
+
+    Feather and Parquet files are read as stored. CSV files are parsed and then
+    cast to the same dtypes; empty text fields come back as NaN, since CSV cannot
+    tell them apart.
+    """
+    input_format = _resolved_format(path)
+    if input_format == 'feather':
+        return pd.read_feather(path)
+    if input_format == 'parquet':
+        return pd.read_parquet(path)
+    # Only empty fields are missing values; literal 'N/A' labels are kept as written
+    return to_typed_frame(pd.read_csv(path, keep_default_na=False, na_values=['']))
+
 # --- Main Execution Block ---
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process the Super Experiment design space into absolute parameters.")
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
-        help="Enable verbose logging to see parameter overrides."
+        help="Enable verbose logging to see each parameter override."
+    )
+    parser.add_argument(
+        '--engine',
+        choices=['vectorized', 'rowwise'],
+        default='vectorized',
+        help="Resolution engine: whole-frame array operations (default) or the per-row reference implementation."
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help="Read, resolve and write the design space in chunks to keep memory usage flat."
+    )
+    parser.add_argument(
+        '--chunksize',
+        type=int,
+        default=100_000,
+        help="Number of source rows per chunk in --stream mode (default: 100000)."
+    )
+    parser.add_argument(
+        '--format',
+        choices=['csv', 'feather', 'parquet'],
+        default='csv',
+        help="Output format. Feather and Parquet store typed columns and require pyarrow (default: csv)."
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help="Number of worker processes used to resolve conditions (default: 1)."
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help="Only re-resolve rows that changed since the last run (tracked in a .manifest.json next to the output)."
+    )
+    parser.add_argument(
+        '--timeline-check',
+        choices=['off', 'warn', 'fail'],
+        default='warn',
+        help="Check the resolved timelines for invariant violations; 'fail' exits with status 2 "
+             "if any are found (default: warn)."
+    )
+    parser.add_argument(
+        '--override-audit',
+        metavar='PATH',
+        help="Write the table of applied parameter overrides to PATH (.csv or .json)."
     )
     args = parser.parse_args()
+    if args.format != 'csv' and (args.stream or args.incremental):
+        parser.error("--format feather/parquet cannot be combined with --stream or --incremental.")
     
     # Always set up logger for validation, use INFO level for validation messages
     logger = setup_logger(logging.INFO)
@@ -320,87 +1427,80 @@ if __name__ == "__main__":
         logger.setLevel(logging.DEBUG)
         logger.info("Verbose logging enabled.")
     
+    source_path = 'data/super_experiment_design_space.csv'
+    output_path = f'data/resolved_design_space.{args.format}'
+    timeline_checker = TimelineInvariantChecker()
+
     try:
-        # Load the source CSV file
-        source_df = pd.read_csv('data/super_experiment_design_space.csv')
-        print(f"Loaded {len(source_df)} conditions from the source CSV.")
-        
-        # Validate block configurations before processing
-        logger.info("Validating block configurations...")
-        if not validate_block_configurations(source_df):
-            logger.error("Block validation failed. Aborting processing.")
-            sys.exit(1)
-        
-        # List to hold all the processed condition dictionaries
-        resolved_conditions = []
-        
-        # Loop and process each row
-        for index, row in source_df.iterrows():
-            resolved_row = process_condition(row)
-            resolved_conditions.append(resolved_row)
-            
-        # Create the final DataFrame
-        resolved_df = pd.DataFrame(resolved_conditions)
-        
-        # --- Collapse Conflict Dimensions ---
-        # Add the source columns from the original dataset for conflict collapsing
-        resolved_df['Stimulus-Stimulus Congruency'] = source_df['Stimulus-Stimulus Congruency']
-        resolved_df['Stimulus-Response Congruency'] = source_df['Stimulus-Response Congruency']
-        
-        # Apply the conflict collapsing logic
-        s_s_col = resolved_df['Stimulus-Stimulus Congruency']
-        s_r_col = resolved_df['Stimulus-Response Congruency']
-        
-        conditions = [
-            (s_s_col == 'Incongruent') | (s_r_col == 'Incongruent'),
-            (s_s_col == 'Congruent') | (s_r_col == 'Congruent'),
-            (s_s_col == 'Neutral') | (s_r_col == 'Neutral')
-        ]
-        
-        choices = [
-            'Incongruent',
-            'Congruent',
-            'Neutral'
-        ]
-        
-        resolved_df['Stimulus Bivalence & Congruency'] = np.select(conditions, choices, default='N/A')
-        
-        # Remove the temporary source columns
-        resolved_df = resolved_df.drop(columns=['Stimulus-Stimulus Congruency', 'Stimulus-Response Congruency'])
-        
-        # Define the final column order for the output CSV
-        final_column_order = [
-            'Experiment', 'N_Tasks', 'Task_1_Type', 'Task_2_Type',
-            'Stimulus_Valency', 'Stimulus Bivalence & Congruency', 'Simplified_RSO', 'SRM_1', 'SRM_2',
-            'Switch_Rate_Percent', 'Block_ID', 'Description', 'Sequence_Type', 
-            'RSI_Distribution_Type', 'RSI_Distribution_Params', 
-            'SOA_Distribution_Type', 'SOA_Distribution_Params', 'ITI_ms',
-            'coh_1', 'coh_2', 'Trial_Transition_Type',
-            'effective_start_cue1', 'effective_end_cue1', 'effective_start_go1', 'effective_end_go1',
-            'effective_start_stim1_mov', 'effective_end_stim1_mov', 'effective_start_stim2_mov', 'effective_end_stim2_mov',
-            'effective_start_cue2', 'effective_end_cue2', 'effective_start_go2', 'effective_end_go2',
-            'effective_start_stim1_or', 'effective_end_stim1_or', 'effective_start_stim2_or', 'effective_end_stim2_or',
-        ]
-        
-        # Ensure all columns exist, fill missing with 0 or a suitable default
-        for col in final_column_order:
-            if col not in resolved_df.columns:
-                resolved_df[col] = 0
-        
-        resolved_df = resolved_df[final_column_order]
-        
-        # Save the new CSV
-        output_path = 'data/resolved_design_space.csv'
-        resolved_df.to_csv(output_path, index=False)
+        if args.incremental:
+            report = resolve_design_space_incremental(source_path, output_path, engine=args.engine, jobs=args.jobs)
+            if not report['validation_passed']:
+                logger.error("Validation failed. Aborting processing.")
+                sys.exit(1)
+            if report['full_rebuild']:
+                print(f"Full rebuild ({report['reason']}).")
+            else:
+                print(f"Incremental update: {len(report['added'])} added, {len(report['changed'])} changed, "
+                      f"{len(report['removed'])} removed, {report['unchanged']} unchanged.")
+                for key in ('added', 'changed', 'removed'):
+                    for experiment in report[key]:
+                        logger.info(f"  {key}: {experiment}")
+            n_rows, override_audit = report['n_rows'], report['override_audit']
+            resolved_head = pd.read_csv(output_path, nrows=5)
+            if args.timeline_check != 'off':
+                timeline_checker.update(pd.read_csv(output_path, usecols=TIMING_KEYS),
+                                        pd.read_csv(source_path, dtype=str))
+        elif args.stream:
+            logger.info(f"Streaming conversion in chunks of {args.chunksize} conditions...")
+            n_rows, resolved_head, validation_passed, override_audit = resolve_design_space_stream(
+                source_path, output_path, args.chunksize, engine=args.engine, jobs=args.jobs,
+                timeline_checker=timeline_checker if args.timeline_check != 'off' else None
+            )
+            if not validation_passed:
+                logger.error("Validation failed. Aborting processing.")
+                sys.exit(1)
+        else:
+            # Load the source CSV file
+            source_df = pd.read_csv(source_path)
+            print(f"Loaded {len(source_df)} conditions from the source CSV.")
+
+            # Validate block configurations before processing
+            logger.info("Validating block configurations...")
+            if not validate_block_configurations(source_df):
+                logger.error("Block validation failed. Aborting processing.")
+                sys.exit(1)
+            if not validate_overrides(source_df):
+                sys.exit(1)
+
+            resolved_df = resolve_design_space_parallel(source_df, args.jobs, engine=args.engine)
+            override_audit = build_override_audit(source_df)
+            if args.timeline_check != 'off':
+                timeline_checker.update(resolved_df, source_df)
+
+            # Save the resolved design space (CSV or typed Feather/Parquet)
+            write_resolved_design_space(resolved_df, output_path)
+            n_rows, resolved_head = len(resolved_df), resolved_df.head()
         
-        print(f"\nSuccessfully processed {len(resolved_df)} conditions.")
+        log_override_audit(override_audit)
+        if args.override_audit:
+            write_override_audit(override_audit, args.override_audit)
+            print(f"Saved the override audit to '{args.override_audit}'")
+
+        timelines_passed = timeline_checker.finish() if args.timeline_check != 'off' else True
+
+        print(f"\nSuccessfully processed {n_rows} conditions.")
         print(f"Saved the resolved absolute parameter space to '{output_path}'")
         
         # Display the head of the output for verification
         print("\n--- Head of the Resolved Output CSV ---")
-        print(resolved_df.head().to_markdown(index=False))
+        print(resolved_head.to_markdown(index=False))
+
+        if not timelines_passed and args.timeline_check == 'fail':
+            sys.exit(2)
         
     except FileNotFoundError:
         print("Error: 'data/super_experiment_design_space.csv' not found. Please make sure the file is in the correct directory.")
+        sys.exit(1)
     except Exception as e:
         print(f"An error occurred: {e}")
+        sys.exit(1)
@@ -0,0 +1,97 @@
+# mapping_notes.py
+"""
+Shared decoding layer for the Super_Experiment_Mapping_Notes JSON column.
+
+Many conditions in a block carry byte-identical notes, so each distinct notes
+string is decoded once (bounded LRU, keyed on the raw string) and returned as an
+immutable ParsedNotes view. Nested dictionaries are exposed as read-only
+MappingProxyType objects and lists as tuples, so a cached view can be shared
+between rows and call sites without defensive copies. Use thaw() to get plain
+dicts/lists back, e.g. for json.dumps or str() renderings.
+
+Used by convert.py, scripts/study_stats.py and scripts/convert_json_schema.py.
+"""
+
+import json
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+# Maximum number of distinct notes strings kept decoded in memory.
+NOTES_CACHE_SIZE = 4096
+
+
+class ParsedNotes(NamedTuple):
+    """Immutable view of one decoded notes string."""
+    data: Mapping            # The full decoded JSON object
+    block_id: Any            # 'block_id', '' if absent
+    description: Any         # 'description', '' if absent
+    convert_overrides: Any   # 'convert_overrides', empty mapping if absent
+    viewer_config: Any       # 'viewer_config', empty mapping if absent
+
+
+_EMPTY_MAPPING = MappingProxyType({})
+EMPTY_NOTES = ParsedNotes(_EMPTY_MAPPING, '', '', _EMPTY_MAPPING, _EMPTY_MAPPING)
+
+
+def freeze(value):
+    """Recursively converts dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Inverse of freeze(): returns plain (mutable) dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+@lru_cache(maxsize=NOTES_CACHE_SIZE)
+def _decode_notes_str(notes_str):
+    try:
+        # The notes might be enclosed in extra quotes, so we strip them
+        data = json.loads(notes_str.strip('"'))
+    except (json.JSONDecodeError, TypeError):
+        # If it fails, it's likely a plain text note, which carries no structured fields.
+        return EMPTY_NOTES
+
+    if not isinstance(data, dict):
+        return EMPTY_NOTES
+
+    frozen = freeze(data)
+    return ParsedNotes(
+        data=frozen,
+        block_id=frozen.get('block_id', ''),
+        description=frozen.get('description', ''),
+        convert_overrides=frozen.get('convert_overrides', _EMPTY_MAPPING),
+        viewer_config=frozen.get('viewer_config', _EMPTY_MAPPING),
+    )
+
+
+def decode_notes(notes_str):
+    """
+    Decodes a Super_Experiment_Mapping_Notes value into a ParsedNotes view.
+
+    Returns EMPTY_NOTES for NaN/None, non-string values, empty strings and
+    invalid JSON. Results are memoized on the raw string.
+    """
+    if not isinstance(notes_str, str):
+        return EMPTY_NOTES
+    return _decode_notes_str(notes_str)
+
+
+def notes_cache_info():
+    """Returns the functools cache statistics (hits, misses, maxsize, currsize)."""
+    return _decode_notes_str.cache_info()
+
+
+def clear_notes_cache():
+    """Empties the decoded-notes cache."""
+    _decode_notes_str.cache_clear()
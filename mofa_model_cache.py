@@ -0,0 +1,197 @@
+# mofa_model_cache.py
+"""
+Lazy, cached read access to a trained MOFA+ model file.
+
+mofax's mofa_model keeps the HDF5 file open and rebuilds DataFrames from it on
+every get_weights()/get_factors()/get_variance_explained() call. CachedMofaModel
+reads each view's weights, each group's factors and the R² table once, on first
+use, keeps them as read-only NumPy arrays with their feature/sample index, and
+closes the file after every read. It answers the same calls as mofa_model, so
+it can be passed to analysis_utils.reconstruct_from_mofa_factors,
+generate_interpolated_points and plot.plot_factor_weights_by_view:
+
+    model = CachedMofaModel('mofa_models/<key>.hdf5')
+    model.get_weights(factors='Factor1', df=True)
+    W, features = model.weight_matrix()
+
+mofax is imported when the file is first opened.
+"""
+
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+
+def _open_mofax(filepath):
+    import mofax as mfx
+    return mfx.mofa_model(filepath)
+
+
+def _as_list(value):
+    if value is None:
+        return None
+    if isinstance(value, (str, int, np.integer)):
+        return [value]
+    return list(value)
+
+
+def _readonly(values):
+    values = np.array(values, dtype=float)
+    values.setflags(write=False)
+    return values
+
+
+class CachedMofaModel:
+    """
+    Read-through cache over a mofax model file; see the module docstring.
+
+    Args:
+        filepath (str): The trained model (HDF5).
+        open_model (callable): open_model(filepath) -> model with get_weights,
+            get_factors, get_variance_explained, views, groups, features_metadata
+            and close(). Defaults to mofax.mofa_model.
+    """
+    def __init__(self, filepath, open_model=None):
+        self.filepath = str(filepath)
+        self._open_model = open_model or _open_mofax
+        self._metadata = None
+        self._weights = {}    # view -> (array, feature index)
+        self._factors = {}    # group -> (array, sample index)
+        self._factor_names = None
+        self._r2 = None
+        self._weight_matrix = None
+
+    @contextmanager
+    def _opened(self):
+        model = self._open_model(self.filepath)
+        try:
+            yield model
+        finally:
+            model.close()
+
+    def _load_metadata(self):
+        if self._metadata is None:
+            with self._opened() as model:
+                self._metadata = (list(model.views), list(model.groups), model.features_metadata.copy())
+        return self._metadata
+
+    @property
+    def views(self):
+        return self._load_metadata()[0]
+
+    @property
+    def groups(self):
+        return self._load_metadata()[1]
+
+    @property
+    def features_metadata(self):
+        return self._load_metadata()[2]
+
+    @property
+    def factor_names(self):
+        if self._factor_names is None:
+            self._load_weights(self.views[:1])
+        return self._factor_names
+
+    @property
+    def nfactors(self):
+        return len(self.factor_names)
+
+    @property
+    def shape(self):
+        """(samples over all groups, features over all views)."""
+        n_samples = sum(len(self._load_factors([group])[group][1]) for group in self.groups)
+        return n_samples, len(self.weight_matrix()[1])
+
+    def _load_weights(self, views):
+        missing = [view for view in views if view not in self._weights]
+        if missing:
+            with self._opened() as model:
+                for view in missing:
+                    weights = model.get_weights(views=view, df=True)
+                    self._weights[view] = (_readonly(weights.to_numpy()), weights.index)
+                    if self._factor_names is None:
+                        self._factor_names = list(weights.columns)
+        return self._weights
+
+    def _load_factors(self, groups):
+        missing = [group for group in groups if group not in self._factors]
+        if missing:
+            with self._opened() as model:
+                for group in missing:
+                    factors = model.get_factors(groups=group, df=True)
+                    self._factors[group] = (_readonly(factors.to_numpy()), factors.index)
+                    if self._factor_names is None:
+                        self._factor_names = list(factors.columns)
+        return self._factors
+
+    def _factor_positions(self, factors):
+        """Column positions of factors given by name ('Factor1') or 0-based index; None for all."""
+        factors = _as_list(factors)
+        if factors is None:
+            return None
+        names = self.factor_names
+        return [factor if isinstance(factor, (int, np.integer)) else names.index(factor) for factor in factors]
+
+    def _select(self, blocks, factors, df):
+        positions = self._factor_positions(factors)
+        if len(blocks) == 1:
+            values, index = blocks[0]
+        else:
+            values = np.concatenate([block[0] for block in blocks])
+            index = pd.Index(np.concatenate([block[1].to_numpy() for block in blocks]))
+        if positions is not None:
+            values = values[:, positions]
+        columns = [self.factor_names[pos] for pos in positions] if positions is not None else self.factor_names
+        if df:
+            return pd.DataFrame(values, index=index, columns=columns, copy=False)
+        return values
+
+    def weight_matrix(self):
+        """(weights of all views, features x factors, read-only; feature index), cached."""
+        if self._weight_matrix is None:
+            weights = self._load_weights(self.views)
+            blocks = [weights[view] for view in self.views]
+            values = _readonly(np.concatenate([block[0] for block in blocks]))
+            index = pd.Index(np.concatenate([block[1].to_numpy() for block in blocks]))
+            self._weight_matrix = (values, index)
+        return self._weight_matrix
+
+    def get_weights(self, views=None, factors=None, df=False):
+        """As mofa_model.get_weights: features x factors for the given views (all by default)."""
+        views = _as_list(views)
+        if views is None:
+            blocks = [self.weight_matrix()]
+        else:
+            weights = self._load_weights(views)
+            blocks = [weights[view] for view in views]
+        return self._select(blocks, factors, df)
+
+    def get_factors(self, groups=None, factors=None, df=False):
+        """As mofa_model.get_factors: samples x factors for the given groups (all by default)."""
+        groups = _as_list(groups) or self.groups
+        loaded = self._load_factors(groups)
+        return self._select([loaded[group] for group in groups], factors, df)
+
+    def get_variance_explained(self, factors=None, groups=None, views=None):
+        """
+        As mofa_model.get_variance_explained: a long R² table (Factor, View, Group, R2),
+        optionally filtered. The table is read once; a filtered copy is returned.
+        """
+        if self._r2 is None:
+            with self._opened() as model:
+                self._r2 = model.get_variance_explained().copy()
+        r2 = self._r2
+        mask = np.ones(len(r2), dtype=bool)
+        for column, values in (('Factor', factors), ('Group', groups), ('View', views)):
+            values = _as_list(values)
+            if values is not None:
+                if column == 'Factor':
+                    values = [self.factor_names[v] if isinstance(v, (int, np.integer)) else v for v in values]
+                mask &= r2[column].isin(values).to_numpy()
+        return r2[mask].reset_index(drop=True)
+
+    def clear(self):
+        """Drops all cached arrays; the next access reads the file again."""
+        self.__init__(self.filepath, self._open_model)
@@ -0,0 +1,257 @@
+# mofa_training.py
+"""
+Hash-keyed MOFA+ training sweeps.
+
+Every model is addressed by a hash of its input data (the output of
+analysis_utils.prepare_mofa_data) and its TrainingParams, and stored as
+<model_dir>/<key>.hdf5. train_models() trains the models of a hyperparameter
+grid that are not on disk yet in a process pool, and records convergence time,
+ELBO and variance explained (R²) of each one in <model_dir>/manifest.json.
+Finished models are reused, so an interrupted or extended sweep only trains
+what is missing.
+
+    grid = parameter_grid(factors=range(1, 16), seeds=range(10))
+    manifest = train_models(au.prepare_mofa_data(df_raw, strategy='dense', compact=True), grid, 'mofa_models')
+
+mofapy2 is imported by the worker processes only.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from analysis_utils import MofaMatrices
+
+MANIFEST_NAME = 'manifest.json'
+MODEL_SUFFIX = '.hdf5'
+
+
+class TrainingParams(NamedTuple):
+    """Model and training options of one MOFA+ run (defaults as in mofa_dense.ipynb)."""
+    factors: int = 15
+    ard_factors: bool = False
+    spikeslab_weights: bool = True   # Spike-and-slab sparsity prior on the weights
+    seed: int = 2024
+    ard_weights: bool = True
+    iterations: int = 1000
+    convergence_mode: str = 'slow'
+    drop_r2: float = 0.001
+
+
+def parameter_grid(factors=(15,), ard_factors=(False,), spikeslab_weights=(True,), seeds=(2024,), **options):
+    """
+    Returns the TrainingParams of the full grid, seeds varying fastest.
+
+    Args:
+        factors, ard_factors, spikeslab_weights, seeds (iterable): Values to sweep.
+        **options: Fixed values for the remaining TrainingParams fields.
+
+    Returns:
+        list[TrainingParams]
+    """
+    return [
+        TrainingParams(factors=int(n_factors), ard_factors=ard, spikeslab_weights=sparse, seed=int(seed), **options)
+        for n_factors, ard, sparse, seed in itertools.product(factors, ard_factors, spikeslab_weights, seeds)
+    ]
+
+
+def data_fingerprint(data, likelihoods):
+    """
+    Hash of a prepare_mofa_data() input: the long DataFrame or MofaMatrices and its likelihoods.
+
+    The long format is hashed by content (pd.util.hash_pandas_object), so the
+    object and Categorical encodings of the same table share a fingerprint.
+    """
+    digest = hashlib.sha256(json.dumps(list(likelihoods)).encode())
+    if isinstance(data, MofaMatrices):
+        names = [data.views_names, data.groups_names, data.samples_names, data.features_names]
+        digest.update(json.dumps(names, default=str).encode())
+        for view_data in data.data:
+            for values in view_data:
+                values = np.ascontiguousarray(values)
+                digest.update(str(values.dtype).encode())
+                digest.update(values.tobytes())
+    else:
+        digest.update(json.dumps(list(map(str, data.columns))).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def model_key(data_hash, params):
+    """Content address of one model: data fingerprint + TrainingParams."""
+    options = json.dumps(params._asdict(), sort_keys=True)
+    return hashlib.sha256(f"{data_hash}\n{options}".encode()).hexdigest()[:20]
+
+
+def train_model(data, likelihoods, params, outfile):
+    """
+    Trains and saves one MOFA+ model with mofapy2.
+
+    Returns:
+        dict: 'convergence_time' (seconds in ent.run()), 'n_iterations', 'elbo'
+            (last computed ELBO) and 'r2' (total variance explained per view, first group).
+    """
+    from mofapy2.run.entry_point import entry_point
+
+    ent = entry_point()
+    if isinstance(data, MofaMatrices):
+        ent.set_data_matrix(**data._asdict(), likelihoods=likelihoods)
+    else:
+        ent.set_data_df(data, likelihoods=likelihoods)
+    ent.set_model_options(
+        factors=params.factors,
+        spikeslab_weights=params.spikeslab_weights,
+        ard_weights=params.ard_weights,
+        ard_factors=params.ard_factors,
+    )
+    ent.set_train_options(
+        iter=params.iterations,
+        convergence_mode=params.convergence_mode,
+        dropR2=params.drop_r2,
+        seed=params.seed,
+        verbose=False,
+    )
+    ent.build()
+    start = time.perf_counter()
+    ent.run()
+    convergence_time = time.perf_counter() - start
+    ent.save(outfile)
+
+    elbo = np.asarray(ent.model.getTrainingStats()['elbo'], dtype=float)
+    computed = elbo[np.isfinite(elbo)]
+    r2_total = np.asarray(ent.model.calculate_variance_explained(total=True)[0], dtype=float)
+    return {
+        'convergence_time': convergence_time,
+        'n_iterations': int(len(elbo)),
+        'elbo': float(computed[-1]) if len(computed) else None,
+        'r2': dict(zip(ent.data_opts['views_names'], r2_total.tolist())),
+    }
+
+
+# Set once per worker process by _init_worker, so the data is pickled once per worker, not per model.
+_WORKER_DATA = None
+
+
+def _init_worker(data, likelihoods):
+    global _WORKER_DATA
+    _WORKER_DATA = (data, likelihoods)
+
+
+def _train_in_worker(train_fn, params, outfile):
+    data, likelihoods = _WORKER_DATA
+    return train_fn(data, likelihoods, params, outfile)
+
+
+def read_manifest(model_dir):
+    """The manifest of model_dir as {key: entry}; empty if there is none."""
+    try:
+        with open(os.path.join(model_dir, MANIFEST_NAME)) as manifest_file:
+            return json.load(manifest_file)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_manifest(model_dir, manifest):
+    path = os.path.join(model_dir, MANIFEST_NAME)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def train_models(mofa_input, grid, model_dir, max_workers=None, train_fn=train_model):
+    """
+    Trains the models of grid that model_dir does not hold yet.
+
+    Args:
+        mofa_input (tuple): The output of prepare_mofa_data() (either layout).
+        grid (iterable): TrainingParams, e.g. from parameter_grid().
+        model_dir (str): Directory of the model files and the manifest.
+        max_workers (int): Size of the process pool (default: CPU count).
+            With max_workers=1 models are trained in this process.
+        train_fn (callable): train_fn(data, likelihoods, params, outfile) -> metrics
+            dict, as train_model(). Must be picklable for a process pool.
+
+    Returns:
+        pd.DataFrame: One row per grid entry, in grid order: 'key', the
+            TrainingParams fields, 'model_file', the metrics and 'reused'.
+
+    Raises:
+        RuntimeError: If any model failed to train. The manifest still records
+            the models that finished.
+    """
+    logger = logging.getLogger(__name__)
+    data, likelihoods = mofa_input[0], mofa_input[1]
+    grid = list(grid)
+    data_hash = data_fingerprint(data, likelihoods)
+    os.makedirs(model_dir, exist_ok=True)
+    manifest = read_manifest(model_dir)
+
+    keys = [model_key(data_hash, params) for params in grid]
+    pending = {}
+    for key, params in zip(keys, grid):
+        outfile = os.path.join(model_dir, key + MODEL_SUFFIX)
+        if key in manifest and os.path.exists(outfile):
+            continue
+        pending.setdefault(key, (params, outfile))
+    reused = set(keys) - set(pending)
+    logger.info(f"{len(grid)} model(s) requested: {len(reused)} on disk, {len(pending)} to train.")
+
+    def record(key, params, outfile, metrics):
+        manifest[key] = {
+            'params': params._asdict(),
+            'data_hash': data_hash,
+            'model_file': os.path.basename(outfile),
+            **metrics,
+        }
+        _write_manifest(model_dir, manifest)
+        logger.info(f"Trained model {key} ({params}) in {metrics['convergence_time']:.1f}s.")
+
+    failed = {}
+    if pending and max_workers == 1:
+        for key, (params, outfile) in pending.items():
+            try:
+                record(key, params, outfile, train_fn(data, likelihoods, params, outfile))
+            except Exception as e:
+                logger.error(f"Training model {key} ({params}) failed: {e}")
+                failed[key] = e
+    elif pending:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(data, likelihoods)) as pool:
+            futures = {
+                pool.submit(_train_in_worker, train_fn, params, outfile): key
+                for key, (params, outfile) in pending.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                params, outfile = pending[key]
+                try:
+                    record(key, params, outfile, future.result())
+                except Exception as e:
+                    logger.error(f"Training model {key} ({params}) failed: {e}")
+                    failed[key] = e
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(pending)} model(s) failed to train: {sorted(failed)}")
+
+    rows = []
+    for key, params in zip(keys, grid):
+        entry = manifest[key]
+        rows.append({
+            'key': key,
+            **params._asdict(),
+            'model_file': os.path.join(model_dir, entry['model_file']),
+            'convergence_time': entry.get('convergence_time'),
+            'n_iterations': entry.get('n_iterations'),
+            'elbo': entry.get('elbo'),
+            'r2': entry.get('r2'),
+            'reused': key in reused,
+        })
+    return pd.DataFrame(rows)
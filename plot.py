@@ -228,7 +228,7 @@ def plot_factor_weights_by_view(model, factor, n_features_per_view=5, figsize=(1
     grouped by the conceptual views defined in the project.
 
     Args:
-        model (mfx.mofa_model): The trained mofax model.
+        model (mfx.mofa_model or mofa_model_cache.CachedMofaModel): The trained mofax model.
         factor (str): The name of the factor to plot (e.g., "Factor1").
         n_features_per_view (int): The number of top features to show for each view.
         figsize (tuple): The figure size.
@@ -28,7 +28,10 @@ New schema:
 import pandas as pd
 import json
 import argparse
+import sys
 from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from mapping_notes import decode_notes, thaw
 
 def is_old_schema(notes_dict):
     """Check if a notes dictionary uses the old schema."""
@@ -85,14 +88,8 @@ def convert_to_new_schema(old_notes):
     return new_notes
 
 def parse_notes_safely(notes_str):
-    """Safely parse JSON from notes column."""
-    if pd.isna(notes_str) or not isinstance(notes_str, str) or not notes_str.strip():
-        return {}
-    
-    try:
-        return json.loads(notes_str.strip('"'))
-    except (json.JSONDecodeError, TypeError):
-        return {}
+    """Safely parse JSON from notes column (a mutable copy of the shared decoded view)."""
+    return thaw(decode_notes(notes_str).data)
 
 def main():
     parser = argparse.ArgumentParser(description="Convert Super_Experiment_Mapping_Notes from old schema to new schema")
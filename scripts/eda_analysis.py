@@ -84,17 +84,13 @@ def load_and_preprocess_data():
     """
     print("Loading and preprocessing data...")
 
-    # Load raw data
-    df_raw = pd.read_csv('../data/super_experiment_design_space.csv')
-    print(f"Loaded {len(df_raw)} experimental conditions from {len(df_raw.columns)} columns")
-
-    # Preprocess data using analysis_utils
-    df_features, numerical_cols, categorical_cols, df_processed, preprocessor = au.preprocess(
-        df_raw, merge_conflict_dimensions=True, target='pca'
+    # Load and preprocess data using analysis_utils (cached if PREPROCESS_CACHE_DIR is set)
+    df_features, numerical_cols, categorical_cols, df_processed, preprocessor = au.preprocess_csv(
+        '../data/super_experiment_design_space.csv', merge_conflict_dimensions=True, target='pca'
     )
+    print(f"Loaded {len(df_processed)} experimental conditions")
 
-    # Apply paradigm classification
-    df_processed['Paradigm'] = df_processed.apply(au.classify_paradigm, axis=1)
+    # df_processed already carries the 'Paradigm' column from preprocess()
 
     # Re-introduce NaNs for descriptive reporting where preprocess() used median fills.
     na_flag_map = {
@@ -1,10 +1,10 @@
 import pandas as pd
 import re
-import json
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 import analysis_utils as au
+from mapping_notes import decode_notes
 
 def find_paper(experiment_name):
     """
@@ -21,17 +21,10 @@ def get_block_id(row):
     If the column is empty or does not contain a 'block_id', it generates a unique ID
     based on the experiment and row index.
     """
-    notes_str = row.get('Super_Experiment_Mapping_Notes')
-    if pd.isna(notes_str) or not isinstance(notes_str, str):
-        return f"{row['Experiment']}_row_{row.name}"
-    try:
-        notes = json.loads(notes_str.strip('"'))
-        if 'block_id' in notes:
-            return notes['block_id']
-        else:
-            return f"{row['Experiment']}_row_{row.name}"
-    except (json.JSONDecodeError, TypeError):
-        return f"{row['Experiment']}_row_{row.name}"
+    notes = decode_notes(row.get('Super_Experiment_Mapping_Notes')).data
+    if 'block_id' in notes:
+        return notes['block_id']
+    return f"{row['Experiment']}_row_{row.name}"
 
 def get_most_frequent_paradigm(group):
     """
@@ -41,10 +34,9 @@ def get_most_frequent_paradigm(group):
 
 # --- Main Script ---
 
-df_raw = pd.read_csv('../data/super_experiment_design_space.csv')
-
-df_pca_features, numerical_cols, categorical_cols, df_processed, preprocessor = au.preprocess(df_raw, merge_conflict_dimensions=True)
-df_processed['Paradigm'] = df_processed.apply(au.classify_paradigm, axis=1)
+df_pca_features, numerical_cols, categorical_cols, df_processed, preprocessor = au.preprocess_csv(
+    '../data/super_experiment_design_space.csv', merge_conflict_dimensions=True
+)
 
 print("Distribution of paradigms across all conditions:")
 print(df_processed['Paradigm'].value_counts())
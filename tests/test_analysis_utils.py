@@ -1,7 +1,13 @@
 import pytest
+import os
+import tracemalloc
 import pandas as pd
 import numpy as np
 import logging
+from sklearn.decomposition import PCA
+from sklearn.exceptions import NotFittedError
+from sklearn.utils.validation import check_is_fitted
+import analysis_utils
 from analysis_utils import (
     preprocess,
     create_pca_pipeline,
@@ -13,9 +19,28 @@ from analysis_utils import (
     map_sr_congruency,
     classify_paradigm,
     generate_dynamic_view_mapping,
+    compile_feature_registry,
+    FEATURE_ENCODINGS,
     get_view_mapping_unified,
     reverse_map_categories,
     apply_conceptual_constraints,
+    DesignSpacePreprocessor,
+    copy_on_write,
+    preprocess_csv,
+    load_design_space_preprocessor,
+    preprocess_cache_key,
+    evict_preprocess_cache,
+    validate_and_log_warnings,
+    ValidationReport,
+    map_categories,
+    clean_via_uniques,
+    clean_rsi,
+    clean_switch_rate,
+    clean_yes_flag,
+    normalize_tristate_flag,
+    classify_paradigm_frame,
+    PARADIGM_CATEGORIES,
+    CATEGORY_MAPPINGS,
     VIEW_MAPPING_UNIFIED
 )
 
@@ -146,6 +171,91 @@ def test_data_validation_logging(caplog):
     caplog.clear()
 
 
+def _validation_frame():
+    return pd.DataFrame({
+        'Experiment': ['Single', 'PureSwitch', 'Dual', 'ITTR'],
+        'Task 2 Response Probability': [0.0, 0.0, 0.5, 1.0],
+        'Switch Rate': [0.0, 50.0, 0.0, 0.0],
+        'Task 2 Difficulty': [3.0, np.nan, np.nan, 2.0],
+        'Task 2 CSI': [np.nan, np.nan, np.nan, 0.0],
+        'Task 2 Stimulus-Response Mapping': ['N/A', 'N/A', 'N/A', 'Compatible'],
+        'Task 2 Cue Type': ['N/A', 'N/A', 'N/A', 'None/Implicit'],
+        'Trial Transition Type': ['Pure', 'Pure', 'Switch', 'Pure'],
+        'Inter-task SOA': [np.nan, np.nan, 100.0, 100.0],
+        'Distractor SOA': [np.nan, np.nan, np.nan, np.nan],
+        'Stimulus-Stimulus Congruency': ['N/A'] * 4,
+        'Stimulus-Response Congruency': ['N/A'] * 4,
+        'Task 1 Type': ['Color', 'Color', 'Color', 'Color'],
+        'Task 2 Type': ['N/A', 'N/A', 'Shape', 'Color'],
+        'Intra-Trial Task Relationship': ['N/A', 'N/A', 'Different', 'Different'],
+    }, index=[10, 11, 12, 13])
+
+
+def test_validation_report_counts_and_rows():
+    logger = logging.getLogger('test_validation_report')
+    report = validate_and_log_warnings(_validation_frame(), logger)
+
+    assert isinstance(report, ValidationReport)
+    assert report.counts['t2_difficulty_single_task'] == 1
+    assert report.counts['pure_with_switch_rate'] == 1
+    assert report.counts['switch_repeat_without_switch_rate'] == 1
+    assert report.counts['inter_task_soa_without_dual_task'] == 1
+    assert report.counts['ittr_mismatch'] == 1
+    assert report.counts['distractor_soa_without_conflict'] == 0
+    assert report.total == 5
+    assert list(report.row_indices('t2_difficulty_single_task')) == [10]
+    assert report.offending_experiments('ittr_mismatch') == ['ITTR']
+
+    summary = report.summary()
+    assert list(summary['Rule']) == [
+        't2_difficulty_single_task', 'pure_with_switch_rate', 'switch_repeat_without_switch_rate',
+        'inter_task_soa_without_dual_task', 'ittr_mismatch'
+    ]
+
+
+def test_validation_logs_in_row_order(caplog):
+    caplog.set_level(logging.WARNING)
+    validate_and_log_warnings(_validation_frame(), logging.getLogger('test_validation_order'))
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == [
+        "Warning: Task 2 Difficulty is present for a single-task condition in experiment Single.",
+        "Warning: Trial Transition is 'Pure' but Switch Rate is not 0% in experiment PureSwitch.",
+        "Warning: Trial Transition is 'Switch' or 'Repeat' but Switch Rate is 0% in experiment Dual.",
+        "Warning: Inter-task SOA has a value but T2RP is not 1 in experiment Dual.",
+        "Warning: Intra-Trial Task Relationship is 'Different' but Task 1 Type ('Color') and "
+        "Task 2 Type ('Color') suggest it should be 'Same' in experiment ITTR.",
+    ]
+
+
+def test_validation_summary_only(caplog):
+    caplog.set_level(logging.WARNING)
+    report = validate_and_log_warnings(_validation_frame(), logging.getLogger('test_validation_summary'),
+                                       summary_only=True)
+
+    assert len(caplog.records) == 1
+    assert "5 validation warning(s) in 4 rows" in caplog.text
+    assert "ittr_mismatch: 1" in caplog.text
+    assert report.total == 5
+
+
+def test_validation_without_experiment_column(caplog):
+    caplog.set_level(logging.WARNING)
+    df = _validation_frame().drop(columns='Experiment')
+    validate_and_log_warnings(df, logging.getLogger('test_validation_index'))
+    assert "in experiment index 10." in caplog.text
+
+
+def test_validation_without_switch_rate_column():
+    df = _validation_frame().drop(columns='Switch Rate')
+    report = validate_and_log_warnings(df, logging.getLogger('test_validation_no_switch_rate'))
+
+    # A missing Switch Rate counts as 0% in every rule.
+    assert report.counts['t2_difficulty_single_task'] == 1
+    assert report.counts['pure_with_switch_rate'] == 0
+    assert report.counts['switch_repeat_without_switch_rate'] == 1
+
+
 def test_preprocess_for_pca_with_real_data(real_raw_data):
     """
     Integration test for the PCA preprocessor using real data.
@@ -331,6 +441,50 @@ def test_generate_dynamic_view_mapping(raw_test_data_dict):
     assert len(ss_keys) == 0, f"SS keys should not be present in merged mode: {ss_keys}"
     assert len(sr_keys) == 0, f"SR keys should not be present in merged mode: {sr_keys}"
 
+def test_feature_registry_lookups():
+    registry = compile_feature_registry()
+
+    assert registry is compile_feature_registry(VIEW_MAPPING_UNIFIED)
+    spec = registry.get('Task 1 Cue Type Mapped')
+    assert spec is registry.get('Task 1 Cue Type')
+    assert (spec.name, spec.view, spec.encoding) == ('Task 1 Cue Type', 'Structure', 'ordinal')
+    assert spec.ordinal_codes['TCT_Arbitrary'] == 1.0
+    assert registry.view('SBC_Mapped') == 'Conflict'
+    assert registry.view('Inter-task SOA is NA') is None
+    assert compile_feature_registry(get_view_mapping_unified(binary_flags=True)).view('Inter-task SOA is NA') == 'Structure'
+    assert registry.columns('continuous') == [
+        'Task 2 Response Probability', 'Inter-task SOA', 'Distractor SOA', 'Task 1 CSI', 'Task 2 CSI',
+        'RSI', 'Switch Rate', 'Task 1 Difficulty', 'Task 2 Difficulty'
+    ]
+    # Every conceptual feature in the view mapping has an encoding
+    assert {f for features in VIEW_MAPPING_UNIFIED.values() for f in features} <= set(FEATURE_ENCODINGS)
+
+
+def test_feature_registry_source_prefers_longest_input():
+    registry = compile_feature_registry()
+    inputs = {'Inter-task SOA', 'Inter-task SOA is NA', 'Inter-task SOA is Predictable', 'SBC_Mapped',
+              'Response Set Overlap Mapped'}
+
+    assert registry.source('num__Inter-task SOA', inputs) == 'Inter-task SOA'
+    assert registry.source('cat__Inter-task SOA is NA_1', inputs) == 'Inter-task SOA is NA'
+    assert registry.source('cat__Inter-task SOA is Predictable_N/A', inputs) == 'Inter-task SOA is Predictable'
+    assert registry.source('cat__SBC_Mapped_N/A', inputs) == 'SBC_Mapped'
+    assert registry.source('cat__Response Set Overlap Mapped_RSO_NA', inputs) == 'Response Set Overlap Mapped'
+    assert registry.source('cat__Unknown_1', inputs) is None
+
+
+def test_generate_dynamic_view_mapping_binary_flags(raw_test_data_dict):
+    df_features, _, _, _, preprocessor = preprocess(pd.DataFrame(raw_test_data_dict))
+    preprocessor.fit(df_features)
+
+    view_map = generate_dynamic_view_mapping(preprocessor, get_view_mapping_unified(binary_flags=True))
+
+    assert view_map['num__Inter-task SOA'] == 'Temporal'
+    assert all(view_map[k] == 'Structure' for k in view_map if k.startswith('cat__Inter-task SOA is NA_'))
+    assert all(view_map[k] == 'Context' for k in view_map if k.startswith('cat__RSI is Predictable_'))
+    assert all(view_map[k] == 'Context' for k in view_map if k.startswith('cat__Inter-task SOA is Predictable_'))
+
+
 def test_pca_pipeline_and_inverse_transform(raw_test_data_dict):
     """
     Tests the full PCA pipeline: fitting, transforming, and inverse transforming.
@@ -468,3 +622,305 @@ def test_interpolation_and_reconstruction(raw_test_data_dict):
     # The inverse transform will pick the most likely category. We can't be too
     # strict here, but we can check that it's a valid category.
     assert reconstructed_params['Stimulus-Response Congruency Mapped'] in ['SR_Incongruent', 'SR_NA']
+
+
+def test_design_space_preprocessor_matches_preprocess():
+    df_raw = pd.read_csv("data/super_experiment_design_space.csv")
+    df_features, numerical_cols, categorical_cols, _, preprocessor = preprocess(df_raw)
+    expected = preprocessor.fit_transform(df_features)
+
+    fitted = DesignSpacePreprocessor().fit(df_raw)
+
+    assert fitted.numerical_cols_ == numerical_cols
+    assert fitted.categorical_cols_ == categorical_cols
+    np.testing.assert_allclose(fitted.transform(df_raw), expected)
+    np.testing.assert_allclose(DesignSpacePreprocessor().fit_transform(df_raw), expected)
+
+def test_design_space_preprocessor_transforms_new_rows_consistently(raw_test_data_dict):
+    df_raw = pd.DataFrame(raw_test_data_dict)
+    fitted = DesignSpacePreprocessor().fit(df_raw)
+    full = fitted.transform(df_raw)
+
+    # A single condition is scored exactly as it was within the fitted frame,
+    # with the fitted medians/means rather than its own statistics.
+    for position in range(len(df_raw)):
+        np.testing.assert_allclose(fitted.transform(df_raw.iloc[[position]]), full[[position]])
+
+    new_condition = df_raw.iloc[[0]].copy()
+    new_condition['Inter-task SOA'] = 'N/A'
+    new_condition['RSI'] = 'N/A'
+    df_features, _ = fitted.transform_frame(new_condition)
+    assert df_features['Inter-task SOA'].iloc[0] == fitted.statistics_['Inter-task SOA median'] == 200
+    assert df_features['RSI'].iloc[0] == fitted.statistics_['RSI median']
+
+    # Projection into a PCA fitted on the original features
+    pca = PCA().fit(full)
+    assert pca.transform(fitted.transform(new_condition)).shape == (1, pca.n_components_)
+
+def test_design_space_preprocessor_requires_fit(raw_test_data_dict):
+    with pytest.raises(NotFittedError):
+        DesignSpacePreprocessor().transform(pd.DataFrame(raw_test_data_dict))
+
+
+CATEGORY_EDGE_VALUES = [
+    'Congruent', 'Incongruent', 'Neutral', 'congruent', 'N/A', 'n/a', '', None, np.nan, 0, 1.5,
+    'Identical', 'Disjoint - Modality', 'Compatible', 'Incompatible', 'Arbitrary', 'None/Implicit',
+    'Pure', 'Switch', 'Repeat', 'Same', 'Different', 'SAME', ' same', 'Arbitrary (incompatible)',
+]
+
+@pytest.mark.parametrize("mapping_name", sorted(CATEGORY_MAPPINGS))
+def test_map_categories_matches_reference_functions(mapping_name):
+    """The table-driven mapper agrees with the map_* reference function on every value."""
+    reference = getattr(analysis_utils, f'map_{mapping_name}')
+    values = CATEGORY_EDGE_VALUES + pd.read_csv("data/super_experiment_design_space.csv").stack().tolist()
+    series = pd.Series(values, dtype=object, index=np.arange(1000, 1000 + len(values)))
+
+    mapped = map_categories(series, mapping_name)
+
+    pd.testing.assert_series_equal(mapped, series.apply(reference).astype(object))
+
+
+def test_classify_paradigm_frame_matches_rowwise(raw_test_data_dict):
+    _, _, _, df_real, _ = preprocess(pd.read_csv("data/super_experiment_design_space.csv"))
+    _, _, _, df_fixture, _ = preprocess(pd.DataFrame(raw_test_data_dict))
+    edge_cases = pd.DataFrame({
+        'Task 2 Response Probability': [np.nan, 0.0, 0.5, 0.0, 0.0],
+        'Switch Rate': [0, np.nan, 0, 10, 0],
+        'Stimulus-Stimulus Congruency': ['Neutral', 'N/A', 'N/A', 'N/A', np.nan],
+        'Stimulus-Response Congruency': [np.nan, np.nan, 'N/A', 'N/A', 'Congruent'],
+    }, index=[10, 20, 30, 40, 50])
+
+    for df in (df_real, df_fixture, edge_cases):
+        paradigms = classify_paradigm_frame(df)
+        assert isinstance(paradigms.dtype, pd.CategoricalDtype)
+        assert paradigms.cat.categories.tolist() == PARADIGM_CATEGORIES
+        assert paradigms.index.equals(df.index)
+        assert paradigms.astype(object).tolist() == df.apply(classify_paradigm, axis=1).tolist()
+
+def test_classify_paradigm_frame_without_congruency_columns():
+    df = pd.DataFrame({'Task 2 Response Probability': [0.0, 1.0], 'Switch Rate': [0, 0]})
+    assert classify_paradigm_frame(df).astype(object).tolist() == ['Single-Task', 'Dual-Task_PRP']
+
+
+def test_preprocess_paradigm_supports_eda_display_mapping():
+    _, _, _, df_processed, _ = preprocess(pd.read_csv("data/super_experiment_design_space.csv"),
+                                          merge_conflict_dimensions=True)
+    # Plain labels, so eda_analysis can map() and fillna() the column
+    assert df_processed['Paradigm'].dtype == object
+
+    pytest.importorskip('matplotlib')
+    pytest.importorskip('seaborn')
+    from scripts.eda_analysis import add_paradigm_display_column
+
+    df_display, order = add_paradigm_display_column(df_processed, include_baseline=True)
+    counts = df_display['Paradigm Display'].value_counts()
+    assert counts.sum() == len(df_processed)
+    assert set(counts.index) == set(order)
+
+@pytest.mark.parametrize('values, cleaner', [
+    (['500', 'Varied (choice: 200, 400)', 'Varied (Uniform: 100-300)', np.nan, 'Not Specified', '500'], clean_rsi),
+    (['50%', ' 25 % ', np.nan, 'bad', '50%'], clean_switch_rate),
+    (['Yes', 'no', 1.0, 0, np.nan, 'N/A', 'maybe', 'Yes'], normalize_tristate_flag),
+    (['Yes', 'YES', 'No', np.nan, 'N/A'], clean_yes_flag),
+])
+def test_clean_via_uniques_matches_apply(values, cleaner):
+    series = pd.Series(values, index=range(10, 10 + len(values)), name='col', dtype=object)
+    pd.testing.assert_series_equal(clean_via_uniques(series, cleaner), series.apply(cleaner))
+
+
+def test_clean_via_uniques_calls_cleaner_once_per_distinct_value():
+    calls = []
+
+    def cleaner(value):
+        calls.append(value)
+        return clean_switch_rate(value)
+
+    series = pd.Series(['50%', '0%', '50%', np.nan, '0%', np.nan] * 100)
+    cleaned, stats = clean_via_uniques(series, cleaner, return_stats=True)
+
+    assert len(calls) == 3
+    assert stats.n_rows == 600
+    assert stats.n_unique == 3
+    assert stats.hit_ratio == pytest.approx(1 - 3 / 600)
+    assert cleaned.iloc[0] == 50.0 and cleaned.iloc[3] == 0.0
+
+
+@pytest.fixture
+def raw_csv_path(tmp_path, real_raw_data):
+    path = tmp_path / 'design_space.csv'
+    real_raw_data.to_csv(path, index=False)
+    return path
+
+
+def test_preprocess_csv_without_cache_matches_preprocess(raw_csv_path, monkeypatch):
+    monkeypatch.delenv(analysis_utils.PREPROCESS_CACHE_ENV, raising=False)
+    expected = preprocess(pd.read_csv(raw_csv_path), merge_conflict_dimensions=True)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("nothing should be fitted without a cache")
+    monkeypatch.setattr(DesignSpacePreprocessor, '_fit_frame', fail)
+    result = preprocess_csv(raw_csv_path, merge_conflict_dimensions=True)
+
+    pd.testing.assert_frame_equal(result[0], expected[0])
+    pd.testing.assert_frame_equal(result[3], expected[3])
+    assert result[1:3] == expected[1:3]
+    with pytest.raises(NotFittedError):
+        check_is_fitted(result[4])
+
+
+def test_preprocess_csv_cache_hit(raw_csv_path, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    first = preprocess_csv(raw_csv_path, cache_dir=str(cache_dir))
+    assert len(list(cache_dir.iterdir())) == 1
+    expected = preprocess(pd.read_csv(raw_csv_path))[4].fit_transform(first[0])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("preprocess should not run on a cache hit")
+    monkeypatch.setattr(analysis_utils, 'preprocess', fail)
+    monkeypatch.setattr(analysis_utils, '_preprocess_frame', fail)
+    second = preprocess_csv(raw_csv_path, cache_dir=str(cache_dir))
+
+    pd.testing.assert_frame_equal(first[0], second[0])
+    pd.testing.assert_frame_equal(first[3], second[3])
+    assert second[4].transformers[0][2] == first[1]
+    # Unfitted, as from preprocess()
+    with pytest.raises(NotFittedError):
+        check_is_fitted(second[4])
+    np.testing.assert_allclose(second[4].fit_transform(second[0]), expected)
+
+
+def test_load_design_space_preprocessor_from_cache(raw_csv_path, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    df_raw = pd.read_csv(raw_csv_path)
+    preprocess_csv(raw_csv_path, merge_conflict_dimensions=True, cache_dir=str(cache_dir))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("no refit on a cache hit")
+    monkeypatch.setattr(DesignSpacePreprocessor, 'fit', fail)
+    monkeypatch.setattr(DesignSpacePreprocessor, '_fit_frame', fail)
+    fitted = load_design_space_preprocessor(raw_csv_path, merge_conflict_dimensions=True, cache_dir=str(cache_dir))
+    monkeypatch.undo()
+
+    assert len(list(cache_dir.iterdir())) == 1
+    reference = DesignSpacePreprocessor(merge_conflict_dimensions=True).fit(df_raw)
+    new_rows = df_raw.head(3)
+    np.testing.assert_allclose(fitted.transform(new_rows), reference.transform(new_rows))
+
+
+def test_preprocess_csv_cache_invalidation(raw_csv_path, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setenv(analysis_utils.PREPROCESS_CACHE_ENV, str(cache_dir))
+    preprocess_csv(raw_csv_path)
+    preprocess_csv(raw_csv_path, merge_conflict_dimensions=True)
+
+    df = pd.read_csv(raw_csv_path)
+    df.loc[0, 'RSI'] = 1234
+    df.to_csv(raw_csv_path, index=False)
+    result = preprocess_csv(raw_csv_path)
+
+    assert len(list(cache_dir.iterdir())) == 3
+    assert result[3].loc[0, 'RSI'] == 1234
+
+
+def test_preprocess_cache_key_depends_on_inputs():
+    key = preprocess_cache_key(b'a,b\n1,2\n')
+    assert key == preprocess_cache_key(b'a,b\n1,2\n')
+    assert key != preprocess_cache_key(b'a,b\n1,3\n')
+    assert key != preprocess_cache_key(b'a,b\n1,2\n', target='mofa')
+    assert key != preprocess_cache_key(b'a,b\n1,2\n', read_csv_kwargs={'keep_default_na': False})
+
+
+def test_evict_preprocess_cache_removes_oldest(tmp_path):
+    suffix = analysis_utils.PREPROCESS_CACHE_SUFFIX
+    for age, name in enumerate(['new', 'mid', 'old']):
+        path = tmp_path / (name + suffix)
+        path.write_bytes(b'x' * 100)
+        os.utime(path, (1000 - age, 1000 - age))
+    (tmp_path / 'other.txt').write_bytes(b'x' * 1000)
+
+    evicted = evict_preprocess_cache(str(tmp_path), max_bytes=150)
+
+    assert [os.path.basename(path) for path in evicted] == ['old' + suffix, 'mid' + suffix]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['new' + suffix, 'other.txt']
+
+
+def _build_pipeline_output(df_features, numerical_cols, categorical_cols):
+    transformer = analysis_utils._build_column_transformer(numerical_cols, categorical_cols).fit(df_features)
+    return pd.DataFrame(transformer.transform(df_features), columns=transformer.get_feature_names_out())
+
+
+def test_preprocess_compact_dtypes(real_raw_data, caplog):
+    caplog.set_level(logging.INFO, logger='analysis_utils')
+    df_features, numerical_cols, categorical_cols, df_processed, _ = preprocess(real_raw_data.copy())
+    compact_features, _, _, compact_processed, preprocessor = preprocess(real_raw_data.copy(), compact=True)
+
+    assert all(compact_features[col].dtype == np.float32 for col in numerical_cols)
+    assert compact_features['Inter-task SOA is NA'].dtype == np.int8
+    assert compact_features['RSI is Predictable'].dtype == np.int8
+    assert isinstance(compact_features['Trial Transition Type Mapped'].dtype, pd.CategoricalDtype)
+    assert compact_processed['Task 1 Difficulty Norm'].dtype == np.float32
+    assert isinstance(compact_processed['Trial Transition Type Mapped'].dtype, pd.CategoricalDtype)
+    assert "Compact dtypes for df_features" in caplog.text
+    pd.testing.assert_frame_equal(compact_features, df_features, check_dtype=False, check_categorical=False)
+
+    # The one-hot/scaler pipeline produces the same features and (up to float32 precision) values
+    expected = _build_pipeline_output(df_features, numerical_cols, categorical_cols)
+    preprocessor.fit(compact_features)
+    assert list(preprocessor.get_feature_names_out()) == list(expected.columns)
+    np.testing.assert_allclose(preprocessor.transform(compact_features), expected.to_numpy(), atol=1e-5)
+
+
+def test_copy_on_write_outputs_identical(real_raw_data):
+    raw = real_raw_data.copy()
+    expected = preprocess(raw, merge_conflict_dimensions=True)
+    expected_constrained = apply_conceptual_constraints(expected[3])
+    expected_reversed = reverse_map_categories(expected[3])
+
+    with copy_on_write():
+        result = preprocess(raw, merge_conflict_dimensions=True)
+        constrained = apply_conceptual_constraints(result[3])
+        reversed_df = reverse_map_categories(result[3])
+
+    pd.testing.assert_frame_equal(raw, real_raw_data)
+    pd.testing.assert_frame_equal(result[0], expected[0])
+    pd.testing.assert_frame_equal(result[3], expected[3])
+    pd.testing.assert_frame_equal(constrained, expected_constrained)
+    pd.testing.assert_frame_equal(reversed_df, expected_reversed)
+
+
+def _traced_peak(func):
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def test_copy_on_write_lowers_peak_memory():
+    """apply_conceptual_constraints() on 1M rows only duplicates the columns it rewrites."""
+    n_rows = 1_000_000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Task 2 Response Probability': rng.choice([0.0, 1.0], n_rows),
+        'Trial Transition Type': pd.Categorical(rng.choice(['Pure', 'Switch'], n_rows)),
+        'Response Set Overlap': pd.Categorical(rng.choice(['N/A', 'Identical'], n_rows)),
+        'Task 2 Difficulty is NA': rng.choice([0, 1], n_rows),
+        'Task 2 CSI is NA': rng.choice([0, 1], n_rows),
+        'Task 2 Stimulus-Response Mapping': pd.Categorical(rng.choice(['N/A', 'Compatible'], n_rows)),
+        'Task 2 Cue Type': pd.Categorical(rng.choice(['N/A', 'Arbitrary'], n_rows)),
+        'Inter-task SOA': rng.random(n_rows),
+        'Distractor SOA': rng.random(n_rows),
+        'RSI': rng.random(n_rows),
+        'Switch Rate': rng.random(n_rows),
+    })
+    original = df.copy()
+
+    expected, copy_peak = _traced_peak(lambda: apply_conceptual_constraints(df))
+    with copy_on_write():
+        result, cow_peak = _traced_peak(lambda: apply_conceptual_constraints(df))
+
+    assert result.equals(expected)
+    assert df.equals(original)
+    assert cow_peak < 0.75 * copy_peak
@@ -1,4 +1,7 @@
 
+import os
+import sys
+import subprocess
 import pytest
 import pandas as pd
 import logging
@@ -9,7 +12,26 @@ from convert import (
     difficulty_to_coherence,
     simplify_response_set_overlap,
     process_condition,
-    validate_block_configurations
+    validate_block_configurations,
+    resolve_conditions,
+    resolve_design_space,
+    resolve_design_space_stream,
+    resolve_design_space_incremental,
+    resolve_design_space_parallel,
+    to_typed_frame,
+    build_override_audit,
+    compile_overrides,
+    resolve_duration_arrays,
+    resolve_durations,
+    validate_overrides,
+    check_timeline_invariants,
+    TimelineInvariantChecker,
+    DURATION_PARAMS,
+    log_override_audit,
+    write_override_audit,
+    write_resolved_design_space,
+    load_resolved_design_space,
+    TIMING_KEYS
 )
 
 # Tests for parse_notes
@@ -504,6 +526,50 @@ def test_validate_block_configurations_malformed_json():
     assert result is True
 
 
+def test_validate_block_configurations_ignores_key_order(caplog):
+    """Configs are compared canonically, so reordered keys are not a conflict."""
+    df = pd.DataFrame({
+        'Experiment': ['Condition1', 'Condition2'],
+        'Super_Experiment_Mapping_Notes': [
+            '{"block_id": "test_block", "viewer_config": {"sequence_type": "AABB", "ITI_distribution": "fixed"}}',
+            '{"block_id": "test_block", "viewer_config": {"ITI_distribution": "fixed", "sequence_type": "AABB"}}'
+        ]
+    })
+
+    with caplog.at_level(logging.WARNING):
+        passed, conflicts = validate_block_configurations(df, return_conflicts=True)
+
+    assert passed is True
+    assert conflicts.empty
+    assert not [record for record in caplog.records if record.levelname == 'WARNING']
+
+def test_validate_block_configurations_conflict_table():
+    """The conflict table lists one row per inconsistent block."""
+    df = pd.DataFrame({
+        'Experiment': ['Bad_1', 'Good_1', 'Bad_2', 'Good_2', 'Bad_3', 'Bad_4'],
+        'Super_Experiment_Mapping_Notes': [
+            '{"block_id": "bad_block", "viewer_config": {"sequence_type": "AABB", "ITI_range": [100, 200]}}',
+            '{"block_id": "good_block", "viewer_config": {"sequence_type": "AABB"}}',
+            '{"block_id": "bad_block", "viewer_config": {"sequence_type": "ABAB", "ITI_range": [100, 200]}}',
+            '{"block_id": "good_block", "viewer_config": {"sequence_type": "AABB"}}',
+            '{"block_id": "bad_block"}',
+            '{"block_id": "bad_block", "viewer_config": {"sequence_type": "AABB", "ITI_range": [100, 300]}}',
+        ]
+    })
+
+    passed, conflicts = validate_block_configurations(df, return_conflicts=True)
+
+    assert passed is True
+    assert len(conflicts) == 1
+    conflict = conflicts.iloc[0]
+    assert conflict['Block_ID'] == 'bad_block'
+    assert conflict['Primary_Row'] == 2
+    assert conflict['Primary_Experiment'] == 'Bad_1'
+    assert conflict['Conflicting_Rows'] == [4, 7]
+    assert conflict['Conflicting_Experiments'] == ['Bad_2', 'Bad_4']
+    assert conflict['Differing_Keys'] == ['ITI_range', 'sequence_type']
+
+
 # Tests for CSI handling and timeline offset
 class TestCSIHandling:
     """Test suite for CSI handling to ensure positive CSI values produce non-negative timestamps."""
@@ -709,3 +775,412 @@ class TestCSIHandling:
         ]
         for key in timing_keys:
             assert result[key] >= 0, f"{key} should be non-negative"
+
+
+# Tests for the vectorized engine (resolve_conditions / resolve_design_space)
+def test_resolve_conditions_matches_process_condition_on_real_data():
+    """The vectorized engine must reproduce process_condition on the full design space."""
+    source_df = pd.read_csv("data/super_experiment_design_space.csv")
+
+    vectorized = resolve_design_space(source_df, engine='vectorized')
+    rowwise = resolve_design_space(source_df, engine='rowwise')
+
+    pd.testing.assert_frame_equal(vectorized, rowwise)
+
+def test_resolve_conditions_matches_process_condition_edge_cases():
+    """Covers overrides, N/A strings, negative SOAs, S-R-only conflict and missing notes."""
+    rows = [
+        TestCSIHandling().create_test_row(csi1=300, csi2=400, n_tasks=2, soa=200),
+        TestCSIHandling().create_test_row(csi1='N/A', csi2='N/A', n_tasks=2),
+        TestCSIHandling().create_test_row(csi1=600, n_tasks=1, soa=-100, notes_dict={
+            "block_id": "b1",
+            "convert_overrides": {"t1_stim_duration": 1500, "base_cue_go_duration": 3000},
+            "viewer_config": {"ITI_distribution": "uniform", "ITI_range": [800, 1600]}
+        }),
+        TestCSIHandling().create_test_row(csi1=0, n_tasks=1, soa=50, notes_dict={
+            "convert_overrides": {"base_stim_duration": 500, "t2_stim_duration": 250}
+        }),
+    ]
+    source_df = pd.DataFrame(rows).reset_index(drop=True)
+    source_df.loc[2, 'Stimulus-Stimulus Congruency'] = 'Incongruent'
+    source_df.loc[3, 'Stimulus-Stimulus Congruency'] = 'N/A'
+    source_df.loc[3, 'Stimulus-Response Congruency'] = 'Incongruent'
+    source_df.loc[1, 'Super_Experiment_Mapping_Notes'] = None
+
+    vectorized = resolve_conditions(source_df)
+    rowwise = pd.DataFrame([process_condition(row) for _, row in source_df.iterrows()])
+
+    pd.testing.assert_frame_equal(vectorized, rowwise)
+    assert vectorized.loc[3, 'Stimulus_Valency'] == 'Bivalent-Neutral'
+    assert vectorized.loc[2, 'effective_end_cue1'] - vectorized.loc[2, 'effective_start_cue1'] == 3000
+
+def test_resolve_conditions_does_not_log_overrides(caplog):
+    """Overrides are reported by build_override_audit, not logged per row."""
+    row = TestCSIHandling().create_test_row(notes_dict={"convert_overrides": {"t1_stim_duration": 800}})
+    with caplog.at_level(logging.INFO):
+        resolve_conditions(pd.DataFrame([row]))
+    assert "Overriding" not in caplog.text
+
+def test_resolve_design_space_invalid_engine():
+    with pytest.raises(ValueError, match="Unknown engine"):
+        resolve_design_space(pd.DataFrame(), engine='invalid')
+
+
+# Tests for streaming conversion
+def test_resolve_design_space_stream_matches_full_conversion(tmp_path):
+    """Chunked conversion must write exactly what the in-memory path writes."""
+    source_path = "data/super_experiment_design_space.csv"
+    full_path = tmp_path / "full.csv"
+    stream_path = tmp_path / "stream.csv"
+
+    resolve_design_space(pd.read_csv(source_path)).to_csv(full_path, index=False)
+    n_rows, head_df, validation_passed, override_audit = resolve_design_space_stream(source_path, stream_path, chunksize=37)
+
+    assert validation_passed is True
+    assert n_rows == len(pd.read_csv(source_path))
+    assert len(head_df) == 5
+    assert stream_path.read_bytes() == full_path.read_bytes()
+    assert not (tmp_path / "stream.csv.tmp").exists()
+    pd.testing.assert_frame_equal(override_audit, build_override_audit(pd.read_csv(source_path, dtype=str)))
+
+def test_block_validation_across_chunk_boundaries(tmp_path, caplog):
+    """A conflicting condition in a later chunk is still compared with the block's primary."""
+    rows = [TestCSIHandling().create_test_row() for _ in range(4)]
+    source_df = pd.DataFrame(rows).reset_index(drop=True)
+    source_df['Experiment'] = ['Primary', 'Filler_1', 'Filler_2', 'Conflicting']
+    source_df['Super_Experiment_Mapping_Notes'] = [
+        '{"block_id": "split_block", "viewer_config": {"sequence_type": "AABB"}}',
+        '{"block_id": "filler_1"}',
+        '{"block_id": "filler_2"}',
+        '{"block_id": "split_block", "viewer_config": {"sequence_type": "ABAB"}}',
+    ]
+    source_path = tmp_path / "source.csv"
+    source_df.to_csv(source_path, index=False)
+
+    with caplog.at_level(logging.WARNING):
+        resolve_design_space_stream(source_path, tmp_path / "out.csv", chunksize=2)
+
+    warning_messages = [record.message for record in caplog.records if record.levelname == 'WARNING']
+    assert len(warning_messages) == 1
+    assert 'Row 5' in warning_messages[0]
+    assert "Primary condition 'Primary' (row 2)" in warning_messages[0]
+
+
+# Tests for parallel conversion
+def test_resolve_design_space_parallel_matches_single_process():
+    """Partitions are reassembled in source order."""
+    source_df = pd.read_csv("data/super_experiment_design_space.csv")
+
+    expected = resolve_design_space(source_df)
+    parallel = resolve_design_space_parallel(source_df, jobs=3)
+
+    pd.testing.assert_frame_equal(parallel, expected.reset_index(drop=True))
+
+class InlineExecutor:
+    """Runs 'worker' calls in the test process, one after another."""
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+def test_resolve_design_space_parallel_with_executor():
+    """Partitions mapped over a supplied executor are concatenated in source order."""
+    source_df = pd.read_csv("data/super_experiment_design_space.csv").head(12)
+
+    parallel = resolve_design_space_parallel(source_df, jobs=3, executor=InlineExecutor())
+
+    pd.testing.assert_frame_equal(parallel, resolve_design_space(source_df))
+
+def test_resolve_design_space_stream_with_jobs(tmp_path):
+    source_path = "data/super_experiment_design_space.csv"
+    serial_path = tmp_path / "serial.csv"
+    parallel_path = tmp_path / "parallel.csv"
+
+    resolve_design_space_stream(source_path, serial_path, chunksize=150)
+    resolve_design_space_stream(source_path, parallel_path, chunksize=150, jobs=2)
+
+    assert parallel_path.read_bytes() == serial_path.read_bytes()
+
+
+# Tests for incremental conversion
+def _full_conversion_text(source_path):
+    return resolve_design_space(pd.read_csv(source_path, dtype=str)).to_csv(index=False)
+
+def test_resolve_design_space_incremental_reuses_unchanged_rows(tmp_path):
+    source_df = pd.read_csv("data/super_experiment_design_space.csv", dtype=str).head(40)
+    source_path = tmp_path / "source.csv"
+    output_path = tmp_path / "resolved.csv"
+    source_df.to_csv(source_path, index=False)
+
+    first = resolve_design_space_incremental(source_path, output_path)
+    assert first['full_rebuild'] is True
+    assert first['reason'] == "no usable manifest"
+    assert (tmp_path / "resolved.manifest.json").exists()
+    assert output_path.read_text() == _full_conversion_text(source_path)
+
+    second = resolve_design_space_incremental(source_path, output_path)
+    assert second['full_rebuild'] is False
+    assert (second['added'], second['changed'], second['removed']) == ([], [], [])
+    assert second['unchanged'] == 40
+
+    # Edit one row, delete one and append a new one
+    edited = source_df['Experiment'].iloc[3]
+    deleted = source_df['Experiment'].iloc[10]
+    source_df.loc[3, 'Inter-task SOA'] = '123' if source_df.loc[3, 'Inter-task SOA'] != '123' else '456'
+    source_df = pd.concat([source_df.drop(index=10), source_df.iloc[[0]].assign(Experiment='New Experiment')])
+    source_df.to_csv(source_path, index=False)
+
+    third = resolve_design_space_incremental(source_path, output_path)
+    assert third['full_rebuild'] is False
+    assert third['changed'] == [edited]
+    assert third['added'] == ['New Experiment']
+    assert third['removed'] == [deleted]
+    assert third['unchanged'] == 38
+    assert output_path.read_text() == _full_conversion_text(source_path)
+
+def test_resolve_design_space_incremental_rebuilds_modified_output(tmp_path):
+    source_path = tmp_path / "source.csv"
+    output_path = tmp_path / "resolved.csv"
+    pd.read_csv("data/super_experiment_design_space.csv", dtype=str).head(10).to_csv(source_path, index=False)
+
+    resolve_design_space_incremental(source_path, output_path)
+    output_path.write_text(output_path.read_text().replace('Univalent', 'Bivalent', 1))
+
+    report = resolve_design_space_incremental(source_path, output_path)
+    assert report['full_rebuild'] is True
+    assert report['reason'] == "resolved output missing or modified"
+    assert output_path.read_text() == _full_conversion_text(source_path)
+
+
+# Tests for typed columnar output
+def test_to_typed_frame_dtypes():
+    resolved_df = resolve_design_space(pd.read_csv("data/super_experiment_design_space.csv", dtype=str))
+    typed_df = to_typed_frame(resolved_df)
+
+    assert all(typed_df[col].dtype == 'int32' for col in TIMING_KEYS)
+    assert typed_df['coh_1'].dtype == 'float32'
+    assert typed_df['Switch_Rate_Percent'].dtype == 'int16'
+    for col in ['Task_1_Type', 'Task_2_Type', 'Stimulus_Valency', 'Simplified_RSO', 'Sequence_Type']:
+        assert isinstance(typed_df[col].dtype, pd.CategoricalDtype)
+    assert typed_df['Experiment'].tolist() == resolved_df['Experiment'].tolist()
+    assert (typed_df[TIMING_KEYS].astype('int64') == resolved_df[TIMING_KEYS]).all().all()
+    assert typed_df.memory_usage(deep=True).sum() < resolved_df.memory_usage(deep=True).sum()
+
+def test_to_typed_frame_rejects_timing_overflow():
+    resolved_df = resolve_design_space(pd.DataFrame([TestCSIHandling().create_test_row()]))
+    resolved_df['effective_end_go1'] = 2**31
+    with pytest.raises(ValueError, match="effective_end_go1"):
+        to_typed_frame(resolved_df)
+
+def test_load_resolved_design_space_csv(tmp_path):
+    resolved_df = resolve_design_space(pd.read_csv("data/super_experiment_design_space.csv"))
+    output_path = tmp_path / "resolved.csv"
+    write_resolved_design_space(resolved_df, output_path)
+
+    loaded_df = load_resolved_design_space(output_path)
+    expected_df = to_typed_frame(resolved_df)
+    assert (loaded_df.dtypes.astype(str) == expected_df.dtypes.astype(str)).all()
+    pd.testing.assert_frame_equal(loaded_df[TIMING_KEYS], expected_df[TIMING_KEYS])
+    # 'N/A' labels survive the CSV round trip
+    assert 'N/A' in loaded_df['Stimulus Bivalence & Congruency'].cat.categories
+
+@pytest.mark.parametrize("extension", ["feather", "parquet"])
+def test_columnar_round_trip(tmp_path, extension):
+    pytest.importorskip("pyarrow")
+    resolved_df = resolve_design_space(pd.read_csv("data/super_experiment_design_space.csv"))
+    output_path = tmp_path / f"resolved.{extension}"
+    write_resolved_design_space(resolved_df, output_path)
+
+    pd.testing.assert_frame_equal(load_resolved_design_space(output_path), to_typed_frame(resolved_df))
+
+def test_write_resolved_design_space_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported output format"):
+        write_resolved_design_space(pd.DataFrame(), tmp_path / "resolved.xlsx")
+
+
+# Tests for the override audit
+def test_build_override_audit():
+    rows = [
+        TestCSIHandling().create_test_row(notes_dict={"convert_overrides": {"t2_stim_duration": 500, "base_stim_duration": 1000}}),
+        TestCSIHandling().create_test_row(),
+        TestCSIHandling().create_test_row(notes_dict={"convert_overrides": {"t2_stim_duration": 500, "base_stim_duration": 1000}}),
+    ]
+    source_df = pd.DataFrame(rows).reset_index(drop=True)
+    source_df['Experiment'] = ['Exp A', 'Exp B', 'Exp C']
+
+    audit = build_override_audit(source_df)
+
+    assert audit.columns.tolist() == ['Row', 'Experiment', 'Parameter', 'Default', 'Override']
+    assert audit.values.tolist() == [
+        [2, 'Exp A', 'base_stim_duration', 2000, 1000],
+        [2, 'Exp A', 't2_stim_duration', 1000, 500],
+        [4, 'Exp C', 'base_stim_duration', 2000, 1000],
+        [4, 'Exp C', 't2_stim_duration', 1000, 500],
+    ]
+
+def test_build_override_audit_no_overrides():
+    audit = build_override_audit(pd.DataFrame([TestCSIHandling().create_test_row()]))
+    assert audit.empty
+    assert audit.columns.tolist() == ['Row', 'Experiment', 'Parameter', 'Default', 'Override']
+
+def test_log_override_audit_summary(caplog):
+    source_df = pd.read_csv("data/super_experiment_design_space.csv")
+    audit = build_override_audit(source_df)
+
+    with caplog.at_level(logging.INFO, logger='convert'):
+        log_override_audit(audit)
+    assert len(caplog.records) == 1
+    assert f"Applied {len(audit)} parameter override(s)" in caplog.text
+
+    caplog.clear()
+    with caplog.at_level(logging.DEBUG, logger='convert'):
+        log_override_audit(audit)
+    assert len(caplog.records) == len(audit) + 1
+    assert "Experiment 'Telford 1931 Auditory RT': Overriding 't1_stim_duration'. Default: 2000, New: 300" in caplog.text
+
+@pytest.mark.parametrize("extension", ["csv", "json"])
+def test_write_override_audit(tmp_path, extension):
+    audit = build_override_audit(pd.read_csv("data/super_experiment_design_space.csv"))
+    path = tmp_path / f"audit.{extension}"
+    write_override_audit(audit, path)
+
+    loaded = pd.read_csv(path) if extension == "csv" else pd.read_json(path, orient='records')
+    assert loaded[['Experiment', 'Parameter']].values.tolist() == audit[['Experiment', 'Parameter']].values.tolist()
+
+
+# Tests for the compiled override resolver
+def _override_rows(*overrides):
+    rows = [TestCSIHandling().create_test_row(notes_dict={"convert_overrides": o} if o else None) for o in overrides]
+    source_df = pd.DataFrame(rows).reset_index(drop=True)
+    source_df['Experiment'] = [f'Exp {i}' for i in range(len(source_df))]
+    return source_df
+
+def test_resolve_duration_arrays_matches_resolve_durations():
+    source_df = _override_rows(
+        {"base_stim_duration": 500},
+        None,
+        {"base_cue_go_duration": 1500, "t2_cue_go_duration": 700},
+        {"t1_stim_duration": 300, "t2_stim_duration": 5000, "t1_cue_go_duration": 4000},
+        {"base_stim_duration": 800, "t1_stim_duration": 0},
+    )
+    compiled = compile_overrides(source_df)
+    durations = resolve_duration_arrays(compiled)
+
+    assert compiled.issues.empty
+    assert compiled.mask['base_stim_duration'].tolist() == [True, False, False, False, True]
+    for pos, notes_str in enumerate(source_df['Super_Experiment_Mapping_Notes']):
+        expected, _ = resolve_durations(parse_notes(notes_str))
+        assert {param: durations[param][pos] for param in DURATION_PARAMS} == expected
+
+@pytest.mark.parametrize("value,problem", [
+    ("300", "must be an integer"),
+    (300.5, "must be an integer"),
+    (True, "must be an integer"),
+    (-10, "must be between"),
+    (10**9, "must be between"),
+])
+def test_compile_overrides_rejects_invalid_values(value, problem):
+    source_df = _override_rows({"t1_stim_duration": 300}, {"t2_stim_duration": value})
+
+    with pytest.raises(ValueError, match="1 invalid duration override"):
+        compile_overrides(source_df)
+    with pytest.raises(ValueError, match="row 3"):
+        resolve_conditions(source_df)
+    # The rowwise engine accepts the same inputs as the vectorized one
+    with pytest.raises(ValueError, match="row 3"):
+        resolve_design_space(source_df, engine='rowwise')
+
+    issues = compile_overrides(source_df, strict=False).issues
+    assert issues[['Row', 'Experiment', 'Parameter', 'Severity']].values.tolist() == [[3, 'Exp 1', 't2_stim_duration', 'error']]
+    assert problem in issues['Problem'].iloc[0]
+
+def test_validate_overrides(caplog):
+    source_df = _override_rows({"t1_stim_durration": 300}, {"t1_stim_duration": 300})
+    with caplog.at_level(logging.WARNING, logger='convert'):
+        assert validate_overrides(source_df) is True
+    assert "Row 2: Experiment 'Exp 0': override 't1_stim_durration' = 300 unknown override parameter." in caplog.text
+
+    source_df = _override_rows({"t1_stim_duration": -1})
+    with caplog.at_level(logging.WARNING, logger='convert'):
+        assert validate_overrides(source_df) is False
+    assert "Override validation failed" in caplog.text
+
+
+def _write_source_with_invalid_override(path, n_rows=20, row=5):
+    source_df = pd.read_csv("data/super_experiment_design_space.csv", dtype=str).head(n_rows)
+    source_df.loc[row, 'Super_Experiment_Mapping_Notes'] = json.dumps({"convert_overrides": {"t1_stim_duration": 300.5}})
+    source_df.to_csv(path, index=False)
+
+def test_stream_and_incremental_reject_invalid_overrides(tmp_path, caplog):
+    source_path = tmp_path / "source.csv"
+    _write_source_with_invalid_override(source_path)
+
+    with caplog.at_level(logging.WARNING, logger='convert'):
+        _, _, validation_passed, _ = resolve_design_space_stream(source_path, tmp_path / "stream.csv", chunksize=8)
+    assert validation_passed is False
+    assert not (tmp_path / "stream.csv").exists()
+    assert "Row 7:" in caplog.text
+
+    report = resolve_design_space_incremental(source_path, tmp_path / "incremental.csv")
+    assert report['validation_passed'] is False
+    assert not (tmp_path / "incremental.csv").exists()
+
+@pytest.mark.parametrize("mode", [[], ["--stream"], ["--incremental"], ["--engine", "rowwise"]])
+def test_main_exits_nonzero_on_invalid_overrides(tmp_path, mode):
+    (tmp_path / "data").mkdir()
+    _write_source_with_invalid_override(tmp_path / "data" / "super_experiment_design_space.csv")
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    result = subprocess.run([sys.executable, os.path.join(repo, "convert.py"), *mode], cwd=tmp_path,
+                            env={**os.environ, "PYTHONPATH": repo}, capture_output=True, text=True)
+
+    assert result.returncode == 1
+    assert not (tmp_path / "data" / "resolved_design_space.csv").exists()
+
+
+# Tests for the timeline invariant checker
+def test_check_timeline_invariants_on_real_data():
+    source_df = pd.read_csv("data/super_experiment_design_space.csv")
+    passed, report = check_timeline_invariants(resolve_design_space(source_df), source_df)
+
+    violations = dict(zip(report['Invariant'], report['Violations']))
+    # Negative inter-task SOAs put T2 before the trial start; everything else is consistent
+    assert passed is False
+    assert violations == {
+        'non_negative': 6, 'end_after_start': 0, 'go_matches_cue': 0,
+        'cue_precedes_stim_by_csi': 0, 'onset_follows_soa': 0,
+    }
+    assert report.loc[0, 'Example_Rows'][0] == 296
+
+@pytest.mark.parametrize("column,value,invariant", [
+    ('effective_start_cue1', -5, 'non_negative'),
+    ('effective_end_stim1_mov', 0, 'end_after_start'),
+    ('effective_end_go1', 1, 'go_matches_cue'),
+    ('effective_start_cue1', 1, 'cue_precedes_stim_by_csi'),
+    ('effective_start_stim2_or', 1234, 'onset_follows_soa'),
+])
+def test_check_timeline_invariants_detects_violations(column, value, invariant, caplog):
+    source_df = pd.DataFrame([
+        TestCSIHandling().create_test_row(csi1=200, csi2=100, soa=300, n_tasks=2),
+        TestCSIHandling().create_test_row(soa=50, n_tasks=2),
+    ]).reset_index(drop=True)
+    source_df['Experiment'] = ['Tampered', 'Untouched']
+    resolved_df = resolve_design_space(source_df)
+    assert check_timeline_invariants(resolved_df, source_df)[0] is True
+
+    resolved_df.loc[0, column] = value
+    with caplog.at_level(logging.WARNING, logger='convert'):
+        passed, report = check_timeline_invariants(resolved_df, source_df)
+
+    failed = report[report['Violations'] > 0]
+    assert passed is False
+    assert invariant in failed['Invariant'].tolist()
+    assert failed['Example_Experiments'].tolist()[0] == ['Tampered']
+    assert f"Timeline check '{invariant}' failed for 1 condition(s)" in caplog.text
+
+def test_timeline_checker_across_stream_chunks(tmp_path):
+    source_path = "data/super_experiment_design_space.csv"
+    checker = TimelineInvariantChecker()
+    resolve_design_space_stream(source_path, tmp_path / "out.csv", chunksize=50, timeline_checker=checker)
+
+    source_df = pd.read_csv(source_path)
+    _, expected = check_timeline_invariants(resolve_design_space(source_df), source_df)
+    pd.testing.assert_frame_equal(checker.report(), expected)
@@ -0,0 +1,60 @@
+# tests/test_mapping_notes.py
+
+import json
+import pytest
+import pandas as pd
+from mapping_notes import (
+    decode_notes,
+    thaw,
+    notes_cache_info,
+    clear_notes_cache,
+    EMPTY_NOTES
+)
+from convert import parse_notes
+
+NOTES = json.dumps({
+    "block_id": "block_a",
+    "description": "A test block",
+    "convert_overrides": {"t1_stim_duration": 300},
+    "viewer_config": {"SOA_distribution": "choice", "SOA_values": [100, 200]}
+})
+
+def test_decode_notes_exposes_views():
+    notes = decode_notes(NOTES)
+    assert notes.block_id == 'block_a'
+    assert notes.description == 'A test block'
+    assert notes.convert_overrides['t1_stim_duration'] == 300
+    assert notes.viewer_config['SOA_values'] == (100, 200)
+    assert thaw(notes.data) == json.loads(NOTES)
+
+def test_decode_notes_defaults_for_missing_fields():
+    notes = decode_notes('{"description": "only a description"}')
+    assert notes.block_id == ''
+    assert dict(notes.convert_overrides) == {}
+    assert dict(notes.viewer_config) == {}
+
+@pytest.mark.parametrize("value", [None, pd.NA, float('nan'), '', 'plain text note', '[1, 2]'])
+def test_decode_notes_invalid_inputs_are_empty(value):
+    assert decode_notes(value) is EMPTY_NOTES
+
+def test_decode_notes_views_are_immutable():
+    notes = decode_notes(NOTES)
+    with pytest.raises(TypeError):
+        notes.viewer_config['sequence_type'] = 'AABB'
+    with pytest.raises(TypeError):
+        notes.data['block_id'] = 'other'
+
+def test_decode_notes_is_memoized_on_raw_string():
+    clear_notes_cache()
+    first = decode_notes(NOTES)
+    for _ in range(10):
+        assert decode_notes(NOTES) is first
+    info = notes_cache_info()
+    assert info.misses == 1
+    assert info.hits == 10
+
+def test_parse_notes_returns_mutable_copy():
+    notes = parse_notes(NOTES)
+    notes['viewer_config']['SOA_values'].append(300)
+    # The cached view is unaffected
+    assert decode_notes(NOTES).viewer_config['SOA_values'] == (100, 200)
@@ -0,0 +1,122 @@
+# tests/test_mofa_model_cache.py
+
+import pytest
+import pandas as pd
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+from mofa_model_cache import CachedMofaModel
+from analysis_utils import reconstruct_from_mofa_factors
+
+FACTORS = ['Factor1', 'Factor2', 'Factor3']
+WEIGHTS = {
+    'Conflict': pd.DataFrame([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], index=['SBC_Mapped', 'Response Set Overlap Mapped'],
+                             columns=FACTORS),
+    'Temporal': pd.DataFrame([[1.0, 0.0, -1.0]], index=['RSI'], columns=FACTORS),
+}
+FACTOR_SCORES = pd.DataFrame(np.arange(12, dtype=float).reshape(4, 3), index=['e1', 'e2', 'e3', 'e4'], columns=FACTORS)
+R2 = pd.DataFrame({
+    'Factor': ['Factor1', 'Factor2', 'Factor1', 'Factor2'],
+    'View': ['Conflict', 'Conflict', 'Temporal', 'Temporal'],
+    'Group': ['all_studies'] * 4,
+    'R2': [10.0, 5.0, 20.0, 1.0],
+})
+
+
+class FakeMofaModel:
+    """Minimal stand-in for mofax.mofa_model that counts file opens and reads."""
+    log = []
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.views = list(WEIGHTS)
+        self.groups = ['all_studies']
+        self.features_metadata = pd.DataFrame(
+            {'view': [view for view, weights in WEIGHTS.items() for _ in weights.index]},
+            index=[feature for weights in WEIGHTS.values() for feature in weights.index])
+        self.closed = False
+        FakeMofaModel.log.append('open')
+
+    def get_weights(self, views=None, factors=None, df=False):
+        assert not self.closed
+        FakeMofaModel.log.append(('weights', views))
+        views = [views] if isinstance(views, str) else (views or self.views)
+        return pd.concat([WEIGHTS[view] for view in views])
+
+    def get_factors(self, groups=None, factors=None, df=False):
+        FakeMofaModel.log.append(('factors', groups))
+        return FACTOR_SCORES.copy()
+
+    def get_variance_explained(self):
+        FakeMofaModel.log.append('r2')
+        return R2.copy()
+
+    def close(self):
+        self.closed = True
+        FakeMofaModel.log.append('close')
+
+
+@pytest.fixture
+def model():
+    FakeMofaModel.log = []
+    return CachedMofaModel('model.hdf5', open_model=FakeMofaModel)
+
+
+def test_reads_lazily_and_closes_the_file(model):
+    assert FakeMofaModel.log == []
+
+    conflict = model.get_weights(views='Conflict')
+    np.testing.assert_array_equal(conflict, WEIGHTS['Conflict'].to_numpy())
+    assert ('weights', 'Temporal') not in FakeMofaModel.log
+    assert FakeMofaModel.log.count('open') == FakeMofaModel.log.count('close')
+
+    model.get_weights(views='Conflict', factors='Factor2')
+    model.get_weights(views='Conflict', df=True)
+    assert FakeMofaModel.log.count(('weights', 'Conflict')) == 1
+
+
+def test_get_weights_matches_mofax_layout(model):
+    expected = pd.concat(WEIGHTS.values())
+
+    pd.testing.assert_frame_equal(model.get_weights(df=True), expected)
+    pd.testing.assert_frame_equal(model.get_weights(factors='Factor2', df=True), expected[['Factor2']])
+    np.testing.assert_array_equal(model.get_weights(factors=[2, 0]), expected[['Factor3', 'Factor1']].to_numpy())
+
+    values, features = model.weight_matrix()
+    assert list(features) == list(expected.index)
+    assert not values.flags.writeable
+    assert model.weight_matrix()[0] is values
+    assert model.nfactors == 3
+    assert model.shape == (4, 3)
+
+
+def test_factors_and_variance_explained_are_read_once(model):
+    pd.testing.assert_frame_equal(model.get_factors(df=True), FACTOR_SCORES)
+    np.testing.assert_array_equal(model.get_factors(factors='Factor3'), FACTOR_SCORES[['Factor3']].to_numpy())
+
+    r2 = model.get_variance_explained(views='Temporal')
+    assert list(r2['R2']) == [20.0, 1.0]
+    assert list(model.get_variance_explained(factors=0)['View']) == ['Conflict', 'Temporal']
+    pd.testing.assert_frame_equal(model.get_variance_explained(), R2)
+    assert FakeMofaModel.log.count('r2') == 1
+    assert FakeMofaModel.log.count(('factors', 'all_studies')) == 1
+
+    model.clear()
+    model.get_variance_explained()
+    assert FakeMofaModel.log.count('r2') == 2
+
+
+def test_reconstruct_from_mofa_factors_uses_cached_weights(model):
+    """
+    Tests that reconstruction through the cache matches the plain mofax path and
+    reads the weights once over repeated calls.
+    """
+    scaler = StandardScaler().fit(np.array([[0.0], [10.0]]))
+    scores = FACTOR_SCORES.iloc[:2]
+
+    first = reconstruct_from_mofa_factors(scores, model, scaler)
+    for _ in range(3):
+        pd.testing.assert_frame_equal(reconstruct_from_mofa_factors(scores, model, scaler), first)
+
+    plain = reconstruct_from_mofa_factors(scores, FakeMofaModel('model.hdf5'), scaler)
+    pd.testing.assert_frame_equal(first, plain)
+    assert FakeMofaModel.log.count(('weights', 'Conflict')) == 1
@@ -6,7 +6,11 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.compose import ColumnTransformer
 from unittest.mock import Mock, MagicMock
-from analysis_utils import prepare_mofa_data, reconstruct_from_mofa_factors, InvertibleColumnTransformer
+from mofa_model_cache import CachedMofaModel
+from analysis_utils import (
+    prepare_mofa_data, reconstruct_from_mofa_factors, InvertibleColumnTransformer, copy_on_write,
+    MofaMatrices, mofa_long_frame, ORDINAL_CODEBOOK, FEATURE_ENCODINGS, ORDINAL_LABEL_ALIASES
+)
 
 def test_prepare_mofa_data_sparse_strategy(raw_test_data_dict):
     """
@@ -254,6 +258,38 @@ def test_reconstruction_dense_strategy(raw_test_data_dict):
     # This tests the isinstance check in reconstruct_from_mofa_factors
     assert isinstance(preprocessor, ColumnTransformer), "Should pass ColumnTransformer check"
 
+@pytest.mark.parametrize('cached', [False, True])
+def test_reconstruct_from_mofa_factors_dense_strategy(raw_test_data_dict, cached):
+    """
+    Tests dense reconstruction end to end, with weights in a different feature
+    order than the preprocessor's, for a mofax model and a CachedMofaModel.
+    """
+    df_raw = pd.DataFrame(raw_test_data_dict)
+    _, _, preprocessor, _ = prepare_mofa_data(df_raw, strategy='dense')
+    features = preprocessor.get_feature_names_out()
+    rng = np.random.default_rng(0)
+    weights = pd.DataFrame(rng.normal(size=(len(features), 2)), index=features, columns=['Factor1', 'Factor2'])
+    shuffled = weights.iloc[::-1]
+
+    mock_model = Mock()
+    mock_model.get_weights.return_value = shuffled
+    mock_model.views = ['all']
+    mock_model.groups = ['all_studies']
+    mock_model.features_metadata = pd.DataFrame({'view': 'all'}, index=shuffled.index)
+    model = CachedMofaModel('model.hdf5', open_model=lambda path: mock_model) if cached else mock_model
+    factor_scores = pd.DataFrame(rng.normal(size=(2, 2)), columns=['Factor1', 'Factor2'], index=['a', 'b'])
+
+    reconstructed = reconstruct_from_mofa_factors(factor_scores, model, preprocessor)
+
+    expected = preprocessor.inverse_transform(
+        pd.DataFrame(factor_scores.to_numpy() @ weights.to_numpy().T, columns=features))
+    assert reconstructed.shape == (2, len(preprocessor.feature_names_in_))
+    assert list(reconstructed.columns) == list(preprocessor.feature_names_in_)
+    assert list(reconstructed.index) == ['a', 'b']
+    pd.testing.assert_frame_equal(
+        reconstructed.reset_index(drop=True),
+        pd.DataFrame(expected, columns=preprocessor.feature_names_in_), check_dtype=False)
+
 def test_reconstruction_invalid_preprocessor():
     """
     Tests that reconstruction raises error for invalid preprocessor type.
@@ -299,4 +335,189 @@ def test_reconstruction_series_input(raw_test_data_dict):
     # Should handle Series input and return DataFrame
     assert isinstance(reconstructed, pd.DataFrame), "Should convert Series to DataFrame and return DataFrame"
     assert len(reconstructed) == 1, "Should have one row for single sample"
-    assert reconstructed.index[0] == 'Test_Sample', "Should preserve sample name from Series"
\ No newline at end of file
+    assert reconstructed.index[0] == 'Test_Sample', "Should preserve sample name from Series"
+
+
+@pytest.mark.parametrize('strategy', ['sparse', 'dense'])
+def test_prepare_mofa_data_compact(raw_test_data_dict, strategy):
+    """
+    Tests that compact=True only changes the dtypes of the long-format frame.
+    """
+    df_raw = pd.DataFrame(raw_test_data_dict)
+
+    df_long, _, _, view_map = prepare_mofa_data(df_raw, strategy=strategy)
+    df_compact, _, _, compact_view_map = prepare_mofa_data(df_raw, strategy=strategy, compact=True)
+
+    assert df_compact['value'].dtype == np.float32
+    for col in ['sample', 'feature', 'view', 'group']:
+        assert isinstance(df_compact[col].dtype, pd.CategoricalDtype)
+    assert compact_view_map == view_map
+    pd.testing.assert_frame_equal(df_compact, df_long, check_dtype=False, check_categorical=False, atol=1e-6)
+    assert df_compact.memory_usage(deep=True).sum() < df_long.memory_usage(deep=True).sum()
+
+
+@pytest.mark.parametrize('strategy', ['sparse', 'dense'])
+def test_prepare_mofa_data_copy_on_write(raw_test_data_dict, strategy):
+    """
+    Tests that the copy-on-write mode returns the same data and leaves the input untouched.
+    """
+    df_raw = pd.DataFrame(raw_test_data_dict)
+    original = df_raw.copy()
+
+    df_long, _, _, view_map = prepare_mofa_data(df_raw, strategy=strategy)
+    with copy_on_write():
+        df_long_cow, _, _, view_map_cow = prepare_mofa_data(df_raw, strategy=strategy)
+
+    pd.testing.assert_frame_equal(df_long_cow, df_long)
+    pd.testing.assert_frame_equal(df_raw, original)
+    assert view_map_cow == view_map
+
+def test_reconstruction_snaps_mapped_ordinal_features(raw_test_data_dict):
+    """
+    Tests that sparse reconstruction snaps ordinal features to their codes, whether they
+    are named by concept or by mapped column.
+    """
+    df_raw = pd.DataFrame(raw_test_data_dict)
+    df_long, _, scaler, _ = prepare_mofa_data(df_raw, strategy='sparse')
+
+    features = df_long['feature'].unique()
+    mock_model = Mock()
+    mock_model.get_weights.return_value = pd.DataFrame(
+        np.random.default_rng(0).normal(size=(len(features), 2)), index=features, columns=['Factor1', 'Factor2']
+    )
+    factor_scores = pd.DataFrame(np.random.default_rng(1).normal(size=(4, 2)), columns=['Factor1', 'Factor2'])
+
+    reconstructed = reconstruct_from_mofa_factors(factor_scores, mock_model, scaler)
+
+    assert set(reconstructed['Trial Transition Type Mapped']) <= {-0.5, 0.0, 0.5}
+    assert set(reconstructed['Task 1 Stimulus-Response Mapping Mapped']) <= {-1.0, 0.0, 1.0}
+
+
+@pytest.mark.parametrize('strategy', ['sparse', 'dense'])
+def test_prepare_mofa_data_matrices_layout(raw_test_data_dict, strategy):
+    """
+    Tests that layout='matrices' holds exactly the observed entries of the long format.
+    """
+    df_raw = pd.DataFrame(raw_test_data_dict)
+
+    df_long, likelihoods, _, view_map = prepare_mofa_data(df_raw, strategy=strategy)
+    matrices, matrix_likelihoods, _, matrix_view_map = prepare_mofa_data(df_raw, strategy=strategy, layout='matrices')
+
+    assert isinstance(matrices, MofaMatrices)
+    assert matrix_likelihoods == likelihoods
+    assert matrix_view_map == view_map
+    assert matrices.views_names == sorted(df_long['view'].unique())
+    assert matrices.groups_names == ['all_studies']
+    assert matrices.samples_names == [list(df_raw['Experiment'])]
+    assert set(matrices._asdict()) == {'data', 'views_names', 'groups_names', 'samples_names', 'features_names'}
+
+    observed = df_long.dropna(subset=['value'])
+    for view, view_data, features in zip(matrices.views_names, matrices.data, matrices.features_names):
+        assert len(view_data) == 1
+        values = view_data[0]
+        assert values.shape == (len(df_raw), len(features))
+        expected = observed[observed['view'] == view].pivot(index='sample', columns='feature', values='value')
+        expected = expected.reindex(index=df_raw['Experiment'], columns=features)
+        # NaN marks the entries the long format leaves out
+        np.testing.assert_array_equal(values, expected.to_numpy())
+
+
+def test_prepare_mofa_data_invalid_layout(raw_test_data_dict):
+    with pytest.raises(ValueError, match="Unknown layout"):
+        prepare_mofa_data(pd.DataFrame(raw_test_data_dict), layout='wide')
+
+
+def test_ordinal_codebook_round_trip():
+    """
+    Tests that decode(encode(labels)) returns every mapped label, and that N/A,
+    NaN and unknown labels encode to NaN.
+    """
+    columns = [column for column, encoding, _ in FEATURE_ENCODINGS.values() if encoding == 'ordinal']
+    labels = {column: list(FEATURE_ENCODINGS[name][2]) for name, (column, encoding, _) in FEATURE_ENCODINGS.items()
+              if encoding == 'ordinal'}
+    n_rows = max(len(values) for values in labels.values()) + 2
+    df = pd.DataFrame({
+        column: (values + ['N/A', np.nan] * n_rows)[:n_rows] for column, values in labels.items()
+    })
+
+    encoded = ORDINAL_CODEBOOK.encode(df, columns)
+    assert list(encoded.columns) == columns
+    for column, values in labels.items():
+        expected_codes = [ORDINAL_CODEBOOK.codes(column)[label] for label in values]
+        assert encoded[column].iloc[:len(values)].tolist() == expected_codes
+        assert encoded[column].iloc[len(values):].isna().all()
+
+    decoded = ORDINAL_CODEBOOK.decode(encoded, columns)
+    for column, values in labels.items():
+        assert decoded[column].iloc[:len(values)].tolist() == values
+        assert decoded[column].iloc[len(values):].isna().all()
+
+
+def test_ordinal_codebook_raw_label_aliases():
+    """
+    Tests that raw labels encode like their mapped labels, by conceptual name.
+    """
+    for name, aliases in ORDINAL_LABEL_ALIASES.items():
+        column = FEATURE_ENCODINGS[name][0]
+        df = pd.DataFrame({name: list(aliases), column: list(aliases.values())})
+        encoded = ORDINAL_CODEBOOK.encode(df, [name, column])
+        np.testing.assert_array_equal(encoded[name].to_numpy(), encoded[column].to_numpy())
+        assert ORDINAL_CODEBOOK.decode(encoded, [name])[name].tolist() == list(aliases.values())
+
+    # Labels of another feature are not shared: 'Pure' is only a Trial Transition Type label.
+    df = pd.DataFrame({'Task 1 Cue Type': ['Pure'], 'Trial Transition Type': ['Pure']})
+    encoded = ORDINAL_CODEBOOK.encode(df, ['Task 1 Cue Type', 'Trial Transition Type'])
+    assert np.isnan(encoded.loc[0, 'Task 1 Cue Type'])
+    assert encoded.loc[0, 'Trial Transition Type'] == 0.0
+
+
+def test_ordinal_codebook_snap():
+    df = pd.DataFrame({'Trial Transition Type Mapped': [0.4, -0.3, -2.0, np.nan]})
+    snapped = ORDINAL_CODEBOOK.snap(df, ['Trial Transition Type Mapped'])
+    np.testing.assert_array_equal(snapped['Trial Transition Type Mapped'].to_numpy(), [0.5, -0.5, -0.5, np.nan])
+
+
+@pytest.mark.parametrize('drop_missing', [True, False])
+def test_mofa_long_frame_matches_melt(drop_missing):
+    """
+    Tests that the NumPy melt matches pd.melt + dropna + view mapping, index included.
+    """
+    df_wide = pd.DataFrame({
+        'a': [1.0, np.nan, 3.0],
+        'no_view': [4.0, 5.0, 6.0],
+        'b': ['0.5', 'text', np.nan],
+        'c': [np.nan, np.nan, np.nan],
+    })
+    samples = ['s1', 's2', 's3']
+    feature_to_view = {'a': 'V2', 'b': 'V1', 'c': 'V3'}
+
+    df_long = mofa_long_frame(df_wide, samples, feature_to_view, drop_missing=drop_missing)
+
+    expected = pd.melt(df_wide.assign(sample=samples), id_vars=['sample'], var_name='feature', value_name='value')
+    expected['value'] = pd.to_numeric(expected['value'], errors='coerce')
+    if drop_missing:
+        expected = expected.dropna(subset=['value'])
+    expected['view'] = expected['feature'].map(feature_to_view)
+    expected = expected.dropna(subset=['view'])
+    expected['group'] = 'all_studies'
+    pd.testing.assert_frame_equal(df_long, expected)
+
+
+def test_mofa_long_frame_compact_categories():
+    """
+    Tests that compact=True emits float32 values and Categoricals with shared,
+    ordered category sets.
+    """
+    df_wide = pd.DataFrame({'b': [1.0, np.nan], 'a': [np.nan, 2.0], 'c': [np.nan, np.nan]})
+    feature_to_view = {'a': 'V2', 'b': 'V1', 'c': 'V3'}
+
+    df_long = mofa_long_frame(df_wide, ['s1', 's2'], feature_to_view, compact=True)
+
+    assert df_long['value'].dtype == np.float32
+    assert list(df_long['sample'].cat.categories) == ['s1', 's2']
+    assert list(df_long['feature'].cat.categories) == ['b', 'a', 'c']
+    # V3 has no observed cell, so it is not a view of the long format
+    assert list(df_long['view'].cat.categories) == ['V1', 'V2']
+    assert list(df_long['group'].cat.categories) == ['all_studies']
+    assert df_long['feature'].tolist() == ['b', 'a']
+    assert df_long['view'].tolist() == ['V1', 'V2']
@@ -0,0 +1,138 @@
+# tests/test_mofa_training.py
+
+import sys
+import json
+import pytest
+import pandas as pd
+import numpy as np
+from unittest.mock import Mock, MagicMock, patch
+from analysis_utils import prepare_mofa_data
+from mofa_training import (
+    TrainingParams, parameter_grid, data_fingerprint, model_key, train_model, train_models,
+    read_manifest, MANIFEST_NAME
+)
+
+
+def fake_train(data, likelihoods, params, outfile):
+    """Stands in for train_model in the worker processes (must be picklable)."""
+    with open(outfile, 'w') as model_file:
+        model_file.write(str(params))
+    return {'convergence_time': 0.5, 'n_iterations': 10, 'elbo': -100.0 - params.factors,
+            'r2': {'Temporal': 0.1 * params.factors}}
+
+
+@pytest.fixture
+def mofa_input(raw_test_data_dict):
+    return prepare_mofa_data(pd.DataFrame(raw_test_data_dict), strategy='sparse')
+
+
+def test_parameter_grid():
+    grid = parameter_grid(factors=[2, 3], ard_factors=[False, True], seeds=[0, 1], iterations=50)
+    assert len(grid) == 8
+    assert grid[0] == TrainingParams(factors=2, ard_factors=False, seed=0, iterations=50)
+    assert [params.seed for params in grid[:2]] == [0, 1]
+    assert all(params.spikeslab_weights and params.iterations == 50 for params in grid)
+
+
+def test_model_key_depends_on_data_and_params(raw_test_data_dict, mofa_input):
+    df_long, likelihoods = mofa_input[0], mofa_input[1]
+    data_hash = data_fingerprint(df_long, likelihoods)
+
+    assert data_fingerprint(df_long.copy(), likelihoods) == data_hash
+    # Same content as Categoricals
+    categorical = df_long.astype({'sample': 'category', 'feature': 'category'})
+    assert data_fingerprint(categorical, likelihoods) == data_hash
+
+    changed = df_long.copy()
+    changed.iloc[0, changed.columns.get_loc('value')] += 1.0
+    assert data_fingerprint(changed, likelihoods) != data_hash
+
+    matrices = prepare_mofa_data(pd.DataFrame(raw_test_data_dict), strategy='sparse', layout='matrices')[0]
+    assert data_fingerprint(matrices, likelihoods) != data_hash
+
+    params = TrainingParams()
+    assert model_key(data_hash, params) == model_key(data_hash, TrainingParams())
+    assert model_key(data_hash, params) != model_key(data_hash, params._replace(seed=1))
+
+
+def test_train_models_reuses_finished_models(tmp_path, mofa_input):
+    train_fn = Mock(side_effect=fake_train)
+    grid = parameter_grid(factors=[2, 3], seeds=[0])
+
+    manifest = train_models(mofa_input, grid, str(tmp_path), max_workers=1, train_fn=train_fn)
+
+    assert train_fn.call_count == 2
+    assert list(manifest['factors']) == [2, 3]
+    assert list(manifest['elbo']) == [-102.0, -103.0]
+    assert not manifest['reused'].any()
+    assert all((tmp_path / f"{key}.hdf5").exists() for key in manifest['key'])
+    entries = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert set(entries) == set(manifest['key'])
+    assert entries[manifest['key'][0]]['params']['factors'] == 2
+
+    # Extending the grid only trains the new model
+    train_fn.reset_mock()
+    extended = train_models(mofa_input, grid + parameter_grid(factors=[4], seeds=[0]), str(tmp_path),
+                            max_workers=1, train_fn=train_fn)
+    assert train_fn.call_count == 1
+    assert train_fn.call_args.args[2].factors == 4
+    assert list(extended['reused']) == [True, True, False]
+    assert list(extended['key'][:2]) == list(manifest['key'])
+
+
+def test_train_models_retrains_missing_model_files(tmp_path, mofa_input):
+    grid = parameter_grid(factors=[2])
+    manifest = train_models(mofa_input, grid, str(tmp_path), max_workers=1, train_fn=fake_train)
+    (tmp_path / f"{manifest['key'][0]}.hdf5").unlink()
+
+    train_fn = Mock(side_effect=fake_train)
+    train_models(mofa_input, grid, str(tmp_path), max_workers=1, train_fn=train_fn)
+    assert train_fn.call_count == 1
+
+
+def test_train_models_process_pool(tmp_path, mofa_input):
+    grid = parameter_grid(factors=[2, 3], seeds=[0, 1])
+
+    manifest = train_models(mofa_input, grid, str(tmp_path), max_workers=2, train_fn=fake_train)
+
+    assert len(manifest) == 4
+    assert manifest['key'].is_unique
+    assert set(read_manifest(str(tmp_path))) == set(manifest['key'])
+    assert list(manifest['r2'].map(lambda r2: r2['Temporal'])) == pytest.approx([0.2, 0.2, 0.3, 0.3])
+
+
+def test_train_models_records_successes_before_raising(tmp_path, mofa_input):
+    def flaky_train(data, likelihoods, params, outfile):
+        if params.factors == 3:
+            raise ValueError("did not converge")
+        return fake_train(data, likelihoods, params, outfile)
+
+    with pytest.raises(RuntimeError, match="1 of 2 model"):
+        train_models(mofa_input, parameter_grid(factors=[2, 3]), str(tmp_path), max_workers=1, train_fn=flaky_train)
+
+    entries = read_manifest(str(tmp_path))
+    assert [entry['params']['factors'] for entry in entries.values()] == [2]
+
+
+def test_train_model_drives_mofapy2_entry_point(tmp_path, mofa_input):
+    ent = MagicMock()
+    ent.model.getTrainingStats.return_value = {'elbo': np.array([np.nan, -50.0, -40.0, np.nan])}
+    ent.model.calculate_variance_explained.return_value = [np.array([0.25, 0.5])]
+    ent.data_opts = {'views_names': ['Conflict', 'Temporal']}
+    entry_point_module = Mock(entry_point=Mock(return_value=ent))
+    params = TrainingParams(factors=5, ard_factors=True, seed=7)
+    outfile = str(tmp_path / 'model.hdf5')
+
+    with patch.dict(sys.modules, {'mofapy2': Mock(), 'mofapy2.run': Mock(),
+                                  'mofapy2.run.entry_point': entry_point_module}):
+        metrics = train_model(mofa_input[0], mofa_input[1], params, outfile)
+
+    ent.set_data_df.assert_called_once_with(mofa_input[0], likelihoods=mofa_input[1])
+    model_options = ent.set_model_options.call_args.kwargs
+    assert model_options['factors'] == 5 and model_options['ard_factors'] is True
+    assert ent.set_train_options.call_args.kwargs['seed'] == 7
+    ent.save.assert_called_once_with(outfile)
+    assert metrics['elbo'] == -40.0
+    assert metrics['n_iterations'] == 4
+    assert metrics['r2'] == {'Conflict': 0.25, 'Temporal': 0.5}
+    assert metrics['convergence_time'] >= 0
@@ -4,8 +4,12 @@ import pandas as pd
 import numpy as np
 import pytest
 from pathlib import Path
+from scipy import sparse
 
-from analysis_utils import preprocess, create_pca_pipeline, reverse_map_categories
+from analysis_utils import (
+    preprocess, create_pca_pipeline, reverse_map_categories, get_component_loadings,
+    inverse_transform_point, CenteredTruncatedSVD
+)
 
 
 def test_pca_pipeline_with_real_dataset():
@@ -184,3 +188,54 @@ def test_pca_round_trip_is_near_perfect():
             check_dtype=False,
             obj=f"Human-readable column '{column}'",
         )
+
+
+def _real_features():
+    data_path = Path(__file__).parent.parent / "data" / "super_experiment_design_space.csv"
+    return preprocess(pd.read_csv(data_path), merge_conflict_dimensions=True)
+
+
+def test_sparse_pca_pipeline_matches_dense():
+    """
+    The sparse one-hot path with the implicitly centered truncated SVD reproduces the
+    leading components, loadings and inverse transforms of the dense PCA.
+    """
+    df_features, numerical_cols, categorical_cols, _, _ = _real_features()
+    n_components = 8
+
+    dense = create_pca_pipeline(numerical_cols, categorical_cols).fit(df_features)
+    sparse_pipeline = create_pca_pipeline(numerical_cols, categorical_cols, sparse_output=True,
+                                          n_components=n_components).fit(df_features)
+
+    assert sparse.issparse(sparse_pipeline.named_steps['preprocessor'].transform(df_features))
+    assert isinstance(sparse_pipeline.named_steps['pca'], CenteredTruncatedSVD)
+    np.testing.assert_allclose(sparse_pipeline.named_steps['pca'].explained_variance_ratio_,
+                               dense.named_steps['pca'].explained_variance_ratio_[:n_components], atol=1e-10)
+
+    dense_loadings = get_component_loadings(dense, numerical_cols, categorical_cols)
+    sparse_loadings = get_component_loadings(sparse_pipeline, numerical_cols, categorical_cols)
+    assert list(sparse_loadings.columns) == [f'PC{i + 1}' for i in range(n_components)]
+    # Components are defined up to sign
+    np.testing.assert_allclose(sparse_loadings.abs().to_numpy(),
+                               dense_loadings.iloc[:, :n_components].abs().to_numpy(), atol=1e-8)
+
+    # A point reconstructed from all stored components decodes to the same parameters
+    point = sparse_pipeline.transform(df_features)[0]
+    reference = create_pca_pipeline(numerical_cols, categorical_cols, n_components=n_components).fit(df_features)
+    expected = inverse_transform_point(reference.transform(df_features)[0], reference)
+    pd.testing.assert_series_equal(inverse_transform_point(point, sparse_pipeline), expected)
+
+
+def test_inverse_transform_accepts_sparse_input():
+    df_features, numerical_cols, categorical_cols, _, _ = _real_features()
+    pipeline = create_pca_pipeline(numerical_cols, categorical_cols, sparse_output=True, n_components=5)
+    preprocessor = pipeline.named_steps['preprocessor'].fit(df_features)
+
+    transformed = preprocessor.transform(df_features)
+    assert sparse.issparse(transformed)
+    # One stored value per numerical column and one per one-hot encoded column
+    assert transformed.nnz <= len(df_features) * (len(numerical_cols) + len(categorical_cols))
+
+    np.testing.assert_array_equal(preprocessor.inverse_transform(transformed),
+                                  preprocessor.inverse_transform(transformed.toarray()))
+